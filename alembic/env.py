@@ -5,7 +5,7 @@ from sqlalchemy import engine_from_config, pool
 
 from app.core.config import settings
 from app.db.base import Base
-from app.models import Booking, RestaurantTable, User  # noqa: F401
+from app.models import Booking, OutboxMessage, RestaurantTable, User, WaitlistEntry  # noqa: F401
 
 config = context.config
 if config.config_file_name is not None:
@@ -0,0 +1,48 @@
+"""Add booking overlap exclusion constraint.
+
+Revision ID: 20261017_0003
+Revises: 20260216_0002
+Create Date: 2026-10-17 12:00:00
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0003"
+down_revision = "20260216_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if settings.BOOKING_OVERLAP_STRATEGY != "constraint":
+        return
+    overlapping = op.get_bind().execute(
+        sa.text(
+            "SELECT earlier.id, later.id FROM bookings AS earlier "
+            "JOIN bookings AS later ON later.table_id = earlier.table_id "
+            "AND later.id > earlier.id "
+            "AND later.start_at < earlier.end_at AND earlier.start_at < later.end_at "
+            "WHERE earlier.canceled_at IS NULL AND later.canceled_at IS NULL "
+            "ORDER BY earlier.id, later.id LIMIT 20"
+        )
+    ).all()
+    if overlapping:
+        pairs = ", ".join(f"{earlier_id}/{later_id}" for earlier_id, later_id in overlapping)
+        raise RuntimeError(
+            "Active bookings overlap on the same table and block ex_bookings_table_interval: "
+            f"{pairs}. Cancel the duplicates and rerun the migration."
+        )
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE bookings ADD CONSTRAINT ex_bookings_table_interval "
+        "EXCLUDE USING gist (table_id WITH =, tstzrange(start_at, end_at, '[)') WITH &&) "
+        "WHERE (canceled_at IS NULL)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS ex_bookings_table_interval")
@@ -0,0 +1,59 @@
+"""Add waitlist entries.
+
+Revision ID: 20261017_0004
+Revises: 20261017_0003
+Create Date: 2026-10-17 15:00:00
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0004"
+down_revision = "20261017_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "waitlist_entries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("guests", sa.Integer(), nullable=False),
+        sa.Column("start_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("booking_id", sa.Integer(), nullable=True),
+        sa.Column("promoted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.CheckConstraint("end_at > start_at", name="ck_waitlist_entries_end_after_start"),
+        sa.CheckConstraint("guests > 0", name="ck_waitlist_entries_guests_positive"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["booking_id"], ["bookings.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_waitlist_entries_pending_start",
+        "waitlist_entries",
+        ["start_at", "end_at"],
+        unique=False,
+        postgresql_where=sa.text("promoted_at IS NULL"),
+    )
+    op.create_index(
+        "ix_waitlist_entries_user_start",
+        "waitlist_entries",
+        ["user_id", "start_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_waitlist_entries_user_start", table_name="waitlist_entries")
+    op.drop_index("ix_waitlist_entries_pending_start", table_name="waitlist_entries")
+    op.drop_table("waitlist_entries")
@@ -0,0 +1,29 @@
+"""Add booking kind for admin table blocks.
+
+Revision ID: 20261017_0005
+Revises: 20261017_0004
+Create Date: 2026-10-17 18:00:00
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0005"
+down_revision = "20261017_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "bookings",
+        sa.Column("kind", sa.String(length=16), nullable=False, server_default="guest"),
+    )
+    op.create_check_constraint("ck_bookings_kind", "bookings", "kind in ('guest', 'block')")
+
+
+def downgrade() -> None:
+    op.drop_constraint("ck_bookings_kind", "bookings", type_="check")
+    op.drop_column("bookings", "kind")
@@ -0,0 +1,32 @@
+"""Add booking reminder marker and due-reminder index.
+
+Revision ID: 20261017_0007
+Revises: 20261017_0006
+Create Date: 2026-10-17 22:00:00
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0007"
+down_revision = "20261017_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("bookings", sa.Column("reminded_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "ix_bookings_reminder_due",
+        "bookings",
+        ["start_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("canceled_at IS NULL AND reminded_at IS NULL AND kind = 'guest'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_reminder_due", table_name="bookings")
+    op.drop_column("bookings", "reminded_at")
@@ -0,0 +1,30 @@
+"""Add published outbox index for retention pruning.
+
+Revision ID: 20261017_0008
+Revises: 20261017_0007
+Create Date: 2026-10-17 23:00:00
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261017_0008"
+down_revision = "20261017_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_outbox_messages_published",
+        "outbox_messages",
+        ["published_at"],
+        unique=False,
+        postgresql_where=sa.text("published_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_messages_published", table_name="outbox_messages")
@@ -8,8 +8,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import AuthenticationError, AuthorizationError
 from app.db.session import database_session_manager
 from app.models.user import User
+from app.schemas.auth import UserSnapshot
 from app.services.auth import AuthService
-from app.services.cache import CacheService, RedisClientProvider
+from app.services.cache import CacheService, LocalCacheProvider, RedisClientProvider
 
 
 class SessionDependency:
@@ -20,7 +21,7 @@ class SessionDependency:
 
 class CacheDependency:
     async def __call__(self) -> CacheService:
-        return CacheService(RedisClientProvider.get_client())
+        return CacheService(RedisClientProvider.get_client(), LocalCacheProvider.get_cache())
 
 
 session_dependency = SessionDependency()
@@ -34,10 +35,11 @@ class CurrentUserDependency:
             self,
             credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(_bearer)],
             session: Annotated[AsyncSession, Depends(session_dependency)],
-    ) -> User:
+            cache_service: Annotated[CacheService, Depends(cache_dependency)],
+    ) -> UserSnapshot:
         if credentials is None:
             raise AuthenticationError("Authorization header is missing.")
-        auth_service = AuthService(session)
+        auth_service = AuthService(session, cache_service, LocalCacheProvider.get_user_cache())
         return await auth_service.get_user_from_token(credentials.credentials)
 
 
@@ -45,7 +47,10 @@ current_user_dependency = CurrentUserDependency()
 
 
 class AdminUserDependency:
-    async def __call__(self, current_user: Annotated[User, Depends(current_user_dependency)]) -> User:
+    async def __call__(
+            self,
+            current_user: Annotated[UserSnapshot, Depends(current_user_dependency)],
+    ) -> UserSnapshot:
         if current_user.has_role(User.ROLE_ADMIN):
             return current_user
         raise AuthorizationError("Admin role is required.")
@@ -55,5 +60,5 @@ admin_user_dependency = AdminUserDependency()
 
 SessionDep = Annotated[AsyncSession, Depends(session_dependency)]
 CacheDep = Annotated[CacheService, Depends(cache_dependency)]
-CurrentUserDep = Annotated[User, Depends(current_user_dependency)]
-AdminUserDep = Annotated[User, Depends(admin_user_dependency)]
+CurrentUserDep = Annotated[UserSnapshot, Depends(current_user_dependency)]
+AdminUserDep = Annotated[UserSnapshot, Depends(admin_user_dependency)]
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+
+from app.api.deps import AdminUserDep, CacheDep, SessionDep
+from app.schemas.booking import BookingClosureRequest, BookingClosureResponse
+from app.services.booking import BookingService
+
+router = APIRouter(prefix="/admin/bookings", tags=["Admin Bookings"])
+
+
+@router.post("/closures", response_model=BookingClosureResponse)
+async def close_tables(
+        payload: BookingClosureRequest,
+        admin_user: AdminUserDep,
+        session: SessionDep,
+        cache_service: CacheDep,
+) -> BookingClosureResponse:
+    booking_service = BookingService(session, cache_service)
+    return await booking_service.close_tables(admin=admin_user, payload=payload)
@@ -1,13 +1,22 @@
-from fastapi import APIRouter, status
+from typing import Any
+
+from fastapi import APIRouter, Header, Response, status
 
 from app.api.deps import CacheDep, CurrentUserDep, SessionDep
 from app.schemas.booking import (
+    BookingAutoCreateRequest,
+    BookingBulkCreateRequest,
+    BookingBulkCreateResponse,
     BookingCreateRequest,
+    BookingHoldCreateRequest,
+    BookingHoldResponse,
     BookingResponse,
     BookingsListResponse,
     BookingUpdateRequest,
 )
 from app.services.booking import BookingService
+from app.services.hold import BookingHoldService
+from app.services.idempotency import IdempotencyService
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
@@ -15,15 +24,76 @@ router = APIRouter(prefix="/bookings", tags=["Bookings"])
 @router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 async def create_booking(
         payload: BookingCreateRequest,
+        response: Response,
+        current_user: CurrentUserDep,
+        session: SessionDep,
+        cache_service: CacheDep,
+        idempotency_key: str | None = Header(
+            default=None,
+            alias="Idempotency-Key",
+            min_length=1,
+            max_length=255,
+        ),
+) -> BookingResponse:
+    booking_service = BookingService(session, cache_service)
+    if idempotency_key is None:
+        booking = await booking_service.create(user=current_user, payload=payload)
+        return BookingResponse.model_validate(booking)
+
+    async def create() -> dict[str, Any]:
+        booking = await booking_service.create(user=current_user, payload=payload)
+        return BookingResponse.model_validate(booking).model_dump(mode="json")
+
+    idempotency_service = IdempotencyService(cache_service)
+    body, is_replayed = await idempotency_service.run(
+        scope=f"bookings:{current_user.id}",
+        key=idempotency_key,
+        payload=payload.model_dump(mode="json"),
+        handler=create,
+    )
+    if is_replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return BookingResponse.model_validate(body)
+
+
+@router.post("/auto", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
+async def create_booking_auto(
+        payload: BookingAutoCreateRequest,
         current_user: CurrentUserDep,
         session: SessionDep,
         cache_service: CacheDep,
 ) -> BookingResponse:
     booking_service = BookingService(session, cache_service)
-    booking = await booking_service.create(user=current_user, payload=payload)
+    booking = await booking_service.create_auto(user=current_user, payload=payload)
     return BookingResponse.model_validate(booking)
 
 
+@router.post("/bulk", response_model=BookingBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_bookings_bulk(
+        payload: BookingBulkCreateRequest,
+        response: Response,
+        current_user: CurrentUserDep,
+        session: SessionDep,
+        cache_service: CacheDep,
+) -> BookingBulkCreateResponse:
+    booking_service = BookingService(session, cache_service)
+    result = await booking_service.create_many(user=current_user, payload=payload)
+    if result.created < len(result.items):
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return result
+
+
+@router.post("/holds", response_model=BookingHoldResponse, status_code=status.HTTP_201_CREATED)
+async def create_booking_hold(
+        payload: BookingHoldCreateRequest,
+        current_user: CurrentUserDep,
+        session: SessionDep,
+        cache_service: CacheDep,
+) -> BookingHoldResponse:
+    hold_service = BookingHoldService(session, cache_service)
+    return await hold_service.create(user=current_user, payload=payload)
+
+
 @router.get("/my", response_model=BookingsListResponse)
 async def get_my_bookings(
         current_user: CurrentUserDep,
@@ -1,9 +1,13 @@
 from datetime import date, time
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 
 from app.api.deps import CacheDep, CurrentUserDep, SessionDep
-from app.schemas.table import AvailableTablesResponse
+from app.schemas.table import (
+    AvailabilityGridResponse,
+    AvailableTablesResponse,
+    NextAvailableSlotsResponse,
+)
 from app.services.table import TableService
 
 router = APIRouter(prefix="/tables", tags=["Tables"])
@@ -17,6 +21,46 @@ async def get_available_tables(
         slot_date: date = Query(alias="date"),
         slot_time: time = Query(alias="time"),
         guests: int = Query(default=1, ge=1, le=20),
-) -> AvailableTablesResponse:
+) -> Response:
     table_service = TableService(session, cache_service)
-    return await table_service.get_available(slot_date=slot_date, slot_time=slot_time, guests=guests)
+    body = await table_service.get_available_body(
+        slot_date=slot_date,
+        slot_time=slot_time,
+        guests=guests,
+    )
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/availability-grid", response_model=AvailabilityGridResponse)
+async def get_availability_grid(
+        _current_user: CurrentUserDep,
+        session: SessionDep,
+        cache_service: CacheDep,
+        slot_date: date = Query(alias="date"),
+        guests: int = Query(default=1, ge=1, le=20),
+) -> AvailabilityGridResponse:
+    table_service = TableService(session, cache_service)
+    return await table_service.get_availability_grid(slot_date=slot_date, guests=guests)
+
+
+@router.get("/next-available", response_model=NextAvailableSlotsResponse)
+async def get_next_available_slots(
+        _current_user: CurrentUserDep,
+        session: SessionDep,
+        cache_service: CacheDep,
+        date_from: date,
+        date_to: date,
+        guests: int = Query(default=1, ge=1, le=20),
+        time_from: time | None = None,
+        time_to: time | None = None,
+        limit: int = Query(default=5, ge=1, le=50),
+) -> NextAvailableSlotsResponse:
+    table_service = TableService(session, cache_service)
+    return await table_service.find_next_available(
+        guests=guests,
+        date_from=date_from,
+        date_to=date_to,
+        time_from=time_from,
+        time_to=time_to,
+        limit=limit,
+    )
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, status
+
+from app.api.deps import CacheDep, CurrentUserDep, SessionDep
+from app.schemas.waitlist import (
+    WaitlistEntriesListResponse,
+    WaitlistEntryResponse,
+    WaitlistJoinRequest,
+)
+from app.services.waitlist import WaitlistService
+
+router = APIRouter(prefix="/waitlist", tags=["Waitlist"])
+
+
+@router.post("/", response_model=WaitlistEntryResponse, status_code=status.HTTP_201_CREATED)
+async def join_waitlist(
+        payload: WaitlistJoinRequest,
+        current_user: CurrentUserDep,
+        session: SessionDep,
+        cache_service: CacheDep,
+) -> WaitlistEntryResponse:
+    waitlist_service = WaitlistService(session, cache_service)
+    entry = await waitlist_service.join(user=current_user, payload=payload)
+    return WaitlistEntryResponse.model_validate(entry)
+
+
+@router.get("/my", response_model=WaitlistEntriesListResponse)
+async def get_my_waitlist_entries(
+        current_user: CurrentUserDep,
+        session: SessionDep,
+        cache_service: CacheDep,
+) -> WaitlistEntriesListResponse:
+    waitlist_service = WaitlistService(session, cache_service)
+    entries = await waitlist_service.get_my(user_id=current_user.id)
+    items = [WaitlistEntryResponse.model_validate(item) for item in entries]
+    return WaitlistEntriesListResponse(items=items)
@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.logging import LoggingConfigurator
+from app.db.session import database_session_manager
+from app.services.cache import RedisClientProvider
+from app.services.occupancy import OccupancyService
+from app.services.slot import BookingSlotService
+
+logger = logging.getLogger(__name__)
+
+
+class RebuildOccupancyCommand:
+    @staticmethod
+    def parse_args() -> argparse.Namespace:
+        parser = argparse.ArgumentParser(
+            description="Rebuild the Redis occupancy store from bookings.",
+        )
+        parser.add_argument("--date-from", type=date.fromisoformat, default=None)
+        parser.add_argument("--days", type=int, default=settings.AVAILABILITY_SEARCH_MAX_DAYS)
+        return parser.parse_args()
+
+    @staticmethod
+    async def run(date_from: date | None, days: int) -> int:
+        if date_from is None:
+            date_from = BookingSlotService.get_restaurant_date(datetime.now(tz=timezone.utc))
+        try:
+            async with database_session_manager.session_context() as session:
+                slot_dates = [date_from + timedelta(days=offset) for offset in range(days)]
+                rebuilt = await OccupancyService(session).rebuild_store(slot_dates)
+        finally:
+            await RedisClientProvider.close()
+            await database_session_manager.close()
+        return rebuilt
+
+    @classmethod
+    def main(cls) -> None:
+        LoggingConfigurator.configure()
+        args = cls.parse_args()
+        rebuilt = asyncio.run(cls.run(args.date_from, args.days))
+        logger.info("Occupancy store rebuilt.", extra={"days": rebuilt})
+
+
+if __name__ == "__main__":
+    RebuildOccupancyCommand.main()
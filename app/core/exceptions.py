@@ -42,6 +42,15 @@ class BusinessRuleError(AppException):
         )
 
 
+class ServiceUnavailableError(AppException):
+    def __init__(self, message: str = "Service is temporarily overloaded."):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            code="service_unavailable",
+        )
+
+
 class ExceptionConfigurator:
     @staticmethod
     async def app_exception_handler(_: Request, exc: AppException) -> JSONResponse:
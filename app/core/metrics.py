@@ -0,0 +1,80 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+LOCAL_CACHE_HITS = Counter(
+    "aspex_local_cache_hits_total",
+    "In-process cache hits.",
+    ("cache",),
+)
+LOCAL_CACHE_MISSES = Counter(
+    "aspex_local_cache_misses_total",
+    "In-process cache misses.",
+    ("cache",),
+)
+LOCAL_CACHE_EVICTIONS = Counter(
+    "aspex_local_cache_evictions_total",
+    "In-process cache entries evicted by size limit.",
+    ("cache",),
+)
+LOCAL_CACHE_INVALIDATIONS = Counter(
+    "aspex_local_cache_invalidations_total",
+    "In-process cache entries dropped by invalidation.",
+    ("cache",),
+)
+
+TASK_DISPATCH_QUEUE_DEPTH = Gauge(
+    "aspex_task_dispatch_queue_depth",
+    "Celery publishes waiting in the in-process dispatch queue.",
+)
+TASK_DISPATCH_PUBLISH_SECONDS = Histogram(
+    "aspex_task_dispatch_publish_seconds",
+    "Time spent publishing one task to the broker.",
+    ("task",),
+)
+TASK_DISPATCH_DROPPED = Counter(
+    "aspex_task_dispatch_dropped_total",
+    "Task publishes dropped because the dispatch queue was full.",
+    ("task",),
+)
+TASK_DISPATCH_FAILURES = Counter(
+    "aspex_task_dispatch_failures_total",
+    "Task publishes that raised an error.",
+    ("task",),
+)
+
+NOTIFICATION_BATCH_MESSAGES = Histogram(
+    "aspex_notification_batch_messages",
+    "Emails in one SMTP delivery batch.",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+NOTIFICATION_BATCH_SECONDS = Histogram(
+    "aspex_notification_batch_seconds",
+    "Time spent delivering one SMTP batch.",
+)
+NOTIFICATION_EMAILS_SENT = Counter(
+    "aspex_notification_emails_sent_total",
+    "Notification emails accepted by the SMTP server.",
+)
+NOTIFICATION_EMAILS_FAILED = Counter(
+    "aspex_notification_emails_failed_total",
+    "Notification emails that could not be delivered.",
+)
+
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "aspex_password_hash_in_flight",
+    "Password hash operations running or waiting for a hashing thread.",
+)
+PASSWORD_HASH_QUEUE_SECONDS = Histogram(
+    "aspex_password_hash_queue_seconds",
+    "Time a password hash operation waited for a hashing thread.",
+    ("operation",),
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "aspex_password_hash_seconds",
+    "Time spent hashing or verifying one password.",
+    ("operation",),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "aspex_password_hash_rejected_total",
+    "Password hash operations shed because the hashing pool was saturated.",
+    ("operation",),
+)
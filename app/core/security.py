@@ -1,15 +1,72 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from importlib import import_module
-from typing import Any
+from time import perf_counter
+from typing import Any, TypeVar
 
 from passlib.context import CryptContext
 
 from app.core.config import settings
-from app.core.exceptions import AuthenticationError
+from app.core.exceptions import AuthenticationError, ServiceUnavailableError
+from app.core.metrics import (
+    PASSWORD_HASH_IN_FLIGHT,
+    PASSWORD_HASH_QUEUE_SECONDS,
+    PASSWORD_HASH_REJECTED,
+    PASSWORD_HASH_SECONDS,
+)
+
+T = TypeVar("T")
+
+
+class PasswordHashingPool:
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_in_flight = max_workers + max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash",
+        )
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    async def run(self, operation: str, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                PASSWORD_HASH_REJECTED.labels(operation=operation).inc()
+                raise ServiceUnavailableError("Authentication is overloaded, retry later.")
+            self._in_flight += 1
+        PASSWORD_HASH_IN_FLIGHT.inc()
+        submitted_at = perf_counter()
+
+        def call() -> T:
+            started_at = perf_counter()
+            queued = started_at - submitted_at
+            PASSWORD_HASH_QUEUE_SECONDS.labels(operation=operation).observe(queued)
+            try:
+                return func(*args)
+            finally:
+                elapsed = perf_counter() - started_at
+                PASSWORD_HASH_SECONDS.labels(operation=operation).observe(elapsed)
+
+        # A cancelled request cannot stop a running bcrypt job, so the job itself frees the slot.
+        future = self._executor.submit(call)
+        future.add_done_callback(self.release)
+        return await asyncio.wrap_future(future)
+
+    def release(self, _: Future[Any]) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        PASSWORD_HASH_IN_FLIGHT.dec()
 
 
 class SecurityService:
     _pwd_context = CryptContext(schemes=("bcrypt",), deprecated="auto")
+    _hashing_pool = PasswordHashingPool(
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    )
 
     @classmethod
     def hash_password(cls, password: str) -> str:
@@ -19,6 +76,19 @@ class SecurityService:
     def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
         return cls._pwd_context.verify(plain_password, hashed_password)
 
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        return await cls._hashing_pool.run("hash", cls.hash_password, password)
+
+    @classmethod
+    async def verify_password_async(cls, plain_password: str, hashed_password: str) -> bool:
+        return await cls._hashing_pool.run(
+            "verify",
+            cls.verify_password,
+            plain_password,
+            hashed_password,
+        )
+
     @classmethod
     def create_access_token(cls, subject: str, expires_minutes: int | None = None) -> str:
         expire_minutes = expires_minutes or settings.JWT_EXPIRE_MINUTES
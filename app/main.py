@@ -9,7 +9,9 @@ from app.core.exceptions import ExceptionConfigurator
 from app.core.logging import LoggingConfigurator
 from app.db.session import database_session_manager
 from app.services.bootstrap import BootstrapService
-from app.services.cache import RedisClientProvider
+from app.services.cache import CacheInvalidationListener, LocalCacheProvider, RedisClientProvider
+from app.services.dispatcher import task_dispatcher
+from app.services.table import TableService
 
 
 class AppFactory:
@@ -18,8 +20,25 @@ class AppFactory:
     async def lifespan(_: FastAPI):
         LoggingConfigurator.configure()
         async with database_session_manager.session_context() as session:
-            await BootstrapService(session).bootstrap_tables()
+            bootstrap_service = BootstrapService(session)
+            await bootstrap_service.verify_overlap_constraint()
+            await bootstrap_service.bootstrap_tables()
+        invalidation_handlers = [TableService.apply_remote_invalidation]
+        local_cache = LocalCacheProvider.get_cache()
+        if local_cache is not None:
+            invalidation_handlers.append(local_cache.invalidate_prefix)
+        user_local_cache = LocalCacheProvider.get_user_cache()
+        if user_local_cache is not None:
+            invalidation_handlers.append(user_local_cache.invalidate_prefix)
+        invalidation_listener = CacheInvalidationListener(
+            RedisClientProvider.get_client(),
+            invalidation_handlers,
+        )
+        invalidation_listener.start()
+        task_dispatcher.start()
         yield
+        await task_dispatcher.stop(flush_timeout=settings.TASK_DISPATCH_SHUTDOWN_TIMEOUT_SECONDS)
+        await invalidation_listener.stop()
         await RedisClientProvider.close()
         await database_session_manager.close()
 
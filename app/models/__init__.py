@@ -1,5 +1,7 @@
 from app.models.booking import Booking
+from app.models.outbox import OutboxMessage
 from app.models.table import RestaurantTable
 from app.models.user import User
+from app.models.waitlist import WaitlistEntry
 
-__all__ = ("User", "RestaurantTable", "Booking")
+__all__ = ("User", "RestaurantTable", "Booking", "WaitlistEntry", "OutboxMessage")
@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, func
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, String, func, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -12,11 +13,29 @@ if TYPE_CHECKING:
 
 
 class Booking(Base):
+    OVERLAP_CONSTRAINT_NAME = "ex_bookings_table_interval"
+    KIND_GUEST = "guest"
+    KIND_BLOCK = "block"
+
     __tablename__ = "bookings"
     __table_args__ = (
         CheckConstraint("end_at > start_at", name="ck_bookings_end_after_start"),
+        CheckConstraint("kind in ('guest', 'block')", name="ck_bookings_kind"),
+        ExcludeConstraint(
+            ("table_id", "="),
+            (text("tstzrange(start_at, end_at, '[)')"), "&&"),
+            where=text("canceled_at IS NULL"),
+            using="gist",
+            name=OVERLAP_CONSTRAINT_NAME,
+        ).ddl_if(dialect="postgresql"),
         Index("ix_bookings_table_interval", "table_id", "start_at", "end_at"),
         Index("ix_bookings_user_start", "user_id", "start_at"),
+        Index(
+            "ix_bookings_reminder_due",
+            "start_at",
+            "id",
+            postgresql_where=text("canceled_at IS NULL AND reminded_at IS NULL AND kind = 'guest'"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -24,7 +43,14 @@ class Booking(Base):
     table_id: Mapped[int] = mapped_column(ForeignKey("tables.id", ondelete="RESTRICT"), nullable=False)
     start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    kind: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        default=KIND_GUEST,
+        server_default=KIND_GUEST,
+    )
     canceled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    reminded_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
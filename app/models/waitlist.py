@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+
+class WaitlistEntry(Base):
+    __tablename__ = "waitlist_entries"
+    __table_args__ = (
+        CheckConstraint("end_at > start_at", name="ck_waitlist_entries_end_after_start"),
+        CheckConstraint("guests > 0", name="ck_waitlist_entries_guests_positive"),
+        Index(
+            "ix_waitlist_entries_pending_start",
+            "start_at",
+            "end_at",
+            postgresql_where=text("promoted_at IS NULL"),
+        ),
+        Index("ix_waitlist_entries_user_start", "user_id", "start_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    guests: Mapped[int] = mapped_column(nullable=False)
+    start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    booking_id: Mapped[int | None] = mapped_column(
+        ForeignKey("bookings.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    promoted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    user: Mapped["User"] = relationship(lazy="selectin")
+
+    @property
+    def is_promoted(self) -> bool:
+        return self.promoted_at is not None
+
+    def __str__(self) -> str:
+        return f"W#{self.id} U#{self.user_id}"
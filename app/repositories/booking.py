@@ -1,15 +1,49 @@
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select, text, tuple_, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.booking import Booking
 
 
 class BookingRepository:
+    EXCLUSION_VIOLATION_SQLSTATE = "23P01"
+    TABLE_LOCK_NAMESPACE = 1001
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    def has_overlap_constraint(self) -> bool:
+        return (
+            settings.BOOKING_OVERLAP_STRATEGY == "constraint"
+            and self.session.get_bind().dialect.name == "postgresql"
+        )
+
+    async def overlap_constraint_exists(self) -> bool:
+        statement = text(
+            "SELECT 1 FROM pg_constraint "
+            "WHERE conname = :name AND conrelid = 'bookings'::regclass"
+        )
+        result = await self.session.execute(statement, {"name": Booking.OVERLAP_CONSTRAINT_NAME})
+        return result.first() is not None
+
+    async def lock_table(self, table_id: int) -> None:
+        if self.session.get_bind().dialect.name != "postgresql":
+            return
+        lock = func.pg_advisory_xact_lock(self.TABLE_LOCK_NAMESPACE, table_id)
+        await self.session.execute(select(lock))
+
+    @classmethod
+    def is_overlap_violation(cls, error: IntegrityError) -> bool:
+        sqlstate = getattr(error.orig, "sqlstate", None) or getattr(error.orig, "pgcode", None)
+        if sqlstate != cls.EXCLUSION_VIOLATION_SQLSTATE:
+            return False
+        return Booking.OVERLAP_CONSTRAINT_NAME in str(error.orig)
+
     async def get_by_id(self, booking_id: int) -> Booking | None:
         statement = select(Booking).filter_by(id=booking_id)
         result = await self.session.execute(statement)
@@ -18,7 +52,7 @@ class BookingRepository:
     async def get_active_or_future_for_user(self, user_id: int, now_at: datetime) -> list[Booking]:
         statement = (
             select(Booking)
-            .filter_by(user_id=user_id)
+            .filter_by(user_id=user_id, kind=Booking.KIND_GUEST)
             .where(Booking.canceled_at.is_(None))
             .where(Booking.end_at >= now_at)
             .order_by(Booking.start_at.asc())
@@ -26,6 +60,24 @@ class BookingRepository:
         result = await self.session.execute(statement)
         return list(result.scalars().all())
 
+    async def list_intervals(
+            self,
+            start_at: datetime,
+            end_at: datetime,
+            table_ids: list[int] | None = None,
+    ) -> list[tuple[int, datetime, datetime]]:
+        statement = (
+            select(Booking.table_id, Booking.start_at, Booking.end_at)
+            .where(Booking.canceled_at.is_(None))
+            .where(Booking.start_at < end_at)
+            .where(Booking.end_at > start_at)
+            .order_by(Booking.table_id.asc(), Booking.start_at.asc())
+        )
+        if table_ids is not None:
+            statement = statement.where(Booking.table_id.in_(table_ids))
+        result = await self.session.execute(statement)
+        return list(result.tuples().all())
+
     async def has_overlap(
             self,
             table_id: int,
@@ -51,9 +103,24 @@ class BookingRepository:
         await self.session.flush()
         return booking
 
+    async def create_many(
+            self,
+            rows: list[dict[str, Any]],
+            skip_conflicts: bool = False,
+    ) -> list[Booking]:
+        if not rows:
+            return []
+        if skip_conflicts:
+            statement = postgresql.insert(Booking).on_conflict_do_nothing().returning(Booking)
+        else:
+            statement = insert(Booking).returning(Booking, sort_by_parameter_order=True)
+        result = await self.session.scalars(statement, rows)
+        return list(result.all())
+
     async def update_slot(self, booking: Booking, start_at: datetime, end_at: datetime) -> Booking:
         booking.start_at = start_at
         booking.end_at = end_at
+        booking.reminded_at = None
         await self.session.flush()
         return booking
 
@@ -61,3 +128,55 @@ class BookingRepository:
         booking.canceled_at = canceled_at
         await self.session.flush()
         return booking
+
+    async def cancel_overlapping(
+            self,
+            table_ids: list[int],
+            start_at: datetime,
+            end_at: datetime,
+            canceled_at: datetime,
+    ) -> list[Booking]:
+        statement = (
+            update(Booking)
+            .where(Booking.table_id.in_(table_ids))
+            .where(Booking.canceled_at.is_(None))
+            .where(Booking.start_at < end_at)
+            .where(Booking.end_at > start_at)
+            .values(canceled_at=canceled_at)
+            .returning(Booking)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.scalars(statement)
+        return list(result.all())
+
+    async def list_reminder_due(
+            self,
+            start_from: datetime,
+            start_to: datetime,
+            limit: int,
+            after: tuple[datetime, int] | None = None,
+    ) -> list[Booking]:
+        statement = (
+            select(Booking)
+            .filter_by(kind=Booking.KIND_GUEST)
+            .where(Booking.canceled_at.is_(None))
+            .where(Booking.reminded_at.is_(None))
+            .where(Booking.start_at >= start_from)
+            .where(Booking.start_at < start_to)
+            .order_by(Booking.start_at.asc(), Booking.id.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if after is not None:
+            statement = statement.where(tuple_(Booking.start_at, Booking.id) > tuple_(*after))
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
+
+    async def mark_reminded(self, booking_ids: list[int], reminded_at: datetime) -> None:
+        statement = (
+            update(Booking)
+            .where(Booking.id.in_(booking_ids))
+            .values(reminded_at=reminded_at)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(statement)
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.outbox import OutboxMessage
+
+
+class OutboxRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def add(self, task_name: str, payload: dict[str, Any]) -> OutboxMessage:
+        message = OutboxMessage(task_name=task_name, payload=payload)
+        self.session.add(message)
+        return message
+
+    async def claim_pending(self, limit: int) -> list[OutboxMessage]:
+        statement = (
+            select(OutboxMessage)
+            .where(OutboxMessage.published_at.is_(None))
+            .order_by(OutboxMessage.id.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
+
+    async def mark_published(self, message_ids: list[int], published_at: datetime) -> None:
+        statement = (
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(message_ids))
+            .values(published_at=published_at)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(statement)
+
+    async def delete_published(self, published_before: datetime, limit: int) -> int:
+        message_ids = (
+            select(OutboxMessage.id)
+            .where(OutboxMessage.published_at < published_before)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        statement = (
+            delete(OutboxMessage)
+            .where(OutboxMessage.id.in_(message_ids))
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(statement)
+        return result.rowcount
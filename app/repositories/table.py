@@ -28,6 +28,11 @@ class TableRepository:
         result = await self.session.execute(statement)
         return list(result.scalars().all())
 
+    async def get_by_ids(self, table_ids: list[int]) -> list[RestaurantTable]:
+        statement = select(RestaurantTable).where(RestaurantTable.id.in_(table_ids))
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
+
     async def count(self) -> int:
         statement = select(func.count(RestaurantTable.id))
         result = await self.session.execute(statement)
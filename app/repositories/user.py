@@ -2,6 +2,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
+from app.schemas.auth import UserSnapshot
 
 
 class UserRepository:
@@ -13,6 +14,14 @@ class UserRepository:
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
 
+    async def get_snapshot_by_id(self, user_id: int) -> UserSnapshot | None:
+        statement = select(User.id, User.email, User.role).filter_by(id=user_id)
+        result = await self.session.execute(statement)
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return UserSnapshot(id=row.id, email=row.email, role=row.role)
+
     async def get_by_email(self, email: str) -> User | None:
         statement = select(User).filter_by(email=email)
         result = await self.session.execute(statement)
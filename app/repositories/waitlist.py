@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.waitlist import WaitlistEntry
+
+
+class WaitlistRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(
+            self,
+            user_id: int,
+            guests: int,
+            start_at: datetime,
+            end_at: datetime,
+    ) -> WaitlistEntry:
+        entry = WaitlistEntry(user_id=user_id, guests=guests, start_at=start_at, end_at=end_at)
+        self.session.add(entry)
+        await self.session.flush()
+        return entry
+
+    async def get_pending_for_user(self, user_id: int, now_at: datetime) -> list[WaitlistEntry]:
+        statement = (
+            select(WaitlistEntry)
+            .filter_by(user_id=user_id)
+            .where(WaitlistEntry.promoted_at.is_(None))
+            .where(WaitlistEntry.start_at > now_at)
+            .order_by(WaitlistEntry.start_at.asc(), WaitlistEntry.id.asc())
+        )
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
+
+    async def has_pending_for_user(self, user_id: int, start_at: datetime) -> bool:
+        statement = (
+            select(WaitlistEntry.id)
+            .filter_by(user_id=user_id, start_at=start_at)
+            .where(WaitlistEntry.promoted_at.is_(None))
+        )
+        result = await self.session.execute(statement.limit(1))
+        return result.scalar_one_or_none() is not None
+
+    async def list_pending_overlapping(
+            self,
+            start_at: datetime,
+            end_at: datetime,
+            seats: int,
+            now_at: datetime,
+    ) -> list[WaitlistEntry]:
+        statement = (
+            select(WaitlistEntry)
+            .where(WaitlistEntry.promoted_at.is_(None))
+            .where(WaitlistEntry.guests <= seats)
+            .where(WaitlistEntry.start_at > now_at)
+            .where(WaitlistEntry.start_at < end_at)
+            .where(WaitlistEntry.end_at > start_at)
+            .order_by(WaitlistEntry.id.asc())
+        )
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
+
+    async def mark_promoted(
+            self,
+            entry: WaitlistEntry,
+            booking_id: int,
+            promoted_at: datetime,
+    ) -> WaitlistEntry:
+        entry.booking_id = booking_id
+        entry.promoted_at = promoted_at
+        await self.session.flush()
+        return entry
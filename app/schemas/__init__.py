@@ -1,23 +1,59 @@
 from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
-from app.schemas.booking import BookingCreateRequest, BookingResponse, BookingUpdateRequest
+from app.schemas.booking import (
+    BookingAutoCreateRequest,
+    BookingBulkCreateRequest,
+    BookingBulkCreateResponse,
+    BookingBulkItemResponse,
+    BookingClosureRequest,
+    BookingClosureResponse,
+    BookingCreateRequest,
+    BookingHoldCreateRequest,
+    BookingHoldResponse,
+    BookingResponse,
+    BookingUpdateRequest,
+)
 from app.schemas.table import (
+    AvailabilityGridResponse,
+    AvailabilityGridSlotResponse,
     AvailableTablesResponse,
+    NextAvailableSlotsResponse,
     TableCreateRequest,
     TableResponse,
     TablesListResponse,
+    TableSlotResponse,
     TableUpdateRequest,
 )
+from app.schemas.waitlist import (
+    WaitlistEntriesListResponse,
+    WaitlistEntryResponse,
+    WaitlistJoinRequest,
+)
 
 __all__ = (
     "LoginRequest",
     "RegisterRequest",
     "TokenResponse",
+    "BookingAutoCreateRequest",
+    "BookingBulkCreateRequest",
+    "BookingBulkCreateResponse",
+    "BookingBulkItemResponse",
+    "BookingClosureRequest",
+    "BookingClosureResponse",
     "BookingCreateRequest",
+    "BookingHoldCreateRequest",
+    "BookingHoldResponse",
     "BookingResponse",
     "BookingUpdateRequest",
+    "AvailabilityGridResponse",
+    "AvailabilityGridSlotResponse",
     "AvailableTablesResponse",
+    "NextAvailableSlotsResponse",
     "TableCreateRequest",
     "TableResponse",
+    "TableSlotResponse",
     "TableUpdateRequest",
     "TablesListResponse",
+    "WaitlistEntriesListResponse",
+    "WaitlistEntryResponse",
+    "WaitlistJoinRequest",
 )
@@ -21,6 +21,17 @@ class TokenResponse(BaseModel):
     expires_in: int
 
 
+class UserSnapshot(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    id: int
+    email: str
+    role: str
+
+    def has_role(self, role: str) -> bool:
+        return self.role == role
+
+
 class UserResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
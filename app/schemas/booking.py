@@ -1,6 +1,7 @@
 from datetime import date, datetime, time
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.table import TableResponse
 
@@ -9,6 +10,27 @@ class BookingCreateRequest(BaseModel):
     table_id: int
     date: date
     time: time
+    hold_id: str | None = None
+
+
+class BookingAutoCreateRequest(BaseModel):
+    date: date
+    time: time
+    guests: int = Field(ge=1, le=20)
+
+
+class BookingHoldCreateRequest(BaseModel):
+    table_id: int
+    date: date
+    time: time
+
+
+class BookingHoldResponse(BaseModel):
+    hold_id: str
+    table_id: int
+    start_at: datetime
+    end_at: datetime
+    expires_at: datetime
 
 
 class BookingUpdateRequest(BaseModel):
@@ -29,3 +51,34 @@ class BookingResponse(BaseModel):
 
 class BookingsListResponse(BaseModel):
     items: list[BookingResponse]
+
+
+class BookingBulkCreateRequest(BaseModel):
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
+    items: list[BookingCreateRequest] = Field(min_length=1, max_length=50)
+
+
+class BookingBulkItemResponse(BaseModel):
+    index: int
+    booking: BookingResponse | None = None
+    error_code: str | None = None
+    detail: str | None = None
+
+
+class BookingBulkCreateResponse(BaseModel):
+    mode: Literal["all_or_nothing", "best_effort"]
+    created: int
+    items: list[BookingBulkItemResponse]
+
+
+class BookingClosureRequest(BaseModel):
+    start_at: datetime
+    end_at: datetime
+    table_ids: list[int] | None = Field(default=None, min_length=1)
+
+
+class BookingClosureResponse(BaseModel):
+    start_at: datetime
+    end_at: datetime
+    blocked_table_ids: list[int]
+    canceled_booking_ids: list[int]
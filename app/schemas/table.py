@@ -1,4 +1,4 @@
-from datetime import date, time
+from datetime import date, datetime, time
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -37,3 +37,27 @@ class AvailableTablesResponse(BaseModel):
     guests: int
     slot_hours: int
     tables: list[TableResponse]
+
+
+class AvailabilityGridSlotResponse(BaseModel):
+    time: time
+    tables: list[TableResponse]
+
+
+class AvailabilityGridResponse(BaseModel):
+    date: date
+    guests: int
+    slot_hours: int
+    slots: list[AvailabilityGridSlotResponse]
+
+
+class TableSlotResponse(BaseModel):
+    table: TableResponse
+    start_at: datetime
+    end_at: datetime
+
+
+class NextAvailableSlotsResponse(BaseModel):
+    guests: int
+    slot_hours: int
+    items: list[TableSlotResponse]
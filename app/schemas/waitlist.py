@@ -0,0 +1,25 @@
+from datetime import date, datetime, time
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class WaitlistJoinRequest(BaseModel):
+    date: date
+    time: time
+    guests: int = Field(ge=1, le=20)
+
+
+class WaitlistEntryResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    guests: int
+    start_at: datetime
+    end_at: datetime
+    booking_id: int | None
+    promoted_at: datetime | None
+    created_at: datetime
+
+
+class WaitlistEntriesListResponse(BaseModel):
+    items: list[WaitlistEntryResponse]
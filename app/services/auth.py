@@ -5,13 +5,21 @@ from app.core.exceptions import AuthenticationError, ConflictError
 from app.core.security import SecurityService
 from app.models.user import User
 from app.repositories.user import UserRepository
-from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
+from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse, UserSnapshot
+from app.services.cache import CacheServiceProtocol, LocalCache
+from app.services.user_cache import UserSnapshotCacheService
 
 
 class AuthService:
-    def __init__(self, session: AsyncSession):
+    def __init__(
+            self,
+            session: AsyncSession,
+            cache_service: CacheServiceProtocol | None = None,
+            user_local_cache: LocalCache | None = None,
+    ):
         self.session = session
         self.user_repository = UserRepository(session)
+        self.user_cache_service = UserSnapshotCacheService(session, cache_service, user_local_cache)
 
     async def register(self, payload: RegisterRequest) -> TokenResponse:
         exists = await self.user_repository.get_by_email(payload.email)
@@ -21,7 +29,7 @@ class AuthService:
         if phone_exists is not None:
             raise ConflictError("User with this phone number already exists.")
 
-        hashed_password = SecurityService.hash_password(payload.password)
+        hashed_password = await SecurityService.hash_password_async(payload.password)
         role = User.ROLE_ADMIN if payload.email.lower() in SettingsService.get_admin_emails() else User.ROLE_USER
         user = await self.user_repository.create(
             email=payload.email,
@@ -38,19 +46,22 @@ class AuthService:
         if user is None:
             raise AuthenticationError("Email or password is invalid.")
 
-        is_valid = SecurityService.verify_password(payload.password, user.hashed_password)
+        is_valid = await SecurityService.verify_password_async(
+            payload.password,
+            user.hashed_password,
+        )
         if not is_valid:
             raise AuthenticationError("Email or password is invalid.")
 
         return self.create_token_response(user)
 
-    async def get_user_from_token(self, access_token: str) -> User:
+    async def get_user_from_token(self, access_token: str) -> UserSnapshot:
         token_payload = SecurityService.decode_access_token(access_token)
         try:
             user_id = int(token_payload["sub"])
         except (TypeError, ValueError) as error:
             raise AuthenticationError("Access token payload is invalid.") from error
-        user = await self.user_repository.get_by_id(user_id)
+        user = await self.user_cache_service.get(user_id)
         if user is None:
             raise AuthenticationError("User from access token was not found.")
         return user
@@ -1,72 +1,283 @@
 from datetime import datetime, timedelta, timezone
+from typing import NoReturn
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.exceptions import AuthorizationError, BusinessRuleError, ConflictError, NotFoundError
+from app.core.exceptions import (
+    AppException,
+    AuthorizationError,
+    BusinessRuleError,
+    ConflictError,
+    NotFoundError,
+)
 from app.models.booking import Booking
-from app.models.user import User
 from app.repositories.booking import BookingRepository
 from app.repositories.table import TableRepository
-from app.schemas.booking import BookingCreateRequest, BookingUpdateRequest
+from app.schemas.auth import UserSnapshot
+from app.schemas.booking import (
+    BookingAutoCreateRequest,
+    BookingBulkCreateRequest,
+    BookingBulkCreateResponse,
+    BookingBulkItemResponse,
+    BookingClosureRequest,
+    BookingClosureResponse,
+    BookingCreateRequest,
+    BookingResponse,
+    BookingUpdateRequest,
+)
 from app.services.cache import CacheServiceProtocol
 from app.services.notification import NotificationService, NotificationServiceProtocol
+from app.services.occupancy import TableSchedule
+from app.services.prewarm_queue import AvailabilityPrewarmQueue, AvailabilityPrewarmQueueProtocol
 from app.services.slot import BookingSlotService
 from app.services.table import TableService
+from app.services.waitlist_queue import WaitlistPromotionQueue, WaitlistPromotionQueueProtocol
 
 
 class BookingService:
+    CLOSURE_ATTEMPTS = 3
+
     def __init__(
             self,
             session: AsyncSession,
             cache_service: CacheServiceProtocol,
             notification_service: NotificationServiceProtocol | None = None,
+            prewarm_queue: AvailabilityPrewarmQueueProtocol | None = None,
+            waitlist_queue: WaitlistPromotionQueueProtocol | None = None,
     ):
         self.session = session
         self.booking_repository = BookingRepository(session)
         self.table_repository = TableRepository(session)
         self.table_service = TableService(session, cache_service)
-        self.notification_service = notification_service or NotificationService()
-
-    async def create(self, user: User, payload: BookingCreateRequest) -> Booking:
-        if not BookingSlotService.can_book_time(payload.date, payload.time):
-            raise BusinessRuleError(
-                f"Booking is available from {settings.WORKDAY_START_HOUR}:00 "
-                f"to {settings.WORKDAY_END_HOUR - settings.BOOKING_SLOT_HOURS}:00."
-            )
+        self.occupancy_service = self.table_service.occupancy_service
+        self.hold_service = self.table_service.hold_service
+        self.notification_service = notification_service or NotificationService(session)
+        self.prewarm_queue = prewarm_queue or AvailabilityPrewarmQueue()
+        self.waitlist_queue = waitlist_queue or WaitlistPromotionQueue(session)
 
+    async def create(self, user: UserSnapshot, payload: BookingCreateRequest) -> Booking:
+        start_at, end_at = BookingSlotService.build_bookable_slot(payload.date, payload.time)
+        await self.hold_service.ensure_not_held(
+            user_id=user.id,
+            table_id=payload.table_id,
+            start_at=start_at,
+            end_at=end_at,
+            hold_id=payload.hold_id,
+        )
         table = await self.table_repository.get_by_id(payload.table_id)
         if table is None:
             raise NotFoundError("Table was not found.")
 
-        start_at, end_at = BookingSlotService.build_slot(payload.date, payload.time)
-        if start_at <= datetime.now(tz=timezone.utc):
-            raise BusinessRuleError("Booking start must be in the future.")
+        await self.ensure_slot_is_free(table_id=table.id, start_at=start_at, end_at=end_at)
+        try:
+            booking = await self.booking_repository.create(
+                user_id=user.id,
+                table_id=table.id,
+                start_at=start_at,
+                end_at=end_at,
+            )
+            booking.table = table
+            self.notify_created(user, booking)
+            await self.session.commit()
+        except IntegrityError as error:
+            await self.raise_overlap_conflict(error)
+        if payload.hold_id is not None:
+            await self.hold_service.release(start_at, payload.hold_id)
+        await self.complete_creation(booking)
+        return booking
 
-        has_overlap = await self.booking_repository.has_overlap(
-            table_id=table.id,
+    async def create_auto(self, user: UserSnapshot, payload: BookingAutoCreateRequest) -> Booking:
+        start_at, end_at = BookingSlotService.build_bookable_slot(payload.date, payload.time)
+        candidates = await self.table_repository.list_available(
             start_at=start_at,
             end_at=end_at,
+            guests=payload.guests,
         )
-        if has_overlap:
-            raise ConflictError("The table is already booked in the selected time slot.")
+        held = await self.hold_service.find_held(
+            user_id=user.id,
+            slots=[(table.id, start_at, end_at) for table in candidates],
+        )
+        for position, table in enumerate(candidates):
+            if position in held:
+                continue
+            try:
+                async with self.session.begin_nested():
+                    await self.ensure_slot_is_free(table.id, start_at, end_at)
+                    booking = await self.booking_repository.create(
+                        user_id=user.id,
+                        table_id=table.id,
+                        start_at=start_at,
+                        end_at=end_at,
+                    )
+            except ConflictError:
+                continue
+            except IntegrityError as error:
+                if not self.booking_repository.is_overlap_violation(error):
+                    await self.session.rollback()
+                    raise
+                continue
+            booking.table = table
+            self.notify_created(user, booking)
+            await self.session.commit()
+            await self.complete_creation(booking)
+            return booking
+        raise ConflictError(
+            "No free table fits the requested party size in the selected time slot."
+        )
+
+    async def create_many(
+            self,
+            user: UserSnapshot,
+            payload: BookingBulkCreateRequest,
+    ) -> BookingBulkCreateResponse:
+        errors: dict[int, AppException] = {}
+        slots: dict[int, tuple[datetime, datetime]] = {}
+        for index, item in enumerate(payload.items):
+            try:
+                slots[index] = BookingSlotService.build_bookable_slot(item.date, item.time)
+            except BusinessRuleError as error:
+                errors[index] = error
+
+        table_ids = sorted({item.table_id for item in payload.items})
+        tables = {table.id: table for table in await self.table_repository.get_by_ids(table_ids)}
+        for index, item in enumerate(payload.items):
+            if index not in errors and item.table_id not in tables:
+                errors[index] = NotFoundError("Table was not found.")
 
-        booking = await self.booking_repository.create(
+        candidates = [
+            (index, payload.items[index].table_id, start_at, end_at)
+            for index, (start_at, end_at) in slots.items()
+            if index not in errors
+        ]
+        held = await self.hold_service.find_held(
             user_id=user.id,
-            table_id=table.id,
-            start_at=start_at,
-            end_at=end_at,
+            slots=[(table_id, start_at, end_at) for _, table_id, start_at, end_at in candidates],
         )
-        booking.table = table
-        await self.session.commit()
-        await self.table_service.invalidate_available_cache()
-        self.notification_service.send_booking_created(
-            booking_id=booking.id,
-            email=user.email,
-            start_at=booking.start_at,
-            table_name=table.name,
+        for position in held:
+            errors[candidates[position][0]] = ConflictError("The table is held by another guest.")
+        claimed = [
+            (index, payload.items[index].hold_id, table_id, start_at, end_at)
+            for index, table_id, start_at, end_at in candidates
+            if index not in errors and payload.items[index].hold_id is not None
+        ]
+        unmatched = await self.hold_service.find_unmatched(
+            user_id=user.id,
+            slots=[
+                (hold_id, table_id, start_at, end_at)
+                for _, hold_id, table_id, start_at, end_at in claimed
+            ],
+        )
+        for position in unmatched:
+            errors[claimed[position][0]] = ConflictError(
+                "The slot hold has expired or does not match the booking."
+            )
+        candidates = [candidate for candidate in candidates if candidate[0] not in errors]
+        accepted: list[tuple[int, int, datetime, datetime]] = []
+        if candidates:
+            candidate_table_ids = sorted({table_id for _, table_id, _, _ in candidates})
+            if settings.BOOKING_OVERLAP_STRATEGY == "advisory_lock":
+                for table_id in candidate_table_ids:
+                    await self.booking_repository.lock_table(table_id)
+            intervals = await self.booking_repository.list_intervals(
+                start_at=min(start_at for _, _, start_at, _ in candidates),
+                end_at=max(end_at for _, _, _, end_at in candidates),
+                table_ids=candidate_table_ids,
+            )
+            schedules = TableSchedule.build_many(intervals)
+            for index, table_id, start_at, end_at in candidates:
+                schedule = schedules.get(table_id)
+                is_booked = schedule is not None and not schedule.is_free(start_at, end_at)
+                clashes_in_batch = any(
+                    other_table_id == table_id
+                    and start_at < other_end_at
+                    and other_start_at < end_at
+                    for _, other_table_id, other_start_at, other_end_at in accepted
+                )
+                if is_booked or clashes_in_batch:
+                    errors[index] = ConflictError(
+                        "The table is already booked in the selected time slot."
+                    )
+                else:
+                    accepted.append((index, table_id, start_at, end_at))
+
+        if errors and payload.mode == "all_or_nothing":
+            index = min(errors)
+            raise type(errors[index])(f"Item {index}: {errors[index].message}")
+
+        skip_conflicts = (
+            payload.mode == "best_effort" and self.booking_repository.has_overlap_constraint()
+        )
+        created: dict[int, Booking] = {}
+        try:
+            inserted = await self.booking_repository.create_many(
+                [
+                    {
+                        "user_id": user.id,
+                        "table_id": table_id,
+                        "start_at": start_at,
+                        "end_at": end_at,
+                    }
+                    for _, table_id, start_at, end_at in accepted
+                ],
+                skip_conflicts=skip_conflicts,
+            )
+            inserted_by_slot = {
+                (booking.table_id, BookingSlotService.to_utc(booking.start_at)): booking
+                for booking in inserted
+            }
+            for index, table_id, start_at, _ in accepted:
+                booking = inserted_by_slot.get((table_id, BookingSlotService.to_utc(start_at)))
+                if booking is None:
+                    errors[index] = ConflictError(
+                        "The table is already booked in the selected time slot."
+                    )
+                    continue
+                booking.table = tables[table_id]
+                created[index] = booking
+            bookings = list(created.values())
+            if bookings:
+                self.notification_service.send_bookings_created(
+                    email=user.email,
+                    bookings=[
+                        (booking.id, booking.start_at, booking.table.name) for booking in bookings
+                    ],
+                )
+            await self.session.commit()
+        except IntegrityError as error:
+            await self.raise_overlap_conflict(error)
+
+        for index in created:
+            hold_id = payload.items[index].hold_id
+            if hold_id is not None:
+                await self.hold_service.release(slots[index][0], hold_id)
+        if bookings:
+            for booking in bookings:
+                await self.occupancy_service.occupy(
+                    booking.table_id,
+                    booking.start_at,
+                    booking.end_at,
+                )
+            await self.refresh_availability(
+                [(booking.start_at, booking.end_at) for booking in bookings]
+            )
+        responses = {
+            index: BookingResponse.model_validate(booking) for index, booking in created.items()
+        }
+        return BookingBulkCreateResponse(
+            mode=payload.mode,
+            created=len(bookings),
+            items=[
+                BookingBulkItemResponse(
+                    index=index,
+                    booking=responses.get(index),
+                    error_code=errors[index].code if index in errors else None,
+                    detail=errors[index].message if index in errors else None,
+                )
+                for index in range(len(payload.items))
+            ],
         )
-        return booking
 
     async def get_my(self, user_id: int) -> list[Booking]:
         now_at = datetime.now(tz=timezone.utc)
@@ -77,32 +288,32 @@ class BookingService:
         if booking.is_canceled:
             raise ConflictError("Canceled booking cannot be changed.")
 
-        if not BookingSlotService.can_book_time(payload.date, payload.time):
-            raise BusinessRuleError(
-                f"Booking is available from {settings.WORKDAY_START_HOUR}:00 "
-                f"to {settings.WORKDAY_END_HOUR - settings.BOOKING_SLOT_HOURS}:00."
-            )
-
-        start_at, end_at = BookingSlotService.build_slot(payload.date, payload.time)
-        if start_at <= datetime.now(tz=timezone.utc):
-            raise BusinessRuleError("Booking start must be in the future.")
-
-        has_overlap = await self.booking_repository.has_overlap(
+        start_at, end_at = BookingSlotService.build_bookable_slot(payload.date, payload.time)
+        await self.hold_service.ensure_not_held(
+            user_id=user_id,
             table_id=booking.table_id,
             start_at=start_at,
             end_at=end_at,
-            exclude_booking_id=booking.id,
         )
-        if has_overlap:
-            raise ConflictError("The table is already booked in the selected time slot.")
-
-        updated = await self.booking_repository.update_slot(
-            booking=booking,
+        await self.ensure_slot_is_free(
+            table_id=booking.table_id,
             start_at=start_at,
             end_at=end_at,
+            exclude_booking_id=booking.id,
         )
-        await self.session.commit()
-        await self.table_service.invalidate_available_cache()
+        previous_start_at, previous_end_at = booking.start_at, booking.end_at
+        try:
+            updated = await self.booking_repository.update_slot(
+                booking=booking,
+                start_at=start_at,
+                end_at=end_at,
+            )
+            await self.session.commit()
+        except IntegrityError as error:
+            await self.raise_overlap_conflict(error)
+        await self.occupancy_service.release(booking.table_id, previous_start_at, previous_end_at)
+        await self.occupancy_service.occupy(booking.table_id, start_at, end_at)
+        await self.refresh_availability([(previous_start_at, previous_end_at), (start_at, end_at)])
         return updated
 
     async def cancel(self, user_id: int, booking_id: int) -> Booking:
@@ -116,10 +327,144 @@ class BookingService:
             raise BusinessRuleError("Booking cancellation is allowed only 1 hour before start.")
 
         canceled = await self.booking_repository.cancel(booking=booking, canceled_at=now_at)
+        self.waitlist_queue.enqueue(canceled.table_id, canceled.start_at, canceled.end_at)
         await self.session.commit()
-        await self.table_service.invalidate_available_cache()
+        await self.occupancy_service.release(canceled.table_id, canceled.start_at, canceled.end_at)
+        await self.refresh_availability([(canceled.start_at, canceled.end_at)])
         return canceled
 
+    async def close_tables(
+            self,
+            admin: UserSnapshot,
+            payload: BookingClosureRequest,
+    ) -> BookingClosureResponse:
+        start_at = BookingSlotService.to_utc(payload.start_at)
+        end_at = BookingSlotService.to_utc(payload.end_at)
+        if end_at <= start_at:
+            raise BusinessRuleError("Closure end must be after its start.")
+        if payload.table_ids is None:
+            tables = await self.table_repository.get_list()
+        else:
+            tables = await self.table_repository.get_by_ids(sorted(set(payload.table_ids)))
+            if len(tables) != len(set(payload.table_ids)):
+                raise NotFoundError("Table was not found.")
+        table_ids = sorted(table.id for table in tables)
+        if settings.BOOKING_OVERLAP_STRATEGY == "advisory_lock":
+            for table_id in table_ids:
+                await self.booking_repository.lock_table(table_id)
+
+        # Without locks a guest booking can commit between the cancel and the insert: retry both.
+        for attempt in range(1, self.CLOSURE_ATTEMPTS + 1):
+            try:
+                async with self.session.begin_nested():
+                    canceled, blocks = await self.replace_with_blocks(
+                        admin,
+                        table_ids,
+                        start_at,
+                        end_at,
+                    )
+                break
+            except IntegrityError as error:
+                is_overlap = self.booking_repository.is_overlap_violation(error)
+                if not is_overlap or attempt == self.CLOSURE_ATTEMPTS:
+                    await self.raise_overlap_conflict(error)
+        guest_bookings = [booking for booking in canceled if booking.kind == Booking.KIND_GUEST]
+        if guest_bookings:
+            self.notification_service.send_bookings_canceled(
+                [
+                    (booking.id, booking.user.email, booking.start_at, booking.table.name)
+                    for booking in guest_bookings
+                ]
+            )
+        await self.session.commit()
+
+        for booking in canceled:
+            await self.occupancy_service.release(booking.table_id, booking.start_at, booking.end_at)
+        for block in blocks:
+            await self.occupancy_service.occupy(block.table_id, block.start_at, block.end_at)
+        await self.refresh_availability(
+            [(start_at, end_at), *((item.start_at, item.end_at) for item in canceled)]
+        )
+        return BookingClosureResponse(
+            start_at=start_at,
+            end_at=end_at,
+            blocked_table_ids=table_ids,
+            canceled_booking_ids=[booking.id for booking in guest_bookings],
+        )
+
+    async def replace_with_blocks(
+            self,
+            admin: UserSnapshot,
+            table_ids: list[int],
+            start_at: datetime,
+            end_at: datetime,
+    ) -> tuple[list[Booking], list[Booking]]:
+        canceled = await self.booking_repository.cancel_overlapping(
+            table_ids=table_ids,
+            start_at=start_at,
+            end_at=end_at,
+            canceled_at=datetime.now(tz=timezone.utc),
+        )
+        block_ranges = {table_id: (start_at, end_at) for table_id in table_ids}
+        for booking in canceled:
+            if booking.kind == Booking.KIND_BLOCK:
+                block_start, block_end = block_ranges[booking.table_id]
+                block_ranges[booking.table_id] = (
+                    min(block_start, BookingSlotService.to_utc(booking.start_at)),
+                    max(block_end, BookingSlotService.to_utc(booking.end_at)),
+                )
+        blocks = await self.booking_repository.create_many(
+            [
+                {
+                    "user_id": admin.id,
+                    "table_id": table_id,
+                    "start_at": block_start,
+                    "end_at": block_end,
+                    "kind": Booking.KIND_BLOCK,
+                }
+                for table_id, (block_start, block_end) in block_ranges.items()
+            ]
+        )
+        return canceled, blocks
+
+    async def ensure_slot_is_free(
+            self,
+            table_id: int,
+            start_at: datetime,
+            end_at: datetime,
+            exclude_booking_id: int | None = None,
+    ) -> None:
+        if settings.BOOKING_OVERLAP_STRATEGY == "advisory_lock":
+            await self.booking_repository.lock_table(table_id)
+        elif self.booking_repository.has_overlap_constraint():
+            return
+        has_overlap = await self.booking_repository.has_overlap(
+            table_id=table_id,
+            start_at=start_at,
+            end_at=end_at,
+            exclude_booking_id=exclude_booking_id,
+        )
+        if has_overlap:
+            raise ConflictError("The table is already booked in the selected time slot.")
+
+    async def raise_overlap_conflict(self, error: IntegrityError) -> NoReturn:
+        await self.session.rollback()
+        if self.booking_repository.is_overlap_violation(error):
+            raise ConflictError("The table is already booked in the selected time slot.") from error
+        raise error
+
+    def notify_created(self, user: UserSnapshot, booking: Booking) -> None:
+        self.notification_service.send_booking_created(
+            booking_id=booking.id,
+            email=user.email,
+            start_at=booking.start_at,
+            table_name=booking.table.name,
+        )
+
+    async def complete_creation(self, booking: Booking) -> None:
+        await self.occupancy_service.occupy(booking.table_id, booking.start_at, booking.end_at)
+        await self.refresh_availability([(booking.start_at, booking.end_at)])
+
     async def get_owned_booking(self, user_id: int, booking_id: int) -> Booking:
         booking = await self.booking_repository.get_by_id(booking_id)
         if booking is None:
@@ -127,3 +472,13 @@ class BookingService:
         if booking.user_id != user_id:
             raise AuthorizationError("This booking belongs to another user.")
         return booking
+
+    async def refresh_availability(self, intervals: list[tuple[datetime, datetime]]) -> None:
+        await self.table_service.invalidate_available_cache(intervals)
+        self.prewarm_queue.enqueue(
+            [
+                slot_date
+                for start_at, end_at in intervals
+                for slot_date in BookingSlotService.get_restaurant_dates(start_at, end_at)
+            ]
+        )
@@ -1,5 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.booking import Booking
+from app.repositories.booking import BookingRepository
 from app.repositories.table import TableRepository
 from app.services.table import TableService
 
@@ -7,6 +9,7 @@ from app.services.table import TableService
 class BootstrapService:
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.booking_repository = BookingRepository(session)
         self.table_repository = TableRepository(session)
 
     async def bootstrap_tables(self) -> None:
@@ -15,3 +18,13 @@ class BootstrapService:
             return
         self.session.add_all(TableService.generate_default_tables())
         await self.session.commit()
+
+    async def verify_overlap_constraint(self) -> None:
+        if not self.booking_repository.has_overlap_constraint():
+            return
+        if not await self.booking_repository.overlap_constraint_exists():
+            raise RuntimeError(
+                "BOOKING_OVERLAP_STRATEGY=constraint requires the "
+                f"{Booking.OVERLAP_CONSTRAINT_NAME} constraint on bookings; "
+                "apply migration 20261017_0003 or switch to advisory_lock."
+            )
@@ -1,18 +1,89 @@
+import asyncio
 import json
-from typing import Any, Protocol
+import logging
+import secrets
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from time import monotonic
+from typing import Any, Protocol, TypeVar
 
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 from app.core.config import settings
+from app.core.metrics import (
+    LOCAL_CACHE_EVICTIONS,
+    LOCAL_CACHE_HITS,
+    LOCAL_CACHE_INVALIDATIONS,
+    LOCAL_CACHE_MISSES,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+CachePayload = dict[str, Any] | list[dict[str, Any]]
 
 
 class CacheServiceProtocol(Protocol):
     async def get_json(self, key: str) -> dict[str, Any] | list[dict[str, Any]] | None: ...
 
+    async def get_raw(self, key: str) -> str | None: ...
+
     async def set_json(self, key: str, payload: dict[str, Any] | list[dict[str, Any]], ttl: int) -> None: ...
 
     async def invalidate_prefix(self, prefix: str) -> None: ...
 
+    async def delete(self, key: str) -> None: ...
+
+    async def set_json_indexed(
+            self,
+            key: str,
+            payload: dict[str, Any] | list[dict[str, Any]],
+            ttl: int,
+            index_key: str,
+            score: float,
+    ) -> None: ...
+
+    async def invalidate_indexed(
+            self,
+            index_key: str,
+            score_ranges: list[tuple[float, float]],
+    ) -> None: ...
+
+    async def set_json_many(
+            self,
+            payloads: dict[str, CachePayload],
+            ttl: int,
+            index_key: str | None = None,
+            scores: dict[str, float] | None = None,
+    ) -> None: ...
+
+    async def get_generations(self, keys: list[str], ttl: int) -> list[int]: ...
+
+    async def bump_generation(self, key: str, ttl: int) -> int: ...
+
+    async def acquire_lock(self, key: str, ttl_ms: int) -> str | None: ...
+
+    async def release_lock(self, key: str, token: str) -> None: ...
+
+    def get_local(self, key: str) -> Any | None: ...
+
+    def set_local(self, key: str, value: Any) -> None: ...
+
+    async def publish_invalidation(self, prefix: str) -> None: ...
+
+    async def acquire_hold(
+            self,
+            key: str,
+            hold_id: str,
+            hold: dict[str, Any],
+            ttl_ms: int,
+    ) -> bool: ...
+
+    async def get_holds(self, key: str) -> dict[str, dict[str, Any]]: ...
+
+    async def release_hold(self, key: str, hold_id: str) -> None: ...
+
 
 class RedisClientProvider:
     _client: Redis | None = None
@@ -35,9 +106,194 @@ class RedisClientProvider:
         cls._client = None
 
 
+class SingleFlight:
+    _FAILED = object()
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Future[Any]] = {}
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        leader_call = self._calls.get(key)
+        if leader_call is not None:
+            result = await asyncio.shield(leader_call)
+            if result is not self._FAILED:
+                return result
+            return await factory()
+
+        call: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        try:
+            result = await factory()
+        except BaseException:
+            self._calls.pop(key, None)
+            call.set_result(self._FAILED)
+            raise
+        self._calls.pop(key, None)
+        call.set_result(result)
+        return result
+
+
+cache_single_flight = SingleFlight()
+
+
+class LocalCache:
+    def __init__(self, name: str, max_size: int, ttl_seconds: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < monotonic():
+            if entry is not None:
+                self._entries.pop(key, None)
+            LOCAL_CACHE_MISSES.labels(cache=self.name).inc()
+            return None
+        self._entries.move_to_end(key)
+        LOCAL_CACHE_HITS.labels(cache=self.name).inc()
+        return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            LOCAL_CACHE_EVICTIONS.labels(cache=self.name).inc()
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            self._entries.pop(key, None)
+        LOCAL_CACHE_INVALIDATIONS.labels(cache=self.name).inc(len(keys))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class LocalCacheProvider:
+    _cache: LocalCache | None = None
+    _user_cache: LocalCache | None = None
+
+    @classmethod
+    def get_cache(cls) -> LocalCache | None:
+        if not settings.LOCAL_CACHE_ENABLED:
+            return None
+        if cls._cache is None:
+            cls._cache = LocalCache(
+                name="api",
+                max_size=settings.LOCAL_CACHE_MAX_SIZE,
+                ttl_seconds=settings.LOCAL_CACHE_TTL_SECONDS,
+            )
+        return cls._cache
+
+    @classmethod
+    def get_user_cache(cls) -> LocalCache | None:
+        if not settings.LOCAL_CACHE_ENABLED:
+            return None
+        if cls._user_cache is None:
+            cls._user_cache = LocalCache(
+                name="users",
+                max_size=settings.USER_CACHE_LOCAL_MAX_SIZE,
+                ttl_seconds=settings.USER_CACHE_LOCAL_TTL_SECONDS,
+            )
+        return cls._user_cache
+
+
+class CacheInvalidationListener:
+    ORIGIN = secrets.token_hex(8)
+
+    def __init__(self, redis_client: Redis, handlers: list[Callable[[str], None]]):
+        self.redis_client = redis_client
+        self.handlers = handlers
+        self._task: asyncio.Task[None] | None = None
+
+    @classmethod
+    def encode_message(cls, prefix: str) -> str:
+        return json.dumps({"origin": cls.ORIGIN, "prefix": prefix})
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def listen(self) -> None:
+        while True:
+            try:
+                async with self.redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.handle_message(message["data"])
+            except RedisError:
+                logger.warning("Cache invalidation channel is unavailable, dropping local state.")
+                self.dispatch("")
+                await asyncio.sleep(1)
+
+    def handle_message(self, raw_message: str) -> None:
+        message = json.loads(raw_message)
+        if message["origin"] != self.ORIGIN:
+            self.dispatch(message["prefix"])
+
+    def dispatch(self, prefix: str) -> None:
+        for handler in self.handlers:
+            handler(prefix)
+
+
 class CacheService:
-    def __init__(self, redis_client: Redis):
+    _RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end
+return 0
+"""
+    _ACQUIRE_HOLD_SCRIPT = """
+local clock = redis.call('time')
+local now_ms = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local hold = cjson.decode(ARGV[2])
+hold['expires_at'] = now_ms + tonumber(ARGV[3])
+local expires_at = hold['expires_at']
+local holds = redis.call('hgetall', KEYS[1])
+for index = 1, #holds, 2 do
+    local other = cjson.decode(holds[index + 1])
+    local overlaps = other['table_id'] == hold['table_id']
+        and other['start_at'] < hold['end_at'] and hold['start_at'] < other['end_at']
+    if other['expires_at'] <= now_ms or (overlaps and other['user_id'] == hold['user_id']) then
+        redis.call('hdel', KEYS[1], holds[index])
+    elseif overlaps then
+        return 0
+    elseif other['expires_at'] > expires_at then
+        expires_at = other['expires_at']
+    end
+end
+redis.call('hset', KEYS[1], ARGV[1], cjson.encode(hold))
+redis.call('pexpireat', KEYS[1], expires_at)
+return 1
+"""
+    _GET_HOLDS_SCRIPT = """
+local clock = redis.call('time')
+local now_ms = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local holds = redis.call('hgetall', KEYS[1])
+local result = {}
+for index = 1, #holds, 2 do
+    if cjson.decode(holds[index + 1])['expires_at'] > now_ms then
+        result[#result + 1] = holds[index]
+        result[#result + 1] = holds[index + 1]
+    end
+end
+return result
+"""
+
+    def __init__(self, redis_client: Redis, local_cache: LocalCache | None = None):
         self.redis_client = redis_client
+        self.local_cache = local_cache
 
     async def get_json(self, key: str) -> dict[str, Any] | list[dict[str, Any]] | None:
         cached_value = await self.redis_client.get(key)
@@ -45,6 +301,9 @@ class CacheService:
             return None
         return json.loads(cached_value)
 
+    async def get_raw(self, key: str) -> str | None:
+        return await self.redis_client.get(key)
+
     async def set_json(self, key: str, payload: dict[str, Any] | list[dict[str, Any]], ttl: int) -> None:
         encoded = json.dumps(payload)
         await self.redis_client.set(key, encoded, ex=ttl)
@@ -55,3 +314,118 @@ class CacheService:
             keys.append(key)
         if keys:
             await self.redis_client.delete(*keys)
+
+    async def delete(self, key: str) -> None:
+        await self.redis_client.delete(key)
+
+    async def set_json_indexed(
+            self,
+            key: str,
+            payload: dict[str, Any] | list[dict[str, Any]],
+            ttl: int,
+            index_key: str,
+            score: float,
+    ) -> None:
+        encoded = json.dumps(payload)
+        async with self.redis_client.pipeline(transaction=True) as pipeline:
+            pipeline.set(key, encoded, ex=ttl)
+            pipeline.zadd(index_key, {key: score})
+            pipeline.expire(index_key, ttl)
+            await pipeline.execute()
+
+    async def set_json_many(
+            self,
+            payloads: dict[str, CachePayload],
+            ttl: int,
+            index_key: str | None = None,
+            scores: dict[str, float] | None = None,
+    ) -> None:
+        if not payloads:
+            return
+        async with self.redis_client.pipeline(transaction=False) as pipeline:
+            for key, payload in payloads.items():
+                pipeline.set(key, json.dumps(payload), ex=ttl)
+            if index_key is not None and scores:
+                pipeline.zadd(index_key, scores)
+                pipeline.expire(index_key, ttl)
+            await pipeline.execute()
+
+    async def invalidate_indexed(
+            self,
+            index_key: str,
+            score_ranges: list[tuple[float, float]],
+    ) -> None:
+        async with self.redis_client.pipeline(transaction=False) as pipeline:
+            for min_score, max_score in score_ranges:
+                pipeline.zrangebyscore(index_key, min_score, max_score)
+            found_keys = await pipeline.execute()
+        keys = sorted({key for range_keys in found_keys for key in range_keys})
+        if not keys:
+            return
+        async with self.redis_client.pipeline(transaction=True) as pipeline:
+            pipeline.delete(*keys)
+            pipeline.zrem(index_key, *keys)
+            await pipeline.execute()
+
+    async def get_generations(self, keys: list[str], ttl: int) -> list[int]:
+        async with self.redis_client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.getex(key, ex=ttl)
+            values = await pipeline.execute()
+        return [int(value) if value is not None else 0 for value in values]
+
+    async def bump_generation(self, key: str, ttl: int) -> int:
+        async with self.redis_client.pipeline(transaction=True) as pipeline:
+            pipeline.incr(key)
+            pipeline.expire(key, ttl)
+            generation, _ = await pipeline.execute()
+        return int(generation)
+
+    async def acquire_lock(self, key: str, ttl_ms: int) -> str | None:
+        token = secrets.token_hex(16)
+        is_acquired = await self.redis_client.set(key, token, nx=True, px=ttl_ms)
+        return token if is_acquired else None
+
+    async def release_lock(self, key: str, token: str) -> None:
+        await self.redis_client.eval(self._RELEASE_LOCK_SCRIPT, 1, key, token)
+
+    def get_local(self, key: str) -> Any | None:
+        if self.local_cache is None:
+            return None
+        return self.local_cache.get(key)
+
+    def set_local(self, key: str, value: Any) -> None:
+        if self.local_cache is not None:
+            self.local_cache.set(key, value)
+
+    async def publish_invalidation(self, prefix: str) -> None:
+        if self.local_cache is not None:
+            self.local_cache.invalidate_prefix(prefix)
+        await self.redis_client.publish(
+            settings.CACHE_INVALIDATION_CHANNEL,
+            CacheInvalidationListener.encode_message(prefix),
+        )
+
+    async def acquire_hold(
+            self,
+            key: str,
+            hold_id: str,
+            hold: dict[str, Any],
+            ttl_ms: int,
+    ) -> bool:
+        is_acquired = await self.redis_client.eval(
+            self._ACQUIRE_HOLD_SCRIPT,
+            1,
+            key,
+            hold_id,
+            json.dumps(hold),
+            ttl_ms,
+        )
+        return bool(is_acquired)
+
+    async def get_holds(self, key: str) -> dict[str, dict[str, Any]]:
+        values = await self.redis_client.eval(self._GET_HOLDS_SCRIPT, 1, key)
+        return {values[index]: json.loads(values[index + 1]) for index in range(0, len(values), 2)}
+
+    async def release_hold(self, key: str, hold_id: str) -> None:
+        await self.redis_client.hdel(key, hold_id)
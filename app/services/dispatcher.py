@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+from app.core.config import settings
+from app.core.metrics import (
+    TASK_DISPATCH_DROPPED,
+    TASK_DISPATCH_FAILURES,
+    TASK_DISPATCH_PUBLISH_SECONDS,
+    TASK_DISPATCH_QUEUE_DEPTH,
+)
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+TaskPublisher = Callable[[str, dict[str, Any]], None]
+
+
+class TaskDispatcher:
+    def __init__(self, max_size: int, publisher: TaskPublisher | None = None):
+        self.max_size = max_size
+        self.publisher = publisher or self.publish_to_celery
+        self._queue: asyncio.Queue[tuple[str, dict[str, Any]]] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+            self._task = asyncio.create_task(self.drain())
+
+    def submit(self, task_name: str, kwargs: dict[str, Any]) -> None:
+        if self._queue is None:
+            self.publish(task_name, kwargs)
+            return
+        try:
+            self._queue.put_nowait((task_name, kwargs))
+        except asyncio.QueueFull:
+            TASK_DISPATCH_DROPPED.labels(task=task_name).inc()
+            logger.warning(
+                "Task dispatch queue is full, dropping publish.",
+                extra={"task": task_name},
+            )
+            return
+        TASK_DISPATCH_QUEUE_DEPTH.set(self._queue.qsize())
+
+    async def drain(self) -> None:
+        queue = self._queue
+        while True:
+            task_name, kwargs = await queue.get()
+            try:
+                await asyncio.to_thread(self.publish, task_name, kwargs)
+            finally:
+                queue.task_done()
+                TASK_DISPATCH_QUEUE_DEPTH.set(queue.qsize())
+
+    def publish(self, task_name: str, kwargs: dict[str, Any]) -> None:
+        started_at = perf_counter()
+        try:
+            self.publisher(task_name, kwargs)
+        except Exception:
+            TASK_DISPATCH_FAILURES.labels(task=task_name).inc()
+            logger.exception("Task publish failed.", extra={"task": task_name})
+        finally:
+            elapsed = perf_counter() - started_at
+            TASK_DISPATCH_PUBLISH_SECONDS.labels(task=task_name).observe(elapsed)
+
+    async def stop(self, flush_timeout: float) -> None:
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=flush_timeout)
+        except TimeoutError:
+            logger.warning(
+                "Task dispatch queue was not flushed before shutdown.",
+                extra={"left": self._queue.qsize()},
+            )
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+
+    @staticmethod
+    def publish_to_celery(task_name: str, kwargs: dict[str, Any]) -> None:
+        celery_app.send_task(task_name, kwargs=kwargs)
+
+
+task_dispatcher = TaskDispatcher(max_size=settings.TASK_DISPATCH_QUEUE_SIZE)
@@ -0,0 +1,183 @@
+import secrets
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import ConflictError, NotFoundError
+from app.repositories.booking import BookingRepository
+from app.repositories.table import TableRepository
+from app.schemas.auth import UserSnapshot
+from app.schemas.booking import BookingHoldCreateRequest, BookingHoldResponse
+from app.services.cache import CacheServiceProtocol
+from app.services.slot import BookingSlotService
+
+
+class BookingHoldService:
+    HOLDS_KEY_PREFIX = "tables:holds:"
+
+    def __init__(self, session: AsyncSession, cache_service: CacheServiceProtocol):
+        self.booking_repository = BookingRepository(session)
+        self.table_repository = TableRepository(session)
+        self.cache_service = cache_service
+
+    async def create(
+            self,
+            user: UserSnapshot,
+            payload: BookingHoldCreateRequest,
+    ) -> BookingHoldResponse:
+        start_at, end_at = BookingSlotService.build_bookable_slot(payload.date, payload.time)
+        hold_id = secrets.token_urlsafe(16)
+        holds_key = self.get_holds_key(start_at)
+        is_acquired = await self.cache_service.acquire_hold(
+            holds_key,
+            hold_id,
+            self.build_hold(user.id, payload.table_id, start_at, end_at),
+            ttl_ms=settings.BOOKING_HOLD_TTL_SECONDS * 1000,
+        )
+        if not is_acquired:
+            raise ConflictError("The table is held by another guest.")
+        await self.cache_service.publish_invalidation(holds_key)
+
+        table = await self.table_repository.get_by_id(payload.table_id)
+        if table is None:
+            await self.release(start_at, hold_id)
+            raise NotFoundError("Table was not found.")
+        if await self.booking_repository.has_overlap(table.id, start_at, end_at):
+            await self.release(start_at, hold_id)
+            raise ConflictError("The table is already booked in the selected time slot.")
+        now_at = datetime.now(tz=timezone.utc)
+        return BookingHoldResponse(
+            hold_id=hold_id,
+            table_id=payload.table_id,
+            start_at=start_at,
+            end_at=end_at,
+            expires_at=now_at + timedelta(seconds=settings.BOOKING_HOLD_TTL_SECONDS),
+        )
+
+    async def ensure_not_held(
+            self,
+            user_id: int,
+            table_id: int,
+            start_at: datetime,
+            end_at: datetime,
+            hold_id: str | None = None,
+    ) -> None:
+        holds = await self.cache_service.get_holds(self.get_holds_key(start_at))
+        if hold_id is not None and not self.is_matching_hold(
+            holds, hold_id, user_id, table_id, start_at, end_at
+        ):
+            raise ConflictError("The slot hold has expired or does not match the booking.")
+        if self.find_blocking_hold(holds, user_id, table_id, start_at, end_at) is not None:
+            raise ConflictError("The table is held by another guest.")
+
+    async def find_held(
+            self,
+            user_id: int,
+            slots: list[tuple[int, datetime, datetime]],
+    ) -> set[int]:
+        holds_by_key = await self.get_holds_by_key([start_at for _, start_at, _ in slots])
+        held: set[int] = set()
+        for position, (table_id, start_at, end_at) in enumerate(slots):
+            holds = holds_by_key[self.get_holds_key(start_at)]
+            if self.find_blocking_hold(holds, user_id, table_id, start_at, end_at) is not None:
+                held.add(position)
+        return held
+
+    async def find_unmatched(
+            self,
+            user_id: int,
+            slots: list[tuple[str, int, datetime, datetime]],
+    ) -> set[int]:
+        holds_by_key = await self.get_holds_by_key([start_at for _, _, start_at, _ in slots])
+        unmatched: set[int] = set()
+        for position, (hold_id, table_id, start_at, end_at) in enumerate(slots):
+            holds = holds_by_key[self.get_holds_key(start_at)]
+            if not self.is_matching_hold(holds, hold_id, user_id, table_id, start_at, end_at):
+                unmatched.add(position)
+        return unmatched
+
+    async def get_holds_by_key(
+            self,
+            start_ats: list[datetime],
+    ) -> dict[str, dict[str, dict[str, Any]]]:
+        holds_by_key: dict[str, dict[str, dict[str, Any]]] = {}
+        for start_at in start_ats:
+            holds_key = self.get_holds_key(start_at)
+            if holds_key not in holds_by_key:
+                holds_by_key[holds_key] = await self.cache_service.get_holds(holds_key)
+        return holds_by_key
+
+    async def get_held_table_ids(self, slot_date: date, slot_time: time) -> set[int]:
+        start_at, end_at = BookingSlotService.build_slot(slot_date, slot_time)
+        holds_key = self.get_holds_key(start_at)
+        holds = self.cache_service.get_local(holds_key)
+        if holds is None:
+            holds = list((await self.cache_service.get_holds(holds_key)).values())
+            self.cache_service.set_local(holds_key, holds)
+        now_ms = datetime.now(tz=timezone.utc).timestamp() * 1000
+        start_ts, end_ts = int(start_at.timestamp()), int(end_at.timestamp())
+        return {
+            hold["table_id"]
+            for hold in holds
+            if hold["expires_at"] > now_ms
+            and hold["start_at"] < end_ts
+            and start_ts < hold["end_at"]
+        }
+
+    async def release(self, start_at: datetime, hold_id: str) -> None:
+        holds_key = self.get_holds_key(start_at)
+        await self.cache_service.release_hold(holds_key, hold_id)
+        await self.cache_service.publish_invalidation(holds_key)
+
+    @classmethod
+    def get_holds_key(cls, start_at: datetime) -> str:
+        slot_date = BookingSlotService.get_restaurant_date(start_at)
+        return f"{cls.HOLDS_KEY_PREFIX}{slot_date.isoformat()}"
+
+    @staticmethod
+    def build_hold(
+            user_id: int,
+            table_id: int,
+            start_at: datetime,
+            end_at: datetime,
+    ) -> dict[str, Any]:
+        return {
+            "user_id": user_id,
+            "table_id": table_id,
+            "start_at": int(start_at.timestamp()),
+            "end_at": int(end_at.timestamp()),
+        }
+
+    @classmethod
+    def is_matching_hold(
+            cls,
+            holds: dict[str, dict[str, Any]],
+            hold_id: str,
+            user_id: int,
+            table_id: int,
+            start_at: datetime,
+            end_at: datetime,
+    ) -> bool:
+        expected_hold = cls.build_hold(user_id, table_id, start_at, end_at)
+        return expected_hold.items() <= holds.get(hold_id, {}).items()
+
+    @staticmethod
+    def find_blocking_hold(
+            holds: dict[str, dict[str, Any]],
+            user_id: int,
+            table_id: int,
+            start_at: datetime,
+            end_at: datetime,
+    ) -> str | None:
+        start_ts, end_ts = int(start_at.timestamp()), int(end_at.timestamp())
+        for hold_id, hold in holds.items():
+            if (
+                    hold["user_id"] != user_id
+                    and hold["table_id"] == table_id
+                    and hold["start_at"] < end_ts
+                    and start_ts < hold["end_at"]
+            ):
+                return hold_id
+        return None
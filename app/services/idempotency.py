@@ -0,0 +1,78 @@
+import asyncio
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.config import settings
+from app.core.exceptions import ConflictError
+from app.services.cache import CacheServiceProtocol
+
+
+class IdempotencyService:
+    KEY_PREFIX = "idempotency:"
+
+    def __init__(self, cache_service: CacheServiceProtocol):
+        self.cache_service = cache_service
+
+    async def run(
+            self,
+            scope: str,
+            key: str,
+            payload: dict[str, Any],
+            handler: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> tuple[dict[str, Any], bool]:
+        result_key = f"{self.KEY_PREFIX}{scope}:{key}"
+        fingerprint = self.get_fingerprint(payload)
+        stored = await self.cache_service.get_json(result_key)
+        if stored is not None:
+            return self.replay(stored, fingerprint), True
+
+        lock_key = f"{result_key}:lock"
+        attempts = max(1, settings.IDEMPOTENCY_LOCK_TTL_MS // settings.IDEMPOTENCY_WAIT_INTERVAL_MS)
+        for attempt in range(attempts + 1):
+            lock_token = await self.cache_service.acquire_lock(
+                lock_key,
+                settings.IDEMPOTENCY_LOCK_TTL_MS,
+            )
+            if lock_token is not None:
+                return await self.execute(result_key, lock_key, lock_token, fingerprint, handler)
+            if attempt == attempts:
+                break
+            await asyncio.sleep(settings.IDEMPOTENCY_WAIT_INTERVAL_MS / 1000)
+            stored = await self.cache_service.get_json(result_key)
+            if stored is not None:
+                return self.replay(stored, fingerprint), True
+        raise ConflictError("A request with this Idempotency-Key is still in progress.")
+
+    async def execute(
+            self,
+            result_key: str,
+            lock_key: str,
+            lock_token: str,
+            fingerprint: str,
+            handler: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> tuple[dict[str, Any], bool]:
+        try:
+            stored = await self.cache_service.get_json(result_key)
+            if stored is not None:
+                return self.replay(stored, fingerprint), True
+            body = await handler()
+            await self.cache_service.set_json(
+                result_key,
+                {"fingerprint": fingerprint, "body": body},
+                ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+            )
+            return body, False
+        finally:
+            await self.cache_service.release_lock(lock_key, lock_token)
+
+    @staticmethod
+    def replay(stored: dict[str, Any], fingerprint: str) -> dict[str, Any]:
+        if stored["fingerprint"] != fingerprint:
+            raise ConflictError("Idempotency-Key was already used with a different request body.")
+        return stored["body"]
+
+    @staticmethod
+    def get_fingerprint(payload: dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
@@ -1,19 +1,122 @@
 from datetime import datetime
 from typing import Protocol
 
-from app.tasks.booking import send_booking_created_notification
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.outbox import OutboxRepository
+from app.tasks.booking import (
+    send_booking_created_notification,
+    send_booking_reminders_notification,
+    send_bookings_canceled_notification,
+    send_bookings_created_notification,
+    send_waitlist_promoted_notification,
+)
 
 
 class NotificationServiceProtocol(Protocol):
-    def send_booking_created(self, booking_id: int, email: str, start_at: datetime, table_name: str) -> None: ...
+    def send_booking_created(
+            self,
+            booking_id: int,
+            email: str,
+            start_at: datetime,
+            table_name: str,
+    ) -> None: ...
+
+    def send_bookings_created(
+            self,
+            email: str,
+            bookings: list[tuple[int, datetime, str]],
+    ) -> None: ...
+
+    def send_waitlist_promoted(
+            self,
+            booking_id: int,
+            email: str,
+            start_at: datetime,
+            table_name: str,
+    ) -> None: ...
+
+    def send_bookings_canceled(self, bookings: list[tuple[int, str, datetime, str]]) -> None: ...
+
+    def send_booking_reminders(self, bookings: list[tuple[int, str, datetime, str]]) -> None: ...
 
 
 class NotificationService:
-    @staticmethod
-    def send_booking_created(booking_id: int, email: str, start_at: datetime, table_name: str) -> None:
-        send_booking_created_notification.delay(
-            booking_id=booking_id,
-            email=email,
-            start_at=start_at.isoformat(),
-            table_name=table_name,
+    def __init__(self, session: AsyncSession):
+        self.outbox_repository = OutboxRepository(session)
+
+    def send_booking_created(
+            self,
+            booking_id: int,
+            email: str,
+            start_at: datetime,
+            table_name: str,
+    ) -> None:
+        self.outbox_repository.add(
+            send_booking_created_notification.name,
+            {
+                "booking_id": booking_id,
+                "email": email,
+                "start_at": start_at.isoformat(),
+                "table_name": table_name,
+            },
         )
+
+    def send_bookings_created(self, email: str, bookings: list[tuple[int, datetime, str]]) -> None:
+        self.outbox_repository.add(
+            send_bookings_created_notification.name,
+            {
+                "email": email,
+                "bookings": [
+                    {
+                        "booking_id": booking_id,
+                        "start_at": start_at.isoformat(),
+                        "table_name": table_name,
+                    }
+                    for booking_id, start_at, table_name in bookings
+                ],
+            },
+        )
+
+    def send_waitlist_promoted(
+            self,
+            booking_id: int,
+            email: str,
+            start_at: datetime,
+            table_name: str,
+    ) -> None:
+        self.outbox_repository.add(
+            send_waitlist_promoted_notification.name,
+            {
+                "booking_id": booking_id,
+                "email": email,
+                "start_at": start_at.isoformat(),
+                "table_name": table_name,
+            },
+        )
+
+    def send_bookings_canceled(self, bookings: list[tuple[int, str, datetime, str]]) -> None:
+        self.add_batched(send_bookings_canceled_notification.name, bookings)
+
+    def send_booking_reminders(self, bookings: list[tuple[int, str, datetime, str]]) -> None:
+        self.add_batched(send_booking_reminders_notification.name, bookings)
+
+    def add_batched(self, task_name: str, bookings: list[tuple[int, str, datetime, str]]) -> None:
+        batch_size = settings.NOTIFICATION_BATCH_SIZE
+        for offset in range(0, len(bookings), batch_size):
+            batch = bookings[offset:offset + batch_size]
+            self.outbox_repository.add(
+                task_name,
+                {
+                    "bookings": [
+                        {
+                            "booking_id": booking_id,
+                            "email": email,
+                            "start_at": start_at.isoformat(),
+                            "table_name": table_name,
+                        }
+                        for booking_id, email, start_at, table_name in batch
+                    ],
+                },
+            )
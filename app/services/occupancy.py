@@ -0,0 +1,447 @@
+import logging
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from time import monotonic
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.booking import BookingRepository
+from app.repositories.table import TableRepository
+from app.schemas.table import TableResponse
+from app.services.cache import RedisClientProvider
+from app.services.dispatcher import task_dispatcher
+from app.services.occupancy_store import OccupancyStoreProtocol, RedisOccupancyStore
+from app.services.slot import BookingSlotService
+
+logger = logging.getLogger(__name__)
+
+
+class DayOccupancy:
+    def __init__(self, window_start: datetime, window_end: datetime, granule_minutes: int):
+        self.window_start = window_start
+        self.window_end = window_end
+        self.granule = timedelta(minutes=granule_minutes)
+        self.bitsets: dict[int, int] = {}
+        self.is_exact = True
+        self.loaded_at = monotonic()
+        self.generation: tuple[int, int] | None = None
+
+    @classmethod
+    def for_date(cls, slot_date: date) -> "DayOccupancy":
+        window_start, window_end = BookingSlotService.get_workday_bounds(slot_date)
+        return cls(window_start, window_end, settings.OCCUPANCY_GRANULE_MINUTES)
+
+    def get_offsets(self, start_at: datetime, end_at: datetime) -> tuple[int, int, bool]:
+        start_at = max(BookingSlotService.to_utc(start_at), self.window_start)
+        end_at = min(BookingSlotService.to_utc(end_at), self.window_end)
+        if start_at >= end_at:
+            return 0, 0, True
+        start_offset, start_rest = divmod(start_at - self.window_start, self.granule)
+        end_offset, end_rest = divmod(end_at - self.window_start, self.granule)
+        if end_rest:
+            end_offset += 1
+        return start_offset, end_offset, not start_rest and not end_rest
+
+    def get_mask(self, start_at: datetime, end_at: datetime) -> tuple[int, bool]:
+        start_offset, end_offset, is_aligned = self.get_offsets(start_at, end_at)
+        return ((1 << (end_offset - start_offset)) - 1) << start_offset, is_aligned
+
+    def get_granules_count(self) -> int:
+        return -(-(self.window_end - self.window_start) // self.granule)
+
+    def occupy(self, table_id: int, start_at: datetime, end_at: datetime) -> None:
+        mask, is_aligned = self.get_mask(start_at, end_at)
+        if not is_aligned:
+            self.is_exact = False
+        self.bitsets[table_id] = self.bitsets.get(table_id, 0) | mask
+
+    def release(self, table_id: int, start_at: datetime, end_at: datetime) -> bool:
+        mask, is_aligned = self.get_mask(start_at, end_at)
+        if not is_aligned or not self.is_exact:
+            return False
+        self.bitsets[table_id] = self.bitsets.get(table_id, 0) & ~mask
+        return True
+
+    def encode_bitset(self, table_id: int) -> bytes:
+        granules_count = self.get_granules_count()
+        bitset = self.bitsets.get(table_id, 0)
+        encoded = bytearray(-(-granules_count // 8))
+        for offset in range(granules_count):
+            if bitset >> offset & 1:
+                encoded[offset // 8] |= 0x80 >> (offset % 8)
+        return bytes(encoded)
+
+    def is_free(self, table_id: int, mask: int) -> bool:
+        return not self.bitsets.get(table_id, 0) & mask
+
+    def get_free_table_ids(
+            self,
+            table_ids: list[int],
+            start_at: datetime,
+            end_at: datetime,
+    ) -> list[int] | None:
+        if not self.is_exact:
+            return None
+        mask, is_aligned = self.get_mask(start_at, end_at)
+        if not is_aligned:
+            return None
+        return [table_id for table_id in table_ids if self.is_free(table_id, mask)]
+
+
+class TableSchedule:
+    def __init__(self, intervals: list[tuple[datetime, datetime]]):
+        intervals = sorted(intervals)
+        self.starts = [start_at for start_at, _ in intervals]
+        self.max_ends = list(accumulate((end_at for _, end_at in intervals), max))
+
+    @classmethod
+    def build_many(
+            cls,
+            intervals: list[tuple[int, datetime, datetime]],
+    ) -> dict[int, "TableSchedule"]:
+        grouped: dict[int, list[tuple[datetime, datetime]]] = {}
+        for table_id, start_at, end_at in intervals:
+            grouped.setdefault(table_id, []).append(
+                (BookingSlotService.to_utc(start_at), BookingSlotService.to_utc(end_at))
+            )
+        return {table_id: cls(items) for table_id, items in grouped.items()}
+
+    def is_free(self, start_at: datetime, end_at: datetime) -> bool:
+        position = bisect_left(self.starts, end_at)
+        return position == 0 or self.max_ends[position - 1] <= start_at
+
+
+class OccupancyIndex:
+    def __init__(self) -> None:
+        self._days: dict[date, DayOccupancy] = {}
+        self._versions: dict[date, int] = {}
+        self._tables: list[TableResponse] | None = None
+        self._tables_loaded_at = 0.0
+        self._tables_version = 0
+
+    def clear(self) -> None:
+        self._days.clear()
+        self._versions.clear()
+        self.reset_tables()
+
+    def get_day(
+            self,
+            slot_date: date,
+            generation: tuple[int, int] | None = None,
+    ) -> DayOccupancy | None:
+        day = self._days.get(slot_date)
+        if day is None:
+            return None
+        is_expired = monotonic() - day.loaded_at > settings.OCCUPANCY_INDEX_TTL_SECONDS
+        # Another worker wrote the day: its pub/sub message may not have arrived yet.
+        if is_expired or (generation is not None and day.generation != generation):
+            self._days.pop(slot_date, None)
+            return None
+        return day
+
+    def get_version(self, slot_date: date) -> int:
+        return self._versions.get(slot_date, 0)
+
+    def put_day(self, slot_date: date, day: DayOccupancy, version: int) -> None:
+        # A write landed while the day was loading: the snapshot may miss it.
+        if self.get_version(slot_date) == version:
+            self._days[slot_date] = day
+
+    def advance_generation(self, slot_date: date, date_generation: int) -> None:
+        day = self._days.get(slot_date)
+        if day is None or day.generation is None:
+            return
+        namespace_generation, previous_generation = day.generation
+        if previous_generation == date_generation - 1:
+            day.generation = (namespace_generation, date_generation)
+        else:
+            self._days.pop(slot_date, None)
+
+    def drop_day(self, slot_date: date) -> None:
+        self._versions[slot_date] = self.get_version(slot_date) + 1
+        self._days.pop(slot_date, None)
+
+    def occupy(self, table_id: int, start_at: datetime, end_at: datetime) -> None:
+        for slot_date in BookingSlotService.get_restaurant_dates(start_at, end_at):
+            self._versions[slot_date] = self.get_version(slot_date) + 1
+            day = self._days.get(slot_date)
+            if day is not None:
+                day.occupy(table_id, start_at, end_at)
+
+    def release(self, table_id: int, start_at: datetime, end_at: datetime) -> None:
+        for slot_date in BookingSlotService.get_restaurant_dates(start_at, end_at):
+            self._versions[slot_date] = self.get_version(slot_date) + 1
+            day = self._days.get(slot_date)
+            if day is not None and not day.release(table_id, start_at, end_at):
+                self._days.pop(slot_date, None)
+
+    def get_tables(self) -> list[TableResponse] | None:
+        if self._tables is None:
+            return None
+        if monotonic() - self._tables_loaded_at > settings.OCCUPANCY_INDEX_TTL_SECONDS:
+            self._tables = None
+            return None
+        return self._tables
+
+    def get_tables_version(self) -> int:
+        return self._tables_version
+
+    def put_tables(self, tables: list[TableResponse], version: int) -> None:
+        if self._tables_version == version:
+            self._tables = tables
+            self._tables_loaded_at = monotonic()
+
+    def reset_tables(self) -> None:
+        self._tables_version += 1
+        self._tables = None
+
+
+occupancy_index = OccupancyIndex()
+
+
+class OccupancyService:
+    STORE_LOOKUP_ATTEMPTS = 3
+    RECONCILE_TASK_NAME = "app.tasks.availability.reconcile_occupancy_store"
+
+    def __init__(
+            self,
+            session: AsyncSession,
+            index: OccupancyIndex | None = None,
+            store: OccupancyStoreProtocol | None = None,
+    ):
+        self.session = session
+        self.booking_repository = BookingRepository(session)
+        self.table_repository = TableRepository(session)
+        self.index = index or occupancy_index
+        self.store = store
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.AVAILABILITY_BACKEND == "memory"
+
+    @staticmethod
+    def is_store_enabled() -> bool:
+        return settings.AVAILABILITY_BACKEND == "redis"
+
+    def get_store(self) -> OccupancyStoreProtocol:
+        if self.store is None:
+            self.store = RedisOccupancyStore(RedisClientProvider.get_client())
+        return self.store
+
+    async def list_available(
+            self,
+            start_at: datetime,
+            end_at: datetime,
+            guests: int,
+            generation: tuple[int, int] | None = None,
+    ) -> list[TableResponse] | None:
+        if self.is_store_enabled():
+            return await self.list_available_from_store(start_at, end_at, guests)
+        if not self.is_enabled():
+            return None
+        day = await self.get_day(BookingSlotService.get_restaurant_date(start_at), generation)
+        tables = [table for table in await self.get_tables() if table.seats >= guests]
+        free_table_ids = day.get_free_table_ids([table.id for table in tables], start_at, end_at)
+        if free_table_ids is None:
+            return None
+        free_ids = set(free_table_ids)
+        return [table for table in tables if table.id in free_ids]
+
+    async def list_available_from_store(
+            self,
+            start_at: datetime,
+            end_at: datetime,
+            guests: int,
+    ) -> list[TableResponse] | None:
+        slot_date = BookingSlotService.get_restaurant_date(start_at)
+        day = DayOccupancy.for_date(slot_date)
+        start_offset, end_offset, is_aligned = day.get_offsets(start_at, end_at)
+        if not is_aligned or start_offset == end_offset:
+            return None
+        store = self.get_store()
+        for _ in range(self.STORE_LOOKUP_ATTEMPTS):
+            status, tables = await store.list_available(slot_date, start_offset, end_offset, guests)
+            if status == RedisOccupancyStore.STATUS_OK:
+                return tables
+            if status == RedisOccupancyStore.STATUS_MISSING_TABLES:
+                await self.rebuild_store_tables()
+            elif status == RedisOccupancyStore.STATUS_MISSING_DAY:
+                await self.rebuild_store_day(slot_date)
+            else:
+                return None
+        return None
+
+    async def rebuild_store_tables(self) -> list[TableResponse]:
+        items = await self.table_repository.get_list()
+        tables = [TableResponse.model_validate(item) for item in items]
+        await self.get_store().put_tables(tables)
+        return tables
+
+    async def rebuild_store(self, slot_dates: list[date]) -> int:
+        tables = await self.rebuild_store_tables()
+        table_ids = [table.id for table in tables]
+        rebuilt = 0
+        for slot_date in slot_dates:
+            for _ in range(self.STORE_LOOKUP_ATTEMPTS):
+                if await self.rebuild_store_day(slot_date, table_ids):
+                    rebuilt += 1
+                    break
+            else:
+                logger.warning(
+                    "Occupancy day changed during rebuild.",
+                    extra={"date": slot_date.isoformat()},
+                )
+        return rebuilt
+
+    async def rebuild_store_day(self, slot_date: date, table_ids: list[int] | None = None) -> bool:
+        store = self.get_store()
+        version = await store.get_version(slot_date)
+        day = await self.load_day(slot_date)
+        if table_ids is None:
+            table_ids = [table.id for table in await self.table_repository.get_list()]
+        bitsets = {table_id: day.encode_bitset(table_id) for table_id in table_ids}
+        return await store.put_day(slot_date, bitsets, day.is_exact, version)
+
+    async def get_free_tables_by_start_time(
+            self,
+            slot_date: date,
+            start_times: list[time],
+            tables: list[TableResponse],
+            generation: tuple[int, int] | None = None,
+    ) -> list[tuple[time, list[TableResponse]]]:
+        slots = [
+            (slot_time, *BookingSlotService.build_slot(slot_date, slot_time))
+            for slot_time in start_times
+        ]
+        day = await self.get_day(slot_date, generation)
+        masks = [day.get_mask(start_at, end_at) for _, start_at, end_at in slots]
+        if day.is_exact and all(is_aligned for _, is_aligned in masks):
+            grid: list[tuple[time, list[TableResponse]]] = []
+            for (slot_time, _, _), (mask, _) in zip(slots, masks, strict=True):
+                grid.append((slot_time, [table for table in tables if day.is_free(table.id, mask)]))
+            return grid
+
+        intervals = await self.booking_repository.list_intervals(day.window_start, day.window_end)
+        schedules = TableSchedule.build_many(intervals)
+        grid = []
+        for slot_time, start_at, end_at in slots:
+            free_tables = [
+                table
+                for table in tables
+                if table.id not in schedules or schedules[table.id].is_free(start_at, end_at)
+            ]
+            grid.append((slot_time, free_tables))
+        return grid
+
+    async def find_free_slots(
+            self,
+            slots: list[tuple[datetime, datetime]],
+            tables: list[TableResponse],
+            limit: int,
+    ) -> list[tuple[TableResponse, datetime, datetime]]:
+        if not slots or not tables:
+            return []
+        intervals = await self.booking_repository.list_intervals(
+            start_at=slots[0][0],
+            end_at=max(end_at for _, end_at in slots),
+            table_ids=[table.id for table in tables],
+        )
+        schedules = TableSchedule.build_many(intervals)
+        found: list[tuple[TableResponse, datetime, datetime]] = []
+        for start_at, end_at in slots:
+            for table in tables:
+                if table.id in schedules and not schedules[table.id].is_free(start_at, end_at):
+                    continue
+                found.append((table, start_at, end_at))
+                if len(found) == limit:
+                    return found
+        return found
+
+    async def get_day(
+            self,
+            slot_date: date,
+            generation: tuple[int, int] | None = None,
+    ) -> DayOccupancy:
+        day = self.index.get_day(slot_date, generation) if self.is_enabled() else None
+        if day is not None:
+            return day
+        version = self.index.get_version(slot_date)
+        day = await self.load_day(slot_date)
+        day.generation = generation
+        if self.is_enabled():
+            self.index.put_day(slot_date, day, version)
+        return day
+
+    async def load_day(self, slot_date: date) -> DayOccupancy:
+        day = DayOccupancy.for_date(slot_date)
+        intervals = await self.booking_repository.list_intervals(day.window_start, day.window_end)
+        for table_id, start_at, end_at in intervals:
+            day.occupy(table_id, start_at, end_at)
+        return day
+
+    async def get_tables(self) -> list[TableResponse]:
+        tables = self.index.get_tables() if self.is_enabled() else None
+        if tables is not None:
+            return tables
+        version = self.index.get_tables_version()
+        items = await self.table_repository.get_list()
+        tables = [TableResponse.model_validate(item) for item in items]
+        if self.is_enabled():
+            self.index.put_tables(tables, version)
+        return tables
+
+    async def occupy(self, table_id: int, start_at: datetime, end_at: datetime) -> None:
+        if self.is_store_enabled():
+            await self.write_store(table_id, start_at, end_at, is_occupied=True)
+        if self.is_enabled():
+            self.index.occupy(table_id, start_at, end_at)
+
+    async def release(self, table_id: int, start_at: datetime, end_at: datetime) -> None:
+        if self.is_store_enabled():
+            await self.write_store(table_id, start_at, end_at, is_occupied=False)
+        if self.is_enabled():
+            self.index.release(table_id, start_at, end_at)
+
+    async def write_store(
+            self,
+            table_id: int,
+            start_at: datetime,
+            end_at: datetime,
+            is_occupied: bool,
+    ) -> None:
+        stale_dates: list[date] = []
+        for slot_date in BookingSlotService.get_restaurant_dates(start_at, end_at):
+            day = DayOccupancy.for_date(slot_date)
+            start_offset, end_offset, is_aligned = day.get_offsets(start_at, end_at)
+            try:
+                await self.get_store().write(
+                    slot_date,
+                    table_id,
+                    start_offset=start_offset,
+                    end_offset=end_offset,
+                    is_occupied=is_occupied,
+                    is_aligned=is_aligned,
+                )
+            except RedisError:
+                logger.exception(
+                    "Occupancy store write failed.",
+                    extra={"date": slot_date.isoformat()},
+                )
+                stale_dates.append(slot_date)
+        if stale_dates:
+            task_dispatcher.submit(
+                self.RECONCILE_TASK_NAME,
+                {"dates": [slot_date.isoformat() for slot_date in stale_dates]},
+            )
+
+    def advance_generation(self, slot_date: date, date_generation: int) -> None:
+        if self.is_enabled():
+            self.index.advance_generation(slot_date, date_generation)
+
+    async def reset_tables(self) -> None:
+        if self.is_store_enabled():
+            await self.get_store().reset_tables()
+        self.index.reset_tables()
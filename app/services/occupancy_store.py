@@ -0,0 +1,170 @@
+from datetime import date
+from typing import Protocol
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.schemas.table import TableResponse
+
+
+class OccupancyStoreProtocol(Protocol):
+    async def list_available(
+            self,
+            slot_date: date,
+            start_offset: int,
+            end_offset: int,
+            guests: int,
+    ) -> tuple[str, list[TableResponse]]: ...
+
+    async def get_version(self, slot_date: date) -> int: ...
+
+    async def put_day(
+            self,
+            slot_date: date,
+            bitsets: dict[int, bytes],
+            is_exact: bool,
+            version: int,
+    ) -> bool: ...
+
+    async def put_tables(self, tables: list[TableResponse]) -> None: ...
+
+    async def reset_tables(self) -> None: ...
+
+    async def write(
+            self,
+            slot_date: date,
+            table_id: int,
+            start_offset: int,
+            end_offset: int,
+            is_occupied: bool,
+            is_aligned: bool,
+    ) -> None: ...
+
+
+class RedisOccupancyStore:
+    STATUS_OK = "ok"
+    STATUS_INEXACT = "inexact"
+    STATUS_MISSING_DAY = "missing_day"
+    STATUS_MISSING_TABLES = "missing_tables"
+    KEY_PREFIX = "occupancy:"
+    TABLES_KEY = "occupancy:tables"
+
+    # Every key of a day shares the {date} hash tag, so the script stays on one Cluster slot.
+    _LIST_AVAILABLE_SCRIPT = """
+local state = redis.call('get', KEYS[1])
+if not state then return {'missing_day'} end
+if state ~= 'exact' then return {'inexact'} end
+local result = {'ok'}
+for index = 2, #KEYS do
+    if redis.call('bitcount', KEYS[index], ARGV[1], ARGV[2], 'BIT') == 0 then
+        result[#result + 1] = tostring(index - 1)
+    end
+end
+return result
+"""
+
+    def __init__(self, redis_client: Redis):
+        self.redis_client = redis_client
+        self._list_available_script = redis_client.register_script(self._LIST_AVAILABLE_SCRIPT)
+
+    @classmethod
+    def get_day_key_prefix(cls, slot_date: date) -> str:
+        return f"{cls.KEY_PREFIX}{{{slot_date.isoformat()}}}:"
+
+    @classmethod
+    def get_table_key(cls, slot_date: date, table_id: int) -> str:
+        return f"{cls.get_day_key_prefix(slot_date)}t{table_id}"
+
+    @classmethod
+    def get_state_key(cls, slot_date: date) -> str:
+        return f"{cls.get_day_key_prefix(slot_date)}state"
+
+    @classmethod
+    def get_version_key(cls, slot_date: date) -> str:
+        return f"{cls.get_day_key_prefix(slot_date)}version"
+
+    async def list_available(
+            self,
+            slot_date: date,
+            start_offset: int,
+            end_offset: int,
+            guests: int,
+    ) -> tuple[str, list[TableResponse]]:
+        items = await self.redis_client.hvals(self.TABLES_KEY)
+        if not items:
+            return self.STATUS_MISSING_TABLES, []
+        tables = [TableResponse.model_validate_json(item) for item in items]
+        tables = sorted(
+            (table for table in tables if table.seats >= guests),
+            key=lambda table: (table.seats, table.id),
+        )
+        table_keys = [self.get_table_key(slot_date, table.id) for table in tables]
+        status, *free_positions = await self._list_available_script(
+            keys=[self.get_state_key(slot_date), *table_keys],
+            args=[start_offset, end_offset - 1],
+        )
+        return status, [tables[int(position) - 1] for position in free_positions]
+
+    async def get_version(self, slot_date: date) -> int:
+        version = await self.redis_client.get(self.get_version_key(slot_date))
+        return int(version) if version is not None else 0
+
+    async def put_day(
+            self,
+            slot_date: date,
+            bitsets: dict[int, bytes],
+            is_exact: bool,
+            version: int,
+    ) -> bool:
+        ttl = settings.OCCUPANCY_STORE_TTL_SECONDS
+        version_key = self.get_version_key(slot_date)
+        async with self.redis_client.pipeline(transaction=True) as pipeline:
+            await pipeline.watch(version_key)
+            current_version = await pipeline.get(version_key)
+            if (int(current_version) if current_version is not None else 0) != version:
+                return False
+            pipeline.multi()
+            for table_id, bitset in bitsets.items():
+                if bitset.strip(b"\x00"):
+                    pipeline.set(self.get_table_key(slot_date, table_id), bitset, ex=ttl)
+                else:
+                    pipeline.delete(self.get_table_key(slot_date, table_id))
+            pipeline.set(self.get_state_key(slot_date), "exact" if is_exact else "inexact", ex=ttl)
+            await pipeline.execute()
+        return True
+
+    async def put_tables(self, tables: list[TableResponse]) -> None:
+        async with self.redis_client.pipeline(transaction=True) as pipeline:
+            pipeline.delete(self.TABLES_KEY)
+            if tables:
+                mapping = {str(table.id): table.model_dump_json() for table in tables}
+                pipeline.hset(self.TABLES_KEY, mapping=mapping)
+                pipeline.expire(self.TABLES_KEY, settings.OCCUPANCY_STORE_TTL_SECONDS)
+            await pipeline.execute()
+
+    async def reset_tables(self) -> None:
+        await self.redis_client.delete(self.TABLES_KEY)
+
+    async def write(
+            self,
+            slot_date: date,
+            table_id: int,
+            start_offset: int,
+            end_offset: int,
+            is_occupied: bool,
+            is_aligned: bool,
+    ) -> None:
+        ttl = settings.OCCUPANCY_STORE_TTL_SECONDS
+        table_key = self.get_table_key(slot_date, table_id)
+        async with self.redis_client.pipeline(transaction=True) as pipeline:
+            # Unaligned intervals share granules with neighbours, so the day falls back to Postgres.
+            if not is_aligned:
+                state_key = self.get_state_key(slot_date)
+                pipeline.set(state_key, self.STATUS_INEXACT, xx=True, keepttl=True)
+            if is_occupied or is_aligned:
+                for offset in range(start_offset, end_offset):
+                    pipeline.setbit(table_key, offset, int(is_occupied))
+                pipeline.expire(table_key, ttl)
+            pipeline.incr(self.get_version_key(slot_date))
+            pipeline.expire(self.get_version_key(slot_date), ttl)
+            await pipeline.execute()
@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.outbox import OutboxRepository
+from app.services.dispatcher import TaskDispatcher, TaskPublisher
+from app.tasks.booking import NOTIFICATION_EMAIL_BUILDERS, deliver_notifications
+
+
+class OutboxRelayService:
+    def __init__(self, session: AsyncSession, publisher: TaskPublisher | None = None):
+        self.session = session
+        self.outbox_repository = OutboxRepository(session)
+        self.publisher = publisher or TaskDispatcher.publish_to_celery
+
+    async def relay(self, batch_size: int, max_batches: int) -> int:
+        relayed = 0
+        for _ in range(max_batches):
+            messages = await self.outbox_repository.claim_pending(limit=batch_size)
+            if not messages:
+                break
+            notifications = []
+            for message in messages:
+                if message.task_name in NOTIFICATION_EMAIL_BUILDERS:
+                    notifications.append(
+                        {"task_name": message.task_name, "payload": message.payload}
+                    )
+                else:
+                    self.publisher(message.task_name, message.payload)
+            if notifications:
+                self.publisher(deliver_notifications.name, {"notifications": notifications})
+            await self.outbox_repository.mark_published(
+                [message.id for message in messages],
+                published_at=datetime.now(tz=timezone.utc),
+            )
+            await self.session.commit()
+            relayed += len(messages)
+            if len(messages) < batch_size:
+                break
+        return relayed
+
+
+    async def prune(self, published_before: datetime, batch_size: int, max_batches: int) -> int:
+        pruned = 0
+        for _ in range(max_batches):
+            deleted = await self.outbox_repository.delete_published(
+                published_before=published_before,
+                limit=batch_size,
+            )
+            await self.session.commit()
+            pruned += deleted
+            if deleted < batch_size:
+                break
+        return pruned
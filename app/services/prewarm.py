@@ -0,0 +1,97 @@
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.booking import BookingRepository
+from app.repositories.table import TableRepository
+from app.schemas.table import TableResponse
+from app.services.cache import CachePayload, CacheServiceProtocol
+from app.services.occupancy import TableSchedule
+from app.services.slot import BookingSlotService
+from app.services.table import TableService
+
+
+class AvailabilityPrewarmService:
+    def __init__(self, session: AsyncSession, cache_service: CacheServiceProtocol):
+        self.session = session
+        self.booking_repository = BookingRepository(session)
+        self.table_repository = TableRepository(session)
+        self.cache_service = cache_service
+
+    @staticmethod
+    def get_horizon_dates(today: date | None = None) -> list[date]:
+        if today is None:
+            today = BookingSlotService.get_restaurant_date(datetime.now(tz=timezone.utc))
+        days = settings.AVAILABILITY_PREWARM_DAYS
+        return [today + timedelta(days=offset) for offset in range(days)]
+
+    async def prewarm(self, slot_dates: list[date]) -> int:
+        slot_dates = sorted(set(slot_dates))
+        if not slot_dates:
+            return 0
+        generations = await self.get_generations(slot_dates)
+        items = await self.table_repository.get_list()
+        tables = [TableResponse.model_validate(item) for item in items]
+        window_start, _ = BookingSlotService.get_workday_bounds(slot_dates[0])
+        _, window_end = BookingSlotService.get_workday_bounds(slot_dates[-1])
+        intervals = await self.booking_repository.list_intervals(window_start, window_end)
+        schedules = TableSchedule.build_many(intervals)
+        dumped_tables = {table.id: table.model_dump(mode="json") for table in tables}
+
+        written = 0
+        for slot_date in slot_dates:
+            generation = generations[slot_date]
+            payloads: dict[str, CachePayload] = {}
+            scores: dict[str, float] = {}
+            grid: list[dict] = []
+            for slot_time in BookingSlotService.get_start_times(slot_date):
+                start_at, end_at = BookingSlotService.build_slot(slot_date, slot_time)
+                items = [
+                    dumped_tables[table.id]
+                    for table in tables
+                    if table.id not in schedules or schedules[table.id].is_free(start_at, end_at)
+                ]
+                restaurant_start = BookingSlotService.get_restaurant_datetime(slot_date, slot_time)
+                cache_key = TableService.get_available_cache_key(slot_date, slot_time, generation)
+                payloads[cache_key] = items
+                score = TableService.get_available_cache_score(restaurant_start, slot_date)
+                scores[cache_key] = score
+                grid.append({"time": slot_time.isoformat(), "tables": items})
+            grid_cache_key = TableService.get_availability_grid_cache_key(slot_date, generation)
+            payloads[grid_cache_key] = grid
+            scores[grid_cache_key] = TableService.DAY_WIDE_CACHE_SCORE
+            await self.write(slot_date, payloads, scores)
+            written += len(payloads)
+        return written
+
+    async def get_generations(self, slot_dates: list[date]) -> dict[date, str | None]:
+        if not TableService.is_generation_cache_mode():
+            return {slot_date: None for slot_date in slot_dates}
+        namespace_generation, *date_generations = await self.cache_service.get_generations(
+            [
+                TableService.get_available_generation_key(),
+                *(TableService.get_available_generation_key(slot_date) for slot_date in slot_dates),
+            ],
+            ttl=settings.CACHE_GENERATION_TTL_SECONDS,
+        )
+        return {
+            slot_date: f"{namespace_generation}.{date_generation}"
+            for slot_date, date_generation in zip(slot_dates, date_generations, strict=True)
+        }
+
+    async def write(
+            self,
+            slot_date: date,
+            payloads: dict[str, CachePayload],
+            scores: dict[str, float],
+    ) -> None:
+        if TableService.is_generation_cache_mode():
+            await self.cache_service.set_json_many(payloads, ttl=settings.CACHE_TTL_SECONDS)
+            return
+        await self.cache_service.set_json_many(
+            payloads,
+            ttl=settings.CACHE_TTL_SECONDS,
+            index_key=TableService.get_available_cache_index_key(slot_date),
+            scores=scores,
+        )
@@ -0,0 +1,21 @@
+from datetime import date
+from typing import Protocol
+
+from app.core.config import settings
+from app.services.dispatcher import task_dispatcher
+from app.tasks.availability import prewarm_availability
+
+
+class AvailabilityPrewarmQueueProtocol(Protocol):
+    def enqueue(self, slot_dates: list[date]) -> None: ...
+
+
+class AvailabilityPrewarmQueue:
+    @staticmethod
+    def enqueue(slot_dates: list[date]) -> None:
+        if not settings.AVAILABILITY_PREWARM_ENABLED or not slot_dates:
+            return
+        task_dispatcher.submit(
+            prewarm_availability.name,
+            {"dates": [slot_date.isoformat() for slot_date in sorted(set(slot_dates))]},
+        )
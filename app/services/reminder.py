@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.booking import BookingRepository
+from app.services.notification import NotificationService, NotificationServiceProtocol
+
+
+class BookingReminderService:
+    def __init__(
+            self,
+            session: AsyncSession,
+            notification_service: NotificationServiceProtocol | None = None,
+    ):
+        self.session = session
+        self.booking_repository = BookingRepository(session)
+        self.notification_service = notification_service or NotificationService(session)
+
+    async def send_due(self, now_at: datetime, batch_size: int, max_batches: int) -> int:
+        window_end = now_at + timedelta(hours=settings.BOOKING_REMINDER_HOURS_BEFORE)
+        after: tuple[datetime, int] | None = None
+        reminded = 0
+        for _ in range(max_batches):
+            bookings = await self.booking_repository.list_reminder_due(
+                start_from=now_at,
+                start_to=window_end,
+                limit=batch_size,
+                after=after,
+            )
+            if not bookings:
+                break
+            booking_ids = [booking.id for booking in bookings]
+            await self.booking_repository.mark_reminded(booking_ids, reminded_at=now_at)
+            self.notification_service.send_booking_reminders(
+                [
+                    (booking.id, booking.user.email, booking.start_at, booking.table.name)
+                    for booking in bookings
+                ]
+            )
+            await self.session.commit()
+            reminded += len(bookings)
+            if len(bookings) < batch_size:
+                break
+            after = (bookings[-1].start_at, bookings[-1].id)
+        return reminded
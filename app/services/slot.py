@@ -2,6 +2,7 @@ from datetime import date, datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 from app.core.config import settings
+from app.core.exceptions import BusinessRuleError
 
 
 class BookingSlotService:
@@ -29,18 +30,65 @@ class BookingSlotService:
         return restaurant_start.astimezone(timezone.utc), restaurant_end.astimezone(timezone.utc)
 
     @classmethod
-    def can_book_time(cls, slot_date: date, slot_time: time) -> bool:
+    def get_workday_bounds(cls, slot_date: date) -> tuple[datetime, datetime]:
         restaurant_timezone = cls.get_restaurant_timezone()
-        restaurant_start = cls.get_restaurant_datetime(slot_date, slot_time)
         workday_start = datetime.combine(
-            restaurant_start.date(),
+            slot_date,
             time(hour=settings.WORKDAY_START_HOUR),
             tzinfo=restaurant_timezone,
         )
         workday_end = datetime.combine(
-            restaurant_start.date(),
+            slot_date,
             time(hour=settings.WORKDAY_END_HOUR),
             tzinfo=restaurant_timezone,
         )
+        return workday_start.astimezone(timezone.utc), workday_end.astimezone(timezone.utc)
+
+    @classmethod
+    def get_start_times(cls, slot_date: date) -> list[time]:
+        restaurant_timezone = cls.get_restaurant_timezone()
+        workday_start, workday_end = cls.get_workday_bounds(slot_date)
+        latest_start = workday_end - timedelta(hours=settings.BOOKING_SLOT_HOURS)
+        step = timedelta(minutes=settings.BOOKING_SLOT_STEP_MINUTES)
+        start_times: list[time] = []
+        current_start = workday_start
+        while current_start <= latest_start:
+            start_times.append(current_start.astimezone(restaurant_timezone).time())
+            current_start += step
+        return start_times
+
+    @classmethod
+    def get_restaurant_date(cls, moment: datetime) -> date:
+        return cls.to_utc(moment).astimezone(cls.get_restaurant_timezone()).date()
+
+    @classmethod
+    def get_restaurant_dates(cls, start_at: datetime, end_at: datetime) -> list[date]:
+        first_date = cls.get_restaurant_date(start_at)
+        last_date = cls.get_restaurant_date(cls.to_utc(end_at) - timedelta(microseconds=1))
+        days_count = (last_date - first_date).days + 1
+        return [first_date + timedelta(days=offset) for offset in range(days_count)]
+
+    @staticmethod
+    def to_utc(moment: datetime) -> datetime:
+        if moment.tzinfo is None:
+            return moment.replace(tzinfo=timezone.utc)
+        return moment.astimezone(timezone.utc)
+
+    @classmethod
+    def can_book_time(cls, slot_date: date, slot_time: time) -> bool:
+        restaurant_start = cls.get_restaurant_datetime(slot_date, slot_time)
+        workday_start, workday_end = cls.get_workday_bounds(restaurant_start.date())
         latest_start = workday_end - timedelta(hours=settings.BOOKING_SLOT_HOURS)
         return workday_start <= restaurant_start <= latest_start
+
+    @classmethod
+    def build_bookable_slot(cls, slot_date: date, slot_time: time) -> tuple[datetime, datetime]:
+        if not cls.can_book_time(slot_date, slot_time):
+            raise BusinessRuleError(
+                f"Booking is available from {settings.WORKDAY_START_HOUR}:00 "
+                f"to {settings.WORKDAY_END_HOUR - settings.BOOKING_SLOT_HOURS}:00."
+            )
+        start_at, end_at = cls.build_slot(slot_date, slot_time)
+        if start_at <= datetime.now(tz=timezone.utc):
+            raise BusinessRuleError("Booking start must be in the future.")
+        return start_at, end_at
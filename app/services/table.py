@@ -1,5 +1,9 @@
-from datetime import date, time
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, time, timedelta, timezone
 
+from pydantic import TypeAdapter
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,56 +12,230 @@ from app.core.exceptions import BusinessRuleError, ConflictError, NotFoundError
 from app.models.table import RestaurantTable
 from app.repositories.table import TableRepository
 from app.schemas.table import (
+    AvailabilityGridResponse,
+    AvailabilityGridSlotResponse,
     AvailableTablesResponse,
+    NextAvailableSlotsResponse,
     TableCreateRequest,
     TableResponse,
     TablesListResponse,
+    TableSlotResponse,
     TableUpdateRequest,
 )
-from app.services.cache import CacheServiceProtocol
+from app.services.cache import CachePayload, CacheServiceProtocol, cache_single_flight
+from app.services.hold import BookingHoldService
+from app.services.occupancy import OccupancyService, occupancy_index
 from app.services.slot import BookingSlotService
 
 
 class TableService:
-    def __init__(self, session: AsyncSession, cache_service: CacheServiceProtocol):
+    AVAILABLE_CACHE_PREFIX = "tables:available:"
+    DAY_WIDE_CACHE_SCORE = -1
+    TABLES_ADAPTER = TypeAdapter(list[TableResponse])
+
+    def __init__(
+            self,
+            session: AsyncSession,
+            cache_service: CacheServiceProtocol,
+            occupancy_service: OccupancyService | None = None,
+    ):
         self.session = session
         self.table_repository = TableRepository(session)
         self.cache_service = cache_service
+        self.occupancy_service = occupancy_service or OccupancyService(session)
+        self.hold_service = BookingHoldService(session, cache_service)
 
     async def get_available(self, slot_date: date, slot_time: time, guests: int) -> AvailableTablesResponse:
+        tables_json = await self.get_available_tables_json(slot_date, slot_time, guests)
+        return AvailableTablesResponse(
+            date=slot_date,
+            time=slot_time,
+            guests=guests,
+            slot_hours=settings.BOOKING_SLOT_HOURS,
+            tables=self.TABLES_ADAPTER.validate_json(tables_json),
+        )
+
+    async def get_available_body(self, slot_date: date, slot_time: time, guests: int) -> bytes:
+        tables_json = await self.get_available_tables_json(slot_date, slot_time, guests)
+        header = AvailableTablesResponse(
+            date=slot_date,
+            time=slot_time,
+            guests=guests,
+            slot_hours=settings.BOOKING_SLOT_HOURS,
+            tables=[],
+        ).model_dump_json(exclude={"tables"})
+        return b"".join((header[:-1].encode(), b',"tables":', tables_json, b"}"))
+
+    async def get_available_tables_json(
+            self,
+            slot_date: date,
+            slot_time: time,
+            guests: int,
+    ) -> bytes:
         if not BookingSlotService.can_book_time(slot_date, slot_time):
             raise BusinessRuleError(
                 f"Booking is available from {settings.WORKDAY_START_HOUR}:00 "
                 f"to {settings.WORKDAY_END_HOUR - settings.BOOKING_SLOT_HOURS}:00."
             )
-        cache_key = self.get_available_cache_key(slot_date, slot_time, guests)
-        cached_tables = await self.cache_service.get_json(cache_key)
-        if cached_tables is not None:
-            table_models = [TableResponse.model_validate(item) for item in cached_tables]
-            return AvailableTablesResponse(
-                date=slot_date,
-                time=slot_time,
-                guests=guests,
-                slot_hours=settings.BOOKING_SLOT_HOURS,
-                tables=table_models,
-            )
+        local_key = self.get_available_cache_key(slot_date, slot_time)
+        entries = self.cache_service.get_local(local_key)
+        if entries is None:
+            tables_json = await self.load_available_json(slot_date, slot_time)
+            entries = self.build_seated_entries(tables_json)
+            self.cache_service.set_local(local_key, entries)
+        held_table_ids = await self.hold_service.get_held_table_ids(slot_date, slot_time)
+        return b"[" + b",".join(
+            item
+            for table_id, seats, item in entries
+            if seats >= guests and table_id not in held_table_ids
+        ) + b"]"
 
+    async def load_available_json(self, slot_date: date, slot_time: time) -> str:
+        restaurant_start = BookingSlotService.get_restaurant_datetime(slot_date, slot_time)
+        generations = await self.get_available_generations(restaurant_start.date())
+        generation = self.get_available_cache_generation(generations)
+        cache_key = self.get_available_cache_key(slot_date, slot_time, generation)
+        cached_json = await self.cache_service.get_raw(cache_key)
+        if cached_json is not None:
+            return cached_json
         start_at, end_at = BookingSlotService.build_slot(slot_date, slot_time)
-        tables = await self.table_repository.list_available(start_at=start_at, end_at=end_at, guests=guests)
-        table_models = [TableResponse.model_validate(item) for item in tables]
-        await self.cache_service.set_json(
+
+        async def load_tables() -> CachePayload:
+            tables = await self.list_available_tables(
+                start_at=start_at,
+                end_at=end_at,
+                guests=1,
+                generations=generations,
+            )
+            return [table.model_dump(mode="json") for table in tables]
+
+        cached_tables = await self.fill_available_cache(
             cache_key,
-            [table.model_dump(mode="json") for table in table_models],
-            ttl=settings.CACHE_TTL_SECONDS,
+            load_tables,
+            slot_date=restaurant_start.date(),
+            score=self.get_available_cache_score(restaurant_start, restaurant_start.date()),
         )
-        return AvailableTablesResponse(
+        return json.dumps(cached_tables)
+
+    @classmethod
+    def build_seated_entries(cls, tables_json: str) -> list[tuple[int, int, bytes]]:
+        tables = cls.TABLES_ADAPTER.validate_json(tables_json)
+        return [(table.id, table.seats, table.model_dump_json().encode()) for table in tables]
+
+    async def get_availability_grid(self, slot_date: date, guests: int) -> AvailabilityGridResponse:
+        local_key = self.get_availability_grid_cache_key(slot_date)
+        slots = self.cache_service.get_local(local_key)
+        if slots is None:
+            slots = await self.load_availability_grid(slot_date)
+            self.cache_service.set_local(local_key, slots)
+        return AvailabilityGridResponse(
             date=slot_date,
-            time=slot_time,
             guests=guests,
             slot_hours=settings.BOOKING_SLOT_HOURS,
-            tables=table_models,
+            slots=[
+                AvailabilityGridSlotResponse.model_construct(
+                    time=slot.time,
+                    tables=[table for table in slot.tables if table.seats >= guests],
+                )
+                for slot in slots
+            ],
+        )
+
+    async def load_availability_grid(self, slot_date: date) -> list[AvailabilityGridSlotResponse]:
+        generations = await self.get_available_generations(slot_date)
+        generation = self.get_available_cache_generation(generations)
+        cache_key = self.get_availability_grid_cache_key(slot_date, generation)
+        cached_slots = await self.cache_service.get_json(cache_key)
+        if cached_slots is None:
+
+            async def load_slots() -> CachePayload:
+                grid = await self.occupancy_service.get_free_tables_by_start_time(
+                    slot_date=slot_date,
+                    start_times=BookingSlotService.get_start_times(slot_date),
+                    tables=await self.occupancy_service.get_tables(),
+                    generation=generations,
+                )
+                slots = [
+                    AvailabilityGridSlotResponse(time=slot_time, tables=free_tables)
+                    for slot_time, free_tables in grid
+                ]
+                return [slot.model_dump(mode="json") for slot in slots]
+
+            cached_slots = await self.fill_available_cache(
+                cache_key,
+                load_slots,
+                slot_date=slot_date,
+                score=self.DAY_WIDE_CACHE_SCORE,
+            )
+        return [AvailabilityGridSlotResponse.model_validate(item) for item in cached_slots]
+
+    async def find_next_available(
+            self,
+            guests: int,
+            date_from: date,
+            date_to: date,
+            time_from: time | None = None,
+            time_to: time | None = None,
+            limit: int = 5,
+    ) -> NextAvailableSlotsResponse:
+        if date_to < date_from:
+            raise BusinessRuleError("Search range end must not be before its start.")
+        days_count = (date_to - date_from).days + 1
+        if days_count > settings.AVAILABILITY_SEARCH_MAX_DAYS:
+            raise BusinessRuleError(
+                f"Search range is limited to {settings.AVAILABILITY_SEARCH_MAX_DAYS} days."
+            )
+
+        if time_from is not None:
+            time_from = BookingSlotService.get_normalized_time(time_from)
+        if time_to is not None:
+            time_to = BookingSlotService.get_normalized_time(time_to)
+        now_at = datetime.now(tz=timezone.utc)
+        slots: list[tuple[datetime, datetime]] = []
+        for offset in range(days_count):
+            slot_date = date_from + timedelta(days=offset)
+            for slot_time in BookingSlotService.get_start_times(slot_date):
+                if time_from is not None and slot_time < time_from:
+                    continue
+                if time_to is not None and slot_time > time_to:
+                    continue
+                start_at, end_at = BookingSlotService.build_slot(slot_date, slot_time)
+                if start_at > now_at:
+                    slots.append((start_at, end_at))
+
+        tables = [
+            table
+            for table in await self.occupancy_service.get_tables()
+            if table.seats >= guests
+        ]
+        found = await self.occupancy_service.find_free_slots(slots, tables, limit)
+        return NextAvailableSlotsResponse(
+            guests=guests,
+            slot_hours=settings.BOOKING_SLOT_HOURS,
+            items=[
+                TableSlotResponse(table=table, start_at=start_at, end_at=end_at)
+                for table, start_at, end_at in found
+            ],
         )
 
+    async def list_available_tables(
+            self,
+            start_at: datetime,
+            end_at: datetime,
+            guests: int,
+            generations: tuple[int, int] | None = None,
+    ) -> list[TableResponse]:
+        table_models = await self.occupancy_service.list_available(
+            start_at,
+            end_at,
+            guests,
+            generation=generations,
+        )
+        if table_models is not None:
+            return table_models
+        tables = await self.table_repository.list_available(start_at, end_at, guests)
+        return [TableResponse.model_validate(item) for item in tables]
+
     async def get_list(self) -> TablesListResponse:
         items = await self.table_repository.get_list()
         return TablesListResponse(items=[TableResponse.model_validate(item) for item in items])
@@ -68,6 +246,7 @@ class TableService:
             raise ConflictError("Table with this name already exists.")
         table = await self.table_repository.create(name=name, seats=payload.seats)
         await self.session.commit()
+        await self.occupancy_service.reset_tables()
         await self.invalidate_available_cache()
         return TableResponse.model_validate(table)
 
@@ -82,6 +261,7 @@ class TableService:
 
         updated = await self.table_repository.update(table=table, name=name, seats=payload.seats)
         await self.session.commit()
+        await self.occupancy_service.reset_tables()
         await self.invalidate_available_cache()
         return TableResponse.model_validate(updated)
 
@@ -95,6 +275,7 @@ class TableService:
         except IntegrityError as error:
             await self.session.rollback()
             raise ConflictError("Table cannot be deleted while bookings exist.") from error
+        await self.occupancy_service.reset_tables()
         await self.invalidate_available_cache()
 
     @staticmethod
@@ -111,9 +292,180 @@ class TableService:
         return tables
 
     @staticmethod
-    def get_available_cache_key(slot_date: date, slot_time: time, guests: int) -> str:
-        time_chunk = slot_time.strftime("%H:%M")
-        return f"tables:available:{slot_date.isoformat()}:{time_chunk}:g{guests}"
+    def is_generation_cache_mode() -> bool:
+        return settings.CACHE_INVALIDATION_MODE == "generation"
+
+    @classmethod
+    def get_available_cache_key(
+            cls,
+            slot_date: date,
+            slot_time: time,
+            generation: str | None = None,
+    ) -> str:
+        restaurant_start = BookingSlotService.get_restaurant_datetime(slot_date, slot_time)
+        date_chunk = cls.get_available_cache_date_chunk(restaurant_start.date(), generation)
+        return f"{cls.AVAILABLE_CACHE_PREFIX}{date_chunk}:{restaurant_start.strftime('%H:%M')}"
+
+    @classmethod
+    def get_availability_grid_cache_key(cls, slot_date: date, generation: str | None = None) -> str:
+        date_chunk = cls.get_available_cache_date_chunk(slot_date, generation)
+        return f"{cls.AVAILABLE_CACHE_PREFIX}{date_chunk}:grid"
+
+    @staticmethod
+    def get_available_cache_date_chunk(slot_date: date, generation: str | None) -> str:
+        if generation is None:
+            return slot_date.isoformat()
+        return f"{slot_date.isoformat()}:v{generation}"
+
+    @classmethod
+    def get_available_generation_key(cls, slot_date: date | None = None) -> str:
+        if slot_date is None:
+            return f"{cls.AVAILABLE_CACHE_PREFIX}generation"
+        return f"{cls.AVAILABLE_CACHE_PREFIX}{slot_date.isoformat()}:generation"
+
+    async def get_available_generations(self, slot_date: date) -> tuple[int, int]:
+        namespace_generation, date_generation = await self.cache_service.get_generations(
+            [self.get_available_generation_key(), self.get_available_generation_key(slot_date)],
+            ttl=settings.CACHE_GENERATION_TTL_SECONDS,
+        )
+        return namespace_generation, date_generation
+
+    @classmethod
+    def get_available_cache_generation(cls, generations: tuple[int, int]) -> str | None:
+        if not cls.is_generation_cache_mode():
+            return None
+        namespace_generation, date_generation = generations
+        return f"{namespace_generation}.{date_generation}"
+
+    async def fill_available_cache(
+            self,
+            cache_key: str,
+            loader: Callable[[], Awaitable[CachePayload]],
+            slot_date: date,
+            score: float,
+    ) -> CachePayload:
+        async def fill() -> CachePayload:
+            lock_key = f"{cache_key}:lock"
+            lock_ttl_ms = settings.CACHE_FILL_LOCK_TTL_MS
+            lock_token = await self.cache_service.acquire_lock(lock_key, lock_ttl_ms)
+            if lock_token is None:
+                payload = await self.wait_for_available_cache(cache_key)
+                if payload is not None:
+                    return payload
+            try:
+                payload = await loader()
+                await self.set_available_cache(cache_key, payload, slot_date=slot_date, score=score)
+                return payload
+            finally:
+                if lock_token is not None:
+                    await self.cache_service.release_lock(lock_key, lock_token)
+
+        return await cache_single_flight.run(cache_key, fill)
+
+    async def wait_for_available_cache(self, cache_key: str) -> CachePayload | None:
+        attempts = max(1, settings.CACHE_FILL_LOCK_TTL_MS // settings.CACHE_FILL_WAIT_INTERVAL_MS)
+        for _ in range(attempts):
+            await asyncio.sleep(settings.CACHE_FILL_WAIT_INTERVAL_MS / 1000)
+            payload = await self.cache_service.get_json(cache_key)
+            if payload is not None:
+                return payload
+        return None
+
+    async def set_available_cache(
+            self,
+            cache_key: str,
+            payload: CachePayload,
+            slot_date: date,
+            score: float,
+    ) -> None:
+        if self.is_generation_cache_mode():
+            await self.cache_service.set_json(cache_key, payload, ttl=settings.CACHE_TTL_SECONDS)
+            return
+        await self.cache_service.set_json_indexed(
+            cache_key,
+            payload,
+            ttl=settings.CACHE_TTL_SECONDS,
+            index_key=self.get_available_cache_index_key(slot_date),
+            score=score,
+        )
+
+    @classmethod
+    def get_available_cache_index_key(cls, slot_date: date) -> str:
+        return f"{cls.AVAILABLE_CACHE_PREFIX}{slot_date.isoformat()}:keys"
+
+    @staticmethod
+    def get_available_cache_score(moment: datetime, slot_date: date) -> float:
+        restaurant_timezone = BookingSlotService.get_restaurant_timezone()
+        restaurant_moment = BookingSlotService.to_utc(moment).astimezone(restaurant_timezone)
+        days_offset = (restaurant_moment.date() - slot_date).days
+        return days_offset * 24 * 60 + restaurant_moment.hour * 60 + restaurant_moment.minute
+
+    async def invalidate_available_cache(
+            self,
+            intervals: list[tuple[datetime, datetime]] | None = None,
+    ) -> None:
+        if intervals is None:
+            await self.cache_service.bump_generation(
+                self.get_available_generation_key(),
+                ttl=settings.CACHE_GENERATION_TTL_SECONDS,
+            )
+            if not self.is_generation_cache_mode():
+                await self.cache_service.invalidate_prefix(self.AVAILABLE_CACHE_PREFIX)
+            await self.cache_service.publish_invalidation(self.AVAILABLE_CACHE_PREFIX)
+            return
+
+        affected_dates = sorted(
+            {
+                slot_date
+                for start_at, end_at in intervals
+                for slot_date in BookingSlotService.get_restaurant_dates(start_at, end_at)
+            }
+        )
+        # Generations are bumped in both modes: they also tell workers their occupancy day is stale.
+        for slot_date in affected_dates:
+            date_generation = await self.cache_service.bump_generation(
+                self.get_available_generation_key(slot_date),
+                ttl=settings.CACHE_GENERATION_TTL_SECONDS,
+            )
+            self.occupancy_service.advance_generation(slot_date, date_generation)
+        if not self.is_generation_cache_mode():
+            await self.invalidate_available_cache_ranges(intervals)
+        for slot_date in affected_dates:
+            prefix = self.get_available_cache_date_prefix(slot_date)
+            await self.cache_service.publish_invalidation(prefix)
+
+    async def invalidate_available_cache_ranges(
+            self,
+            intervals: list[tuple[datetime, datetime]],
+    ) -> None:
+        slot_minutes = settings.BOOKING_SLOT_HOURS * 60
+        score_ranges: dict[date, list[tuple[float, float]]] = {}
+        for start_at, end_at in intervals:
+            for slot_date in BookingSlotService.get_restaurant_dates(start_at, end_at):
+                date_ranges = score_ranges.setdefault(
+                    slot_date,
+                    [(self.DAY_WIDE_CACHE_SCORE, self.DAY_WIDE_CACHE_SCORE)],
+                )
+                date_ranges.append(
+                    (
+                        self.get_available_cache_score(start_at, slot_date) - slot_minutes,
+                        self.get_available_cache_score(end_at, slot_date),
+                    )
+                )
+        for slot_date, date_ranges in score_ranges.items():
+            index_key = self.get_available_cache_index_key(slot_date)
+            await self.cache_service.invalidate_indexed(index_key, date_ranges)
+
+    @classmethod
+    def get_available_cache_date_prefix(cls, slot_date: date) -> str:
+        return f"{cls.AVAILABLE_CACHE_PREFIX}{slot_date.isoformat()}:"
 
-    async def invalidate_available_cache(self) -> None:
-        await self.cache_service.invalidate_prefix("tables:available:")
+    @classmethod
+    def apply_remote_invalidation(cls, prefix: str) -> None:
+        if prefix and not prefix.startswith(cls.AVAILABLE_CACHE_PREFIX):
+            return
+        date_chunk = prefix.removeprefix(cls.AVAILABLE_CACHE_PREFIX).rstrip(":")
+        if not date_chunk:
+            occupancy_index.clear()
+            return
+        occupancy_index.drop_day(date.fromisoformat(date_chunk))
@@ -0,0 +1,70 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.user import UserRepository
+from app.schemas.auth import UserSnapshot
+from app.services.cache import CacheServiceProtocol, LocalCache
+
+
+class UserSnapshotCacheService:
+    KEY_PREFIX = "users:"
+
+    def __init__(
+            self,
+            session: AsyncSession,
+            cache_service: CacheServiceProtocol | None = None,
+            local_cache: LocalCache | None = None,
+    ):
+        self.user_repository = UserRepository(session)
+        self.cache_service = cache_service
+        self.local_cache = local_cache
+
+    async def get(self, user_id: int) -> UserSnapshot | None:
+        key = self.get_key(user_id)
+        if self.local_cache is not None:
+            snapshot = self.local_cache.get(key)
+            if snapshot is not None:
+                return snapshot
+        if self.is_redis_enabled():
+            payload = await self.cache_service.get_json(key)
+            if payload is not None:
+                snapshot = UserSnapshot.model_validate(payload)
+                self.set_local(key, snapshot)
+                return snapshot
+
+        snapshot = await self.user_repository.get_snapshot_by_id(user_id)
+        if snapshot is None:
+            return None
+        if self.is_redis_enabled():
+            await self.cache_service.set_json(
+                key,
+                snapshot.model_dump(),
+                ttl=settings.USER_CACHE_TTL_SECONDS,
+            )
+        self.set_local(key, snapshot)
+        return snapshot
+
+    async def invalidate(self, user_id: int) -> None:
+        prefix = self.get_invalidation_prefix(user_id)
+        if self.local_cache is not None:
+            self.local_cache.invalidate_prefix(prefix)
+        if self.cache_service is None:
+            return
+        if settings.USER_CACHE_REDIS_ENABLED:
+            await self.cache_service.delete(self.get_key(user_id))
+        await self.cache_service.publish_invalidation(prefix)
+
+    def set_local(self, key: str, snapshot: UserSnapshot) -> None:
+        if self.local_cache is not None:
+            self.local_cache.set(key, snapshot)
+
+    def is_redis_enabled(self) -> bool:
+        return self.cache_service is not None and settings.USER_CACHE_REDIS_ENABLED
+
+    @classmethod
+    def get_invalidation_prefix(cls, user_id: int) -> str:
+        return f"{cls.KEY_PREFIX}{user_id}:"
+
+    @classmethod
+    def get_key(cls, user_id: int) -> str:
+        return f"{cls.get_invalidation_prefix(user_id)}snapshot"
@@ -0,0 +1,105 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ConflictError
+from app.models.booking import Booking
+from app.models.waitlist import WaitlistEntry
+from app.repositories.waitlist import WaitlistRepository
+from app.schemas.auth import UserSnapshot
+from app.schemas.waitlist import WaitlistJoinRequest
+from app.services.booking import BookingService
+from app.services.cache import CacheServiceProtocol
+from app.services.notification import NotificationService, NotificationServiceProtocol
+from app.services.slot import BookingSlotService
+
+
+class WaitlistService:
+    def __init__(
+            self,
+            session: AsyncSession,
+            cache_service: CacheServiceProtocol,
+            notification_service: NotificationServiceProtocol | None = None,
+    ):
+        self.session = session
+        self.waitlist_repository = WaitlistRepository(session)
+        self.notification_service = notification_service or NotificationService(session)
+        self.booking_service = BookingService(session, cache_service, self.notification_service)
+
+    async def join(self, user: UserSnapshot, payload: WaitlistJoinRequest) -> WaitlistEntry:
+        start_at, end_at = BookingSlotService.build_bookable_slot(payload.date, payload.time)
+        if await self.waitlist_repository.has_pending_for_user(user_id=user.id, start_at=start_at):
+            raise ConflictError("You are already on the waitlist for this slot.")
+        free_tables = await self.booking_service.table_repository.list_available(
+            start_at=start_at,
+            end_at=end_at,
+            guests=payload.guests,
+        )
+        if free_tables:
+            raise ConflictError("A fitting table is free in this slot, book it directly.")
+
+        entry = await self.waitlist_repository.create(
+            user_id=user.id,
+            guests=payload.guests,
+            start_at=start_at,
+            end_at=end_at,
+        )
+        await self.session.commit()
+        return entry
+
+    async def get_my(self, user_id: int) -> list[WaitlistEntry]:
+        now_at = datetime.now(tz=timezone.utc)
+        return await self.waitlist_repository.get_pending_for_user(user_id=user_id, now_at=now_at)
+
+    async def promote(self, table_id: int, start_at: datetime, end_at: datetime) -> list[Booking]:
+        table = await self.booking_service.table_repository.get_by_id(table_id)
+        if table is None:
+            return []
+        now_at = datetime.now(tz=timezone.utc)
+        entries = await self.waitlist_repository.list_pending_overlapping(
+            start_at=start_at,
+            end_at=end_at,
+            seats=table.seats,
+            now_at=now_at,
+        )
+        promoted: list[Booking] = []
+        for entry in entries:
+            try:
+                async with self.session.begin_nested():
+                    await self.booking_service.hold_service.ensure_not_held(
+                        user_id=entry.user_id,
+                        table_id=table.id,
+                        start_at=entry.start_at,
+                        end_at=entry.end_at,
+                    )
+                    await self.booking_service.ensure_slot_is_free(
+                        table_id=table.id,
+                        start_at=entry.start_at,
+                        end_at=entry.end_at,
+                    )
+                    booking = await self.booking_service.booking_repository.create(
+                        user_id=entry.user_id,
+                        table_id=table.id,
+                        start_at=entry.start_at,
+                        end_at=entry.end_at,
+                    )
+                    await self.waitlist_repository.mark_promoted(entry, booking.id, now_at)
+            except ConflictError:
+                continue
+            except IntegrityError as error:
+                if not self.booking_service.booking_repository.is_overlap_violation(error):
+                    await self.session.rollback()
+                    raise
+                continue
+            booking.table = table
+            self.notification_service.send_waitlist_promoted(
+                booking_id=booking.id,
+                email=entry.user.email,
+                start_at=booking.start_at,
+                table_name=table.name,
+            )
+            await self.session.commit()
+            await self.booking_service.complete_creation(booking)
+            promoted.append(booking)
+        return promoted
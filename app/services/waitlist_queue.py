@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.outbox import OutboxRepository
+
+
+class WaitlistPromotionQueueProtocol(Protocol):
+    def enqueue(self, table_id: int, start_at: datetime, end_at: datetime) -> None: ...
+
+
+class WaitlistPromotionQueue:
+    TASK_NAME = "app.tasks.waitlist.promote_waitlist"
+
+    def __init__(self, session: AsyncSession):
+        self.outbox_repository = OutboxRepository(session)
+
+    def enqueue(self, table_id: int, start_at: datetime, end_at: datetime) -> None:
+        self.outbox_repository.add(
+            self.TASK_NAME,
+            {"table_id": table_id, "start_at": start_at.isoformat(), "end_at": end_at.isoformat()},
+        )
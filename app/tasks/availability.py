@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.services.cache import CacheService
+from app.services.occupancy import OccupancyService
+from app.services.occupancy_store import RedisOccupancyStore
+from app.services.prewarm import AvailabilityPrewarmService
+from app.services.slot import BookingSlotService
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.availability.prewarm_availability")
+def prewarm_availability(dates: list[str] | None = None) -> int:
+    slot_dates = [date.fromisoformat(item) for item in dates] if dates is not None else None
+    written = asyncio.run(run_prewarm(slot_dates))
+    logger.info("Availability cache prewarmed.", extra={"dates": dates, "written": written})
+    return written
+
+
+async def run_prewarm(slot_dates: list[date] | None) -> int:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    redis_client = Redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+    try:
+        async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+            prewarm_service = AvailabilityPrewarmService(session, CacheService(redis_client))
+            return await prewarm_service.prewarm(slot_dates or prewarm_service.get_horizon_dates())
+    finally:
+        await redis_client.aclose()
+        await engine.dispose()
+
+
+@celery_app.task(name=OccupancyService.RECONCILE_TASK_NAME)
+def reconcile_occupancy_store(dates: list[str] | None = None) -> int:
+    slot_dates = [date.fromisoformat(item) for item in dates] if dates is not None else None
+    rebuilt = asyncio.run(run_reconcile(slot_dates))
+    logger.info("Occupancy store reconciled.", extra={"dates": dates, "rebuilt": rebuilt})
+    return rebuilt
+
+
+async def run_reconcile(slot_dates: list[date] | None) -> int:
+    if slot_dates is None:
+        today = BookingSlotService.get_restaurant_date(datetime.now(tz=timezone.utc))
+        days = settings.AVAILABILITY_SEARCH_MAX_DAYS
+        slot_dates = [today + timedelta(days=offset) for offset in range(days)]
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    redis_client = Redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+    try:
+        async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+            occupancy_service = OccupancyService(session, store=RedisOccupancyStore(redis_client))
+            return await occupancy_service.rebuild_store(slot_dates)
+    finally:
+        await redis_client.aclose()
+        await engine.dispose()
@@ -1,6 +1,10 @@
 import logging
+from collections.abc import Callable
+from email.message import EmailMessage
+from typing import Any
 
 from app.tasks.celery_app import celery_app
+from app.tasks.mailer import NotificationDeliveryError, NotificationMailerProvider
 
 logger = logging.getLogger(__name__)
 
@@ -12,12 +16,164 @@ def send_booking_created_notification(
         start_at: str,
         table_name: str,
 ) -> None:
+    retried = deliver_emails(build_booking_created_emails(booking_id, email, start_at, table_name))
     logger.info(
         "Booking notification task processed.",
-        extra={
-            "booking_id": booking_id,
-            "email": email,
-            "start_at": start_at,
-            "table_name": table_name,
-        },
+        extra={"booking_id": booking_id, "retried": retried},
     )
+
+
+@celery_app.task(name="app.tasks.booking.send_bookings_created_notification")
+def send_bookings_created_notification(email: str, bookings: list[dict[str, Any]]) -> None:
+    retried = deliver_emails(build_bookings_created_emails(email=email, bookings=bookings))
+    logger.info(
+        "Batched booking notification task processed.",
+        extra={"bookings": len(bookings), "retried": retried},
+    )
+
+
+@celery_app.task(name="app.tasks.booking.send_waitlist_promoted_notification")
+def send_waitlist_promoted_notification(
+        booking_id: int,
+        email: str,
+        start_at: str,
+        table_name: str,
+) -> None:
+    messages = build_waitlist_promoted_emails(booking_id, email, start_at, table_name)
+    retried = deliver_emails(messages)
+    logger.info(
+        "Waitlist promotion notification task processed.",
+        extra={"booking_id": booking_id, "retried": retried},
+    )
+
+
+@celery_app.task(name="app.tasks.booking.send_bookings_canceled_notification")
+def send_bookings_canceled_notification(bookings: list[dict[str, Any]]) -> None:
+    retried = deliver_emails(build_bookings_canceled_emails(bookings=bookings))
+    logger.info(
+        "Batched cancellation notification task processed.",
+        extra={"bookings": len(bookings), "retried": retried},
+    )
+
+
+@celery_app.task(name="app.tasks.booking.send_booking_reminders_notification")
+def send_booking_reminders_notification(bookings: list[dict[str, Any]]) -> None:
+    retried = deliver_emails(build_booking_reminders_emails(bookings=bookings))
+    logger.info(
+        "Batched reminder notification task processed.",
+        extra={"bookings": len(bookings), "retried": retried},
+    )
+
+
+@celery_app.task(name="app.tasks.booking.deliver_notifications", acks_late=True)
+def deliver_notifications(notifications: list[dict[str, Any]]) -> None:
+    messages: list[EmailMessage] = []
+    for notification in notifications:
+        messages.extend(NOTIFICATION_EMAIL_BUILDERS[notification["task_name"]](**notification["payload"]))
+    retried = deliver_emails(messages)
+    logger.info(
+        "Notification batch delivered.",
+        extra={"notifications": len(notifications), "emails": len(messages), "retried": retried},
+    )
+
+
+@celery_app.task(
+    name="app.tasks.booking.send_notification_email",
+    acks_late=True,
+    autoretry_for=(NotificationDeliveryError,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_kwargs={"max_retries": 8},
+)
+def send_notification_email(to: str, subject: str, body: str) -> None:
+    if NotificationMailerProvider.get().send([build_email(to, subject, body)]):
+        raise NotificationDeliveryError(f"Notification email to {to} was not delivered.")
+
+
+def deliver_emails(messages: list[EmailMessage]) -> int:
+    failed = NotificationMailerProvider.get().send(messages)
+    for message in failed:
+        send_notification_email.delay(
+            to=message["To"],
+            subject=message["Subject"],
+            body=message.get_content(),
+        )
+    return len(failed)
+
+
+def build_email(to: str, subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+    return message
+
+
+def build_booking_created_emails(
+        booking_id: int,
+        email: str,
+        start_at: str,
+        table_name: str,
+) -> list[EmailMessage]:
+    return [
+        build_email(
+            email,
+            f"Booking #{booking_id} confirmed",
+            f"Your table {table_name} is booked for {start_at}.",
+        )
+    ]
+
+
+def build_bookings_created_emails(email: str, bookings: list[dict[str, Any]]) -> list[EmailMessage]:
+    lines = [
+        f"#{item['booking_id']}: table {item['table_name']} at {item['start_at']}"
+        for item in bookings
+    ]
+    return [build_email(email, f"{len(bookings)} bookings confirmed", "\n".join(lines))]
+
+
+def build_waitlist_promoted_emails(
+        booking_id: int,
+        email: str,
+        start_at: str,
+        table_name: str,
+) -> list[EmailMessage]:
+    return [
+        build_email(
+            email,
+            f"Booking #{booking_id} confirmed from the waitlist",
+            f"A table opened up: {table_name} is booked for you at {start_at}.",
+        )
+    ]
+
+
+def build_bookings_canceled_emails(bookings: list[dict[str, Any]]) -> list[EmailMessage]:
+    return [
+        build_email(
+            item["email"],
+            f"Booking #{item['booking_id']} canceled",
+            f"Your booking of table {item['table_name']} at {item['start_at']} "
+            "was canceled by the restaurant.",
+        )
+        for item in bookings
+    ]
+
+
+def build_booking_reminders_emails(bookings: list[dict[str, Any]]) -> list[EmailMessage]:
+    return [
+        build_email(
+            item["email"],
+            f"Reminder: booking #{item['booking_id']}",
+            f"We are expecting you at table {item['table_name']} at {item['start_at']}.",
+        )
+        for item in bookings
+    ]
+
+
+NOTIFICATION_EMAIL_BUILDERS: dict[str, Callable[..., list[EmailMessage]]] = {
+    send_booking_created_notification.name: build_booking_created_emails,
+    send_bookings_created_notification.name: build_bookings_created_emails,
+    send_waitlist_promoted_notification.name: build_waitlist_promoted_emails,
+    send_bookings_canceled_notification.name: build_bookings_canceled_emails,
+    send_booking_reminders_notification.name: build_booking_reminders_emails,
+}
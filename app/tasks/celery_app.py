@@ -2,7 +2,16 @@ from celery import Celery
 
 from app.core.config import settings
 
-celery_app = Celery("aspex_booking", include=("app.tasks.booking",))
+celery_app = Celery(
+    "aspex_booking",
+    include=(
+        "app.tasks.booking",
+        "app.tasks.availability",
+        "app.tasks.waitlist",
+        "app.tasks.outbox",
+        "app.tasks.reminder",
+    ),
+)
 celery_app.conf.update(
     broker_url=settings.CELERY_BROKER_URL,
     result_backend=settings.CELERY_RESULT_BACKEND,
@@ -14,3 +23,33 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,
     task_acks_late=True,
 )
+
+celery_app.conf.beat_schedule = {
+    "relay-outbox": {
+        "task": "app.tasks.outbox.relay_outbox",
+        "schedule": settings.OUTBOX_RELAY_INTERVAL_SECONDS,
+        "options": {"expires": settings.OUTBOX_RELAY_INTERVAL_SECONDS},
+    },
+    "prune-outbox": {
+        "task": "app.tasks.outbox.prune_outbox",
+        "schedule": settings.OUTBOX_PRUNE_INTERVAL_SECONDS,
+        "options": {"expires": settings.OUTBOX_PRUNE_INTERVAL_SECONDS},
+    },
+    "send-booking-reminders": {
+        "task": "app.tasks.reminder.send_booking_reminders",
+        "schedule": settings.BOOKING_REMINDER_INTERVAL_SECONDS,
+        "options": {"expires": settings.BOOKING_REMINDER_INTERVAL_SECONDS},
+    },
+}
+if settings.AVAILABILITY_PREWARM_ENABLED:
+    celery_app.conf.beat_schedule["prewarm-availability"] = {
+        "task": "app.tasks.availability.prewarm_availability",
+        "schedule": settings.AVAILABILITY_PREWARM_INTERVAL_SECONDS,
+        "options": {"expires": settings.AVAILABILITY_PREWARM_INTERVAL_SECONDS},
+    }
+if settings.AVAILABILITY_BACKEND == "redis":
+    celery_app.conf.beat_schedule["reconcile-occupancy-store"] = {
+        "task": "app.tasks.availability.reconcile_occupancy_store",
+        "schedule": settings.OCCUPANCY_STORE_RECONCILE_INTERVAL_SECONDS,
+        "options": {"expires": settings.OCCUPANCY_STORE_RECONCILE_INTERVAL_SECONDS},
+    }
@@ -0,0 +1,216 @@
+import logging
+import queue
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from time import perf_counter
+
+from celery.signals import worker_process_shutdown
+
+from app.core.config import settings
+from app.core.metrics import (
+    NOTIFICATION_BATCH_MESSAGES,
+    NOTIFICATION_BATCH_SECONDS,
+    NOTIFICATION_EMAILS_FAILED,
+    NOTIFICATION_EMAILS_SENT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDeliveryError(Exception):
+    pass
+
+
+class SmtpConnectionPool:
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            size: int,
+            timeout: float,
+            username: str = "",
+            password: str = "",
+            use_starttls: bool = False,
+    ):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self.username = username
+        self.password = password
+        self.use_starttls = use_starttls
+        self._idle: queue.LifoQueue[smtplib.SMTP] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def acquire(self) -> smtplib.SMTP:
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self.connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, connection: smtplib.SMTP, is_broken: bool = False) -> None:
+        if is_broken:
+            self.discard(connection)
+        else:
+            self._idle.put(connection)
+        self._slots.release()
+
+    def connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_starttls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password)
+        return connection
+
+    def reconnect(self, connection: smtplib.SMTP) -> smtplib.SMTP:
+        self.discard(connection)
+        return self.connect()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self.discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+    @staticmethod
+    def discard(connection: smtplib.SMTP) -> None:
+        try:
+            connection.quit()
+        except OSError:
+            connection.close()
+
+
+class NotificationMailer:
+    REJECTED_ERRORS = (
+        smtplib.SMTPRecipientsRefused,
+        smtplib.SMTPSenderRefused,
+        smtplib.SMTPDataError,
+    )
+
+    def __init__(self, pool: SmtpConnectionPool | None, sender: str, batch_size: int):
+        self.pool = pool
+        self.sender = sender
+        self.batch_size = batch_size
+
+    def send(self, messages: list[EmailMessage]) -> list[EmailMessage]:
+        if not messages:
+            return []
+        for message in messages:
+            if "From" not in message:
+                message["From"] = self.sender
+        batches = [
+            messages[offset:offset + self.batch_size]
+            for offset in range(0, len(messages), self.batch_size)
+        ]
+        if self.pool is None or len(batches) == 1:
+            results = [self.send_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.pool.size, len(batches))) as executor:
+                results = list(executor.map(self.send_batch, batches))
+        return [message for failed in results for message in failed]
+
+    def send_batch(self, messages: list[EmailMessage]) -> list[EmailMessage]:
+        started_at = perf_counter()
+        sent = 0
+        try:
+            if self.pool is None:
+                for message in messages:
+                    logger.info(
+                        "Notification email prepared.",
+                        extra={"to": message["To"], "subject": message["Subject"]},
+                    )
+                sent = len(messages)
+                return []
+            try:
+                connection = self.pool.acquire()
+            except OSError:
+                logger.exception("SMTP server is unavailable.", extra={"messages": len(messages)})
+                return messages
+            is_broken = False
+            try:
+                for index, message in enumerate(messages):
+                    try:
+                        connection = self.send_message(connection, message)
+                    except self.REJECTED_ERRORS:
+                        logger.exception(
+                            "Notification email was rejected.",
+                            extra={"to": message["To"]},
+                        )
+                    except OSError:
+                        logger.exception(
+                            "SMTP delivery was interrupted.",
+                            extra={"left": len(messages) - index},
+                        )
+                        is_broken = True
+                        return messages[index:]
+                    else:
+                        sent += 1
+                return []
+            finally:
+                self.pool.release(connection, is_broken=is_broken)
+        finally:
+            NOTIFICATION_BATCH_MESSAGES.observe(len(messages))
+            NOTIFICATION_BATCH_SECONDS.observe(perf_counter() - started_at)
+            NOTIFICATION_EMAILS_SENT.inc(sent)
+            NOTIFICATION_EMAILS_FAILED.inc(len(messages) - sent)
+
+    def send_message(self, connection: smtplib.SMTP, message: EmailMessage) -> smtplib.SMTP:
+        try:
+            connection.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            connection = self.pool.reconnect(connection)
+            connection.send_message(message)
+        return connection
+
+
+class NotificationMailerProvider:
+    _mailer: NotificationMailer | None = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> NotificationMailer:
+        if cls._mailer is None:
+            with cls._lock:
+                if cls._mailer is None:
+                    cls._mailer = cls.build()
+        return cls._mailer
+
+    @classmethod
+    def close(cls) -> None:
+        if cls._mailer is not None and cls._mailer.pool is not None:
+            cls._mailer.pool.close()
+        cls._mailer = None
+
+    @staticmethod
+    def build() -> NotificationMailer:
+        pool = None
+        if settings.SMTP_HOST:
+            pool = SmtpConnectionPool(
+                host=settings.SMTP_HOST,
+                port=settings.SMTP_PORT,
+                size=settings.SMTP_POOL_SIZE,
+                timeout=settings.SMTP_TIMEOUT_SECONDS,
+                username=settings.SMTP_USERNAME,
+                password=settings.SMTP_PASSWORD,
+                use_starttls=settings.SMTP_STARTTLS,
+            )
+        return NotificationMailer(
+            pool,
+            sender=settings.NOTIFICATION_EMAIL_FROM,
+            batch_size=settings.SMTP_BATCH_SIZE,
+        )
+
+
+@worker_process_shutdown.connect
+def close_notification_mailer(**_: object) -> None:
+    NotificationMailerProvider.close()
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.services.outbox import OutboxRelayService
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.outbox.relay_outbox")
+def relay_outbox() -> int:
+    relayed = asyncio.run(run_relay())
+    if relayed:
+        logger.info("Outbox messages relayed.", extra={"relayed": relayed})
+    return relayed
+
+
+async def run_relay() -> int:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+            relay_service = OutboxRelayService(session)
+            return await relay_service.relay(
+                batch_size=settings.OUTBOX_RELAY_BATCH_SIZE,
+                max_batches=settings.OUTBOX_RELAY_MAX_BATCHES,
+            )
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="app.tasks.outbox.prune_outbox")
+def prune_outbox() -> int:
+    pruned = asyncio.run(run_prune())
+    if pruned:
+        logger.info("Published outbox messages pruned.", extra={"pruned": pruned})
+    return pruned
+
+
+async def run_prune() -> int:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    published_before = datetime.now(tz=timezone.utc) - timedelta(
+        seconds=settings.OUTBOX_RETENTION_SECONDS
+    )
+    try:
+        async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+            relay_service = OutboxRelayService(session)
+            return await relay_service.prune(
+                published_before=published_before,
+                batch_size=settings.OUTBOX_RELAY_BATCH_SIZE,
+                max_batches=settings.OUTBOX_RELAY_MAX_BATCHES,
+            )
+    finally:
+        await engine.dispose()
@@ -0,0 +1,34 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.services.reminder import BookingReminderService
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.reminder.send_booking_reminders")
+def send_booking_reminders() -> int:
+    reminded = asyncio.run(run_reminders())
+    if reminded:
+        logger.info("Booking reminders scheduled.", extra={"reminded": reminded})
+    return reminded
+
+
+async def run_reminders() -> int:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+            reminder_service = BookingReminderService(session)
+            return await reminder_service.send_due(
+                now_at=datetime.now(tz=timezone.utc),
+                batch_size=settings.BOOKING_REMINDER_BATCH_SIZE,
+                max_batches=settings.BOOKING_REMINDER_MAX_BATCHES,
+            )
+    finally:
+        await engine.dispose()
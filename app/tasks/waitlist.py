@@ -0,0 +1,44 @@
+import asyncio
+import logging
+from datetime import datetime
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.services.cache import CacheService
+from app.services.waitlist import WaitlistService
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.waitlist.promote_waitlist")
+def promote_waitlist(table_id: int, start_at: str, end_at: str) -> list[int]:
+    booking_ids = asyncio.run(
+        run_promotion(table_id, datetime.fromisoformat(start_at), datetime.fromisoformat(end_at))
+    )
+    logger.info(
+        "Waitlist promotion processed.",
+        extra={
+            "table_id": table_id,
+            "start_at": start_at,
+            "end_at": end_at,
+            "booking_ids": booking_ids,
+        },
+    )
+    return booking_ids
+
+
+async def run_promotion(table_id: int, start_at: datetime, end_at: datetime) -> list[int]:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    redis_client = Redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+    try:
+        async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+            waitlist_service = WaitlistService(session, CacheService(redis_client))
+            bookings = await waitlist_service.promote(table_id, start_at, end_at)
+            return [booking.id for booking in bookings]
+    finally:
+        await redis_client.aclose()
+        await engine.dispose()
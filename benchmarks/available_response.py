@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from time import perf_counter
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.schemas.table import AvailableTablesResponse, TableResponse
+from app.services.cache import CacheService, LocalCache, RedisClientProvider
+from app.services.hold import BookingHoldService
+from app.services.slot import BookingSlotService
+from app.services.table import TableService
+
+
+class AvailableResponseBenchmark:
+    GUESTS = 2
+
+    def __init__(self, tables_count: int):
+        self.slot_date = date.today() + timedelta(days=30)
+        self.slot_time = time(13, 0)
+        self.tables = [
+            {"id": index, "name": f"T{index}", "seats": 2 + index % 5}
+            for index in range(1, tables_count + 1)
+        ]
+        self.held_table_id = self.tables[0]["id"]
+        self.cache_service = CacheService(
+            RedisClientProvider.get_client(),
+            LocalCache(name="benchmark", max_size=100, ttl_seconds=3600),
+        )
+        self.table_service = TableService(AsyncSession(), self.cache_service)
+        self.populate_local_cache()
+
+    def populate_local_cache(self) -> None:
+        start_at, end_at = BookingSlotService.build_slot(self.slot_date, self.slot_time)
+        hold = BookingHoldService.build_hold(0, self.held_table_id, start_at, end_at)
+        expires_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+        hold["expires_at"] = expires_at.timestamp() * 1000
+        self.cache_service.set_local(
+            TableService.get_available_cache_key(self.slot_date, self.slot_time),
+            TableService.build_seated_entries(json.dumps(self.tables)),
+        )
+        self.cache_service.set_local(BookingHoldService.get_holds_key(start_at), [hold])
+
+    def render_validated(self) -> bytes:
+        response = AvailableTablesResponse(
+            date=self.slot_date,
+            time=self.slot_time,
+            guests=self.GUESTS,
+            slot_hours=settings.BOOKING_SLOT_HOURS,
+            tables=[
+                TableResponse.model_validate(item)
+                for item in self.tables
+                if item["seats"] >= self.GUESTS and item["id"] != self.held_table_id
+            ],
+        )
+        content = AvailableTablesResponse.model_validate(response).model_dump(mode="json")
+        return json.dumps(content, separators=(",", ":")).encode()
+
+    async def render_cached(self) -> bytes:
+        return await self.table_service.get_available_body(
+            self.slot_date,
+            self.slot_time,
+            self.GUESTS,
+        )
+
+    async def measure(self, number: int) -> None:
+        assert json.loads(self.render_validated()) == json.loads(await self.render_cached())
+        timings = {"validated": [], "cached": []}
+        for _ in range(5):
+            started_at = perf_counter()
+            for _ in range(number):
+                self.render_validated()
+            timings["validated"].append(perf_counter() - started_at)
+            started_at = perf_counter()
+            for _ in range(number):
+                await self.render_cached()
+            timings["cached"].append(perf_counter() - started_at)
+        for name, seconds in timings.items():
+            print(f"{name:>10}: {min(seconds) / number * 1_000_000:8.2f} us/request")
+
+    def run(self, number: int) -> None:
+        asyncio.run(self.measure(number))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare validated rendering with the L1 hit path of GET /tables/available.",
+    )
+    parser.add_argument("--tables", type=int, default=len(TableService.generate_default_tables()))
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+    AvailableResponseBenchmark(args.tables).run(args.number)
@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import random
+from datetime import date, datetime, time, timedelta
+from statistics import quantiles
+from time import perf_counter
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.exceptions import ConflictError
+from app.models.booking import Booking
+from app.models.table import RestaurantTable
+from app.models.user import User
+from app.schemas.booking import BookingCreateRequest
+from app.services.booking import BookingService
+from app.services.cache import CacheService, RedisClientProvider
+from app.services.slot import BookingSlotService
+
+
+class NullNotificationService:
+    @staticmethod
+    def send_booking_created(
+            booking_id: int,
+            email: str,
+            start_at: datetime,
+            table_name: str,
+    ) -> None:
+        return None
+
+
+class BookingContentionBenchmark:
+    USER_EMAIL = "contention-benchmark@example.com"
+
+    def __init__(self, clients: int, requests_per_client: int, days: int):
+        self.clients = clients
+        self.requests_per_client = requests_per_client
+        self.first_date = date.today() + timedelta(days=365)
+        self.slots: list[tuple[date, time]] = [
+            (slot_date, slot_time)
+            for slot_date in (self.first_date + timedelta(days=offset) for offset in range(days))
+            for slot_time in BookingSlotService.get_start_times(slot_date)
+        ]
+        self.engine = create_async_engine(settings.DATABASE_URL, pool_size=clients, max_overflow=0)
+        self.session_maker = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        self.latencies: list[float] = []
+        self.created = 0
+        self.conflicts = 0
+
+    async def prepare(self) -> tuple[User, int]:
+        async with self.session_maker() as session:
+            result = await session.execute(select(User).filter_by(email=self.USER_EMAIL))
+            user = result.scalar_one_or_none()
+            if user is None:
+                user = User(
+                    email=self.USER_EMAIL,
+                    phone_number="+70000009999",
+                    full_name="Contention Benchmark",
+                    hashed_password="benchmark",
+                    role=User.ROLE_USER,
+                )
+                session.add(user)
+            result = await session.execute(select(RestaurantTable.id).order_by(RestaurantTable.id))
+            table_id = result.scalar()
+            await session.commit()
+            await self.cleanup(session, user.id)
+            return user, table_id
+
+    async def cleanup(self, session: AsyncSession, user_id: int) -> None:
+        await session.execute(delete(Booking).where(Booking.user_id == user_id))
+        await session.commit()
+
+    async def client(self, user: User, table_id: int) -> None:
+        for _ in range(self.requests_per_client):
+            slot_date, slot_time = random.choice(self.slots)
+            started_at = perf_counter()
+            async with self.session_maker() as session:
+                service = BookingService(
+                    session,
+                    CacheService(RedisClientProvider.get_client()),
+                    notification_service=NullNotificationService(),
+                )
+                payload = BookingCreateRequest(table_id=table_id, date=slot_date, time=slot_time)
+                try:
+                    await service.create(user=user, payload=payload)
+                    self.created += 1
+                except ConflictError:
+                    self.conflicts += 1
+            self.latencies.append(perf_counter() - started_at)
+
+    async def run(self) -> None:
+        user, table_id = await self.prepare()
+        started_at = perf_counter()
+        try:
+            await asyncio.gather(*(self.client(user, table_id) for _ in range(self.clients)))
+            elapsed = perf_counter() - started_at
+            percentiles = quantiles(self.latencies, n=100)
+            print(f"strategy:   {settings.BOOKING_OVERLAP_STRATEGY}")
+            print(
+                f"requests:   {len(self.latencies)} "
+                f"({self.created} created, {self.conflicts} conflicts)"
+            )
+            print(f"throughput: {len(self.latencies) / elapsed:.1f} req/s")
+            print(f"p50:        {percentiles[49] * 1000:.1f} ms")
+            print(f"p99:        {percentiles[98] * 1000:.1f} ms")
+        finally:
+            async with self.session_maker() as session:
+                await self.cleanup(session, user.id)
+            await RedisClientProvider.close()
+            await self.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hammer one table with concurrent booking writes.")
+    parser.add_argument("--strategy", choices=("constraint", "advisory_lock"), default=None)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=25)
+    parser.add_argument("--days", type=int, default=3)
+    args = parser.parse_args()
+    if args.strategy is not None:
+        settings.BOOKING_OVERLAP_STRATEGY = args.strategy
+    asyncio.run(BookingContentionBenchmark(args.clients, args.requests, args.days).run())
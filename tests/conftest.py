@@ -12,6 +12,8 @@ from app.core.exceptions import ExceptionConfigurator
 from app.db.base import Base
 from app.models.table import RestaurantTable
 from app.models.user import User
+from app.services.cache import LocalCacheProvider
+from app.services.occupancy import occupancy_index
 from app.services.table import TableService
 from tests.fakes import FakeCacheService
 
@@ -20,6 +22,18 @@ class TestFastAPI(FastAPI):
     dependency_overrides: dict[Callable[..., Any], Callable[..., Any]]
 
 
+@pytest.fixture(autouse=True)
+def clear_occupancy_index() -> None:
+    occupancy_index.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_user_local_cache() -> None:
+    user_local_cache = LocalCacheProvider.get_user_cache()
+    if user_local_cache is not None:
+        user_local_cache.clear()
+
+
 @pytest.fixture
 async def session() -> AsyncGenerator[AsyncSession, None]:
     engine = create_async_engine("sqlite+aiosqlite:///:memory:")
@@ -95,7 +109,6 @@ def api_cache_service() -> FakeCacheService:
 async def api_client(
         api_session: AsyncSession,
         api_cache_service: FakeCacheService,
-        monkeypatch: pytest.MonkeyPatch,
 ) -> AsyncGenerator[AsyncClient, None]:
     test_app = TestFastAPI()
     ExceptionConfigurator.register(test_app)
@@ -107,11 +120,6 @@ async def api_client(
     async def override_cache() -> FakeCacheService:
         return api_cache_service
 
-    monkeypatch.setattr(
-        "app.services.notification.send_booking_created_notification.delay",
-        lambda **kwargs: None,
-    )
-
     test_app.dependency_overrides[session_dependency] = override_session
     test_app.dependency_overrides[cache_dependency] = override_cache
 
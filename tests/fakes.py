@@ -1,18 +1,37 @@
-from datetime import datetime
+import json
+import time
+from datetime import date, datetime
 from typing import Any
 
-from app.services.cache import CacheServiceProtocol
+from app.schemas.table import TableResponse
+from app.services.cache import CacheServiceProtocol, LocalCache
 from app.services.notification import NotificationServiceProtocol
+from app.services.occupancy_store import OccupancyStoreProtocol
+from app.services.prewarm_queue import AvailabilityPrewarmQueueProtocol
+from app.services.waitlist_queue import WaitlistPromotionQueueProtocol
 
 
 class FakeCacheService(CacheServiceProtocol):
-    def __init__(self):
+    def __init__(self, local_cache: LocalCache | None = None):
+        self.local_cache = local_cache
+        self.published_invalidations: list[str] = []
         self.storage: dict[str, Any] = {}
+        self.indexes: dict[str, dict[str, float]] = {}
         self.invalidated_prefixes: list[str] = []
+        self.invalidated_keys: list[str] = []
+        self.generations: dict[str, int] = {}
+        self.locks: dict[str, str] = {}
+        self.holds: dict[str, dict[str, dict[str, Any]]] = {}
+        self.get_holds_calls = 0
 
     async def get_json(self, key: str) -> dict[str, Any] | list[dict[str, Any]] | None:
         return self.storage.get(key)
 
+    async def get_raw(self, key: str) -> str | None:
+        if key not in self.storage:
+            return None
+        return json.dumps(self.storage[key])
+
     async def set_json(self, key: str, payload: dict[str, Any] | list[dict[str, Any]], ttl: int) -> None:
         self.storage[key] = payload
 
@@ -22,10 +41,113 @@ class FakeCacheService(CacheServiceProtocol):
         for key in keys_to_delete:
             self.storage.pop(key, None)
 
+    async def delete(self, key: str) -> None:
+        self.storage.pop(key, None)
+
+    async def set_json_indexed(
+            self,
+            key: str,
+            payload: dict[str, Any] | list[dict[str, Any]],
+            ttl: int,
+            index_key: str,
+            score: float,
+    ) -> None:
+        self.storage[key] = payload
+        self.indexes.setdefault(index_key, {})[key] = score
+
+    async def set_json_many(
+            self,
+            payloads: dict[str, Any],
+            ttl: int,
+            index_key: str | None = None,
+            scores: dict[str, float] | None = None,
+    ) -> None:
+        self.storage.update(payloads)
+        if index_key is not None and scores:
+            self.indexes.setdefault(index_key, {}).update(scores)
+
+    async def invalidate_indexed(
+            self,
+            index_key: str,
+            score_ranges: list[tuple[float, float]],
+    ) -> None:
+        index = self.indexes.get(index_key, {})
+        keys_to_delete = [
+            key
+            for key, score in index.items()
+            if any(min_score <= score <= max_score for min_score, max_score in score_ranges)
+        ]
+        for key in keys_to_delete:
+            self.invalidated_keys.append(key)
+            self.storage.pop(key, None)
+            index.pop(key, None)
+
+    async def get_generations(self, keys: list[str], ttl: int) -> list[int]:
+        return [self.generations.get(key, 0) for key in keys]
+
+    async def bump_generation(self, key: str, ttl: int) -> int:
+        self.generations[key] = self.generations.get(key, 0) + 1
+        return self.generations[key]
+
+    async def acquire_lock(self, key: str, ttl_ms: int) -> str | None:
+        if key in self.locks:
+            return None
+        self.locks[key] = f"token-{len(self.locks)}"
+        return self.locks[key]
+
+    async def release_lock(self, key: str, token: str) -> None:
+        if self.locks.get(key) == token:
+            self.locks.pop(key)
+
+    def get_local(self, key: str) -> Any | None:
+        if self.local_cache is None:
+            return None
+        return self.local_cache.get(key)
+
+    def set_local(self, key: str, value: Any) -> None:
+        if self.local_cache is not None:
+            self.local_cache.set(key, value)
+
+    async def publish_invalidation(self, prefix: str) -> None:
+        self.published_invalidations.append(prefix)
+        if self.local_cache is not None:
+            self.local_cache.invalidate_prefix(prefix)
+
+    async def acquire_hold(self, key: str, hold_id: str, hold: dict[str, Any], ttl_ms: int) -> bool:
+        holds = self.holds.setdefault(key, {})
+        for other_id, other in list((await self.get_holds(key)).items()):
+            overlaps = (
+                other["table_id"] == hold["table_id"]
+                and other["start_at"] < hold["end_at"]
+                and hold["start_at"] < other["end_at"]
+            )
+            if overlaps and other["user_id"] != hold["user_id"]:
+                return False
+            if overlaps:
+                holds.pop(other_id)
+        holds[hold_id] = {**hold, "expires_at": time.time() * 1000 + ttl_ms}
+        return True
+
+    async def get_holds(self, key: str) -> dict[str, dict[str, Any]]:
+        self.get_holds_calls += 1
+        now_ms = time.time() * 1000
+        return {
+            hold_id: hold
+            for hold_id, hold in self.holds.get(key, {}).items()
+            if hold["expires_at"] > now_ms
+        }
+
+    async def release_hold(self, key: str, hold_id: str) -> None:
+        self.holds.get(key, {}).pop(hold_id, None)
+
 
 class FakeNotificationService(NotificationServiceProtocol):
     def __init__(self):
         self.calls: list[dict[str, Any]] = []
+        self.batch_calls: list[dict[str, Any]] = []
+        self.promoted_calls: list[dict[str, Any]] = []
+        self.canceled_calls: list[list[tuple[int, str, datetime, str]]] = []
+        self.reminder_calls: list[list[tuple[int, str, datetime, str]]] = []
 
     def send_booking_created(self, booking_id: int, email: str, start_at: datetime, table_name: str) -> None:
         self.calls.append(
@@ -36,3 +158,119 @@ class FakeNotificationService(NotificationServiceProtocol):
                 "table_name": table_name,
             }
         )
+
+    def send_bookings_created(self, email: str, bookings: list[tuple[int, datetime, str]]) -> None:
+        self.batch_calls.append({"email": email, "bookings": bookings})
+
+    def send_waitlist_promoted(
+            self,
+            booking_id: int,
+            email: str,
+            start_at: datetime,
+            table_name: str,
+    ) -> None:
+        self.promoted_calls.append(
+            {
+                "booking_id": booking_id,
+                "email": email,
+                "start_at": start_at,
+                "table_name": table_name,
+            }
+        )
+
+    def send_bookings_canceled(self, bookings: list[tuple[int, str, datetime, str]]) -> None:
+        self.canceled_calls.append(bookings)
+
+    def send_booking_reminders(self, bookings: list[tuple[int, str, datetime, str]]) -> None:
+        self.reminder_calls.append(bookings)
+
+
+class FakeAvailabilityPrewarmQueue(AvailabilityPrewarmQueueProtocol):
+    def __init__(self):
+        self.calls: list[list[date]] = []
+
+    def enqueue(self, slot_dates: list[date]) -> None:
+        self.calls.append(slot_dates)
+
+
+class FakeWaitlistPromotionQueue(WaitlistPromotionQueueProtocol):
+    def __init__(self):
+        self.calls: list[tuple[int, datetime, datetime]] = []
+
+    def enqueue(self, table_id: int, start_at: datetime, end_at: datetime) -> None:
+        self.calls.append((table_id, start_at, end_at))
+
+
+class FakeOccupancyStore(OccupancyStoreProtocol):
+    def __init__(self):
+        self.tables: list[TableResponse] | None = None
+        self.states: dict[date, str] = {}
+        self.versions: dict[date, int] = {}
+        self.bitmaps: dict[tuple[date, int], set[int]] = {}
+
+    async def list_available(
+            self,
+            slot_date: date,
+            start_offset: int,
+            end_offset: int,
+            guests: int,
+    ) -> tuple[str, list[TableResponse]]:
+        if not self.tables:
+            return "missing_tables", []
+        if slot_date not in self.states:
+            return "missing_day", []
+        if self.states[slot_date] != "exact":
+            return "inexact", []
+        offsets = set(range(start_offset, end_offset))
+        return "ok", [
+            table
+            for table in self.tables
+            if table.seats >= guests
+            and not self.bitmaps.get((slot_date, table.id), set()) & offsets
+        ]
+
+    async def get_version(self, slot_date: date) -> int:
+        return self.versions.get(slot_date, 0)
+
+    async def put_day(
+            self,
+            slot_date: date,
+            bitsets: dict[int, bytes],
+            is_exact: bool,
+            version: int,
+    ) -> bool:
+        if self.versions.get(slot_date, 0) != version:
+            return False
+        for table_id, bitset in bitsets.items():
+            self.bitmaps[(slot_date, table_id)] = {
+                offset
+                for offset in range(len(bitset) * 8)
+                if bitset[offset // 8] & (0x80 >> (offset % 8))
+            }
+        self.states[slot_date] = "exact" if is_exact else "inexact"
+        return True
+
+    async def put_tables(self, tables: list[TableResponse]) -> None:
+        self.tables = tables
+
+    async def reset_tables(self) -> None:
+        self.tables = None
+
+    async def write(
+            self,
+            slot_date: date,
+            table_id: int,
+            start_offset: int,
+            end_offset: int,
+            is_occupied: bool,
+            is_aligned: bool,
+    ) -> None:
+        if not is_aligned and slot_date in self.states:
+            self.states[slot_date] = "inexact"
+        if is_occupied or is_aligned:
+            bitmap = self.bitmaps.setdefault((slot_date, table_id), set())
+            if is_occupied:
+                bitmap.update(range(start_offset, end_offset))
+            else:
+                bitmap.difference_update(range(start_offset, end_offset))
+        self.versions[slot_date] = self.versions.get(slot_date, 0) + 1
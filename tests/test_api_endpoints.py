@@ -67,6 +67,65 @@ async def test_tables_available_with_auth_returns_items(api_client: AsyncClient)
     assert len(response.json()["tables"]) == 16
 
 
+@pytest.mark.asyncio
+async def test_tables_availability_grid_returns_all_start_times(api_client: AsyncClient) -> None:
+    register_response = await api_client.post(
+        "/auth/register",
+        json={
+            "email": "api-grid@example.com",
+            "password": "StrongPass123",
+            "phone_number": "+79990000208",
+            "full_name": "Api Grid",
+        },
+    )
+    token = register_response.json()["access_token"]
+
+    response = await api_client.get(
+        "/tables/availability-grid",
+        params={"date": (date.today() + timedelta(days=1)).isoformat(), "guests": 6},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    slots = response.json()["slots"]
+    assert slots[0]["time"] == "12:00:00"
+    assert slots[-1]["time"] == "20:00:00"
+    assert all(len(slot["tables"]) == 3 for slot in slots)
+
+
+@pytest.mark.asyncio
+async def test_tables_next_available_returns_limited_items(api_client: AsyncClient) -> None:
+    register_response = await api_client.post(
+        "/auth/register",
+        json={
+            "email": "api-next@example.com",
+            "password": "StrongPass123",
+            "phone_number": "+79990000209",
+            "full_name": "Api Next",
+        },
+    )
+    token = register_response.json()["access_token"]
+    slot_date = date.today() + timedelta(days=1)
+
+    response = await api_client.get(
+        "/tables/next-available",
+        params={
+            "guests": 3,
+            "date_from": slot_date.isoformat(),
+            "date_to": (slot_date + timedelta(days=13)).isoformat(),
+            "time_from": "18:00:00",
+            "limit": 3,
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 3
+    assert all(item["table"]["seats"] == 3 for item in items)
+    assert all(item["start_at"].startswith(f"{slot_date.isoformat()}T18:00:00") for item in items)
+
+
 @pytest.mark.asyncio
 async def test_create_booking_and_get_my(
         api_client: AsyncClient,
@@ -82,11 +141,18 @@ async def test_create_booking_and_get_my(
         },
     )
     token = register_response.json()["access_token"]
+    slot_date = date.today() + timedelta(days=2)
+    available_response = await api_client.get(
+        "/tables/available",
+        params={"date": slot_date.isoformat(), "time": "13:00:00", "guests": 2},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert available_response.status_code == 200
     booking_response = await api_client.post(
         "/bookings/",
         json={
             "table_id": 1,
-            "date": (date.today() + timedelta(days=2)).isoformat(),
+            "date": slot_date.isoformat(),
             "time": "13:00:00",
         },
         headers={"Authorization": f"Bearer {token}"},
@@ -99,7 +165,8 @@ async def test_create_booking_and_get_my(
     )
     assert my_response.status_code == 200
     assert len(my_response.json()["items"]) == 1
-    assert "tables:available:" in api_cache_service.invalidated_prefixes
+    assert api_cache_service.invalidated_prefixes == []
+    assert api_cache_service.invalidated_keys == [f"tables:available:{slot_date.isoformat()}:13:00"]
 
 
 @pytest.mark.asyncio
@@ -238,3 +305,67 @@ async def test_cancel_booking_too_late_returns_business_error(
 
     assert response.status_code == 400
     assert response.json()["error_code"] == "business_rule_error"
+
+
+@pytest.mark.asyncio
+async def test_create_bookings_bulk_best_effort_returns_multi_status(
+        api_client: AsyncClient,
+) -> None:
+    register_response = await api_client.post(
+        "/auth/register",
+        json={
+            "email": "api-bulk@example.com",
+            "password": "StrongPass123",
+            "phone_number": "+79990000210",
+            "full_name": "Api Bulk",
+        },
+    )
+    token = register_response.json()["access_token"]
+    slot_date = (date.today() + timedelta(days=6)).isoformat()
+
+    response = await api_client.post(
+        "/bookings/bulk",
+        json={
+            "mode": "best_effort",
+            "items": [
+                {"table_id": 6, "date": slot_date, "time": "13:00:00"},
+                {"table_id": 7, "date": slot_date, "time": "13:00:00"},
+                {"table_id": 7, "date": slot_date, "time": "14:00:00"},
+            ],
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 207
+    assert response.json()["created"] == 2
+    assert [item["error_code"] for item in response.json()["items"]] == [None, None, "conflict"]
+
+
+@pytest.mark.asyncio
+async def test_create_booking_with_idempotency_key_replays_first_result(
+        api_client: AsyncClient,
+) -> None:
+    register_response = await api_client.post(
+        "/auth/register",
+        json={
+            "email": "api-idempotent@example.com",
+            "password": "StrongPass123",
+            "phone_number": "+79990000211",
+            "full_name": "Api Idempotent",
+        },
+    )
+    token = register_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "booking-retry-1"}
+    payload = {
+        "table_id": 8,
+        "date": (date.today() + timedelta(days=6)).isoformat(),
+        "time": "18:00:00",
+    }
+
+    first = await api_client.post("/bookings/", json=payload, headers=headers)
+    retry = await api_client.post("/bookings/", json=payload, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
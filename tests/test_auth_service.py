@@ -1,10 +1,13 @@
+import asyncio
+import threading
+
 import pytest
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.exceptions import AuthenticationError, ConflictError
-from app.core.security import SecurityService
+from app.core.exceptions import AuthenticationError, ConflictError, ServiceUnavailableError
+from app.core.security import PasswordHashingPool, SecurityService
 from app.models.user import User
 from app.schemas.auth import LoginRequest, RegisterRequest
 from app.services.auth import AuthService
@@ -144,3 +147,54 @@ async def test_register_assigns_admin_role_from_admin_emails(session: AsyncSessi
     created = await session.execute(select(User).filter_by(email="boss@example.com"))
     model = created.scalar_one()
     assert model.role == User.ROLE_ADMIN
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_pool_runs_off_loop_and_sheds_load() -> None:
+    hashing_pool = PasswordHashingPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    def blocking_hash(password: str) -> str:
+        release.wait(timeout=5)
+        return f"{threading.current_thread().name}:{password}"
+
+    running = asyncio.gather(
+        hashing_pool.run("hash", blocking_hash, "first"),
+        hashing_pool.run("hash", blocking_hash, "second"),
+    )
+    await asyncio.sleep(0)
+    with pytest.raises(ServiceUnavailableError):
+        await hashing_pool.run("hash", blocking_hash, "third")
+
+    release.set()
+    first, second = await running
+    assert first.startswith("password-hash") and first.endswith(":first")
+    assert second.endswith(":second")
+    assert (await hashing_pool.run("hash", blocking_hash, "after")).endswith(":after")
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_pool_keeps_slot_until_cancelled_job_finishes() -> None:
+    hashing_pool = PasswordHashingPool(max_workers=1, max_pending=0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_hash(password: str) -> str:
+        started.set()
+        release.wait(timeout=5)
+        return password
+
+    request = asyncio.create_task(hashing_pool.run("hash", blocking_hash, "first"))
+    assert await asyncio.to_thread(started.wait, 5)
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+    with pytest.raises(ServiceUnavailableError):
+        await hashing_pool.run("hash", blocking_hash, "second")
+
+    release.set()
+    for _ in range(100):
+        if hashing_pool._in_flight == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert await hashing_pool.run("hash", blocking_hash, "third") == "third"
@@ -1,13 +1,27 @@
 from datetime import date, datetime, time, timedelta, timezone
 
 import pytest
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
 
+from app.core.config import settings
 from app.core.exceptions import AuthorizationError, BusinessRuleError, ConflictError, NotFoundError
 from app.models.booking import Booking
-from app.schemas.booking import BookingCreateRequest, BookingUpdateRequest
+from app.repositories.booking import BookingRepository
+from app.schemas.booking import (
+    BookingAutoCreateRequest,
+    BookingBulkCreateRequest,
+    BookingClosureRequest,
+    BookingCreateRequest,
+    BookingUpdateRequest,
+)
 from app.services.booking import BookingService
-from tests.fakes import FakeCacheService, FakeNotificationService
+from app.services.bootstrap import BootstrapService
+from app.services.slot import BookingSlotService
+from app.services.table import TableService
+from tests.fakes import FakeAvailabilityPrewarmQueue, FakeCacheService, FakeNotificationService
 
 
 @pytest.mark.asyncio
@@ -29,13 +43,24 @@ async def test_create_booking_success(
         date=date.today() + timedelta(days=1),
         time=time(13, 0),
     )
+    table_service = TableService(session, cache_service)
+    await table_service.get_available(slot_date=payload.date, slot_time=time(14, 0), guests=2)
+    await table_service.get_available(slot_date=payload.date, slot_time=time(17, 0), guests=2)
+    await table_service.get_available(
+        slot_date=payload.date + timedelta(days=1),
+        slot_time=time(14, 0),
+        guests=2,
+    )
 
     booking = await service.create(user=user, payload=payload)
 
     assert booking.id is not None
     assert booking.table_id == table.id
     assert notification_service.calls
-    assert cache_service.invalidated_prefixes == ["tables:available:"]
+    assert cache_service.invalidated_prefixes == []
+    cache_key = TableService.get_available_cache_key(payload.date, time(14, 0))
+    assert cache_service.invalidated_keys == [cache_key]
+    assert TableService.get_available_cache_key(payload.date, time(17, 0)) in cache_service.storage
 
 
 @pytest.mark.asyncio
@@ -92,10 +117,12 @@ async def test_update_booking_changes_slot(
         user,
         default_tables,
 ) -> None:
+    prewarm_queue = FakeAvailabilityPrewarmQueue()
     service = BookingService(
         session=session,
         cache_service=FakeCacheService(),
         notification_service=FakeNotificationService(),
+        prewarm_queue=prewarm_queue,
     )
     table = default_tables[3]
     created = await service.create(
@@ -118,6 +145,7 @@ async def test_update_booking_changes_slot(
 
     assert updated.start_at.hour == 15
     assert updated.end_at.hour == 17
+    assert prewarm_queue.calls[-1] == [date.today() + timedelta(days=3)] * 2
 
 
 @pytest.mark.asyncio
@@ -220,19 +248,23 @@ async def test_cancel_booking_success_sets_canceled_at(
         notification_service=FakeNotificationService(),
     )
     table = default_tables[5]
+    slot_date = date.today() + timedelta(days=4)
     booking = await service.create(
         user=user,
         payload=BookingCreateRequest(
             table_id=table.id,
-            date=date.today() + timedelta(days=4),
+            date=slot_date,
             time=time(13, 0),
         ),
     )
+    table_service = TableService(session, cache_service)
+    await table_service.get_available(slot_date=slot_date, slot_time=time(13, 0), guests=2)
 
     canceled = await service.cancel(user_id=user.id, booking_id=booking.id)
 
     assert canceled.canceled_at is not None
-    assert "tables:available:" in cache_service.invalidated_prefixes
+    cache_key = TableService.get_available_cache_key(slot_date, time(13, 0))
+    assert cache_key in cache_service.invalidated_keys
 
 
 @pytest.mark.asyncio
@@ -331,3 +363,478 @@ async def test_get_my_returns_only_active_and_future(
 
     assert len(items) == 1
     assert items[0].start_at == active_start.replace(tzinfo=None)
+
+
+class ExclusionViolationError(Exception):
+    sqlstate = "23P01"
+
+    def __str__(self) -> str:
+        constraint_name = Booking.OVERLAP_CONSTRAINT_NAME
+        return f'conflicting key value violates exclusion constraint "{constraint_name}"'
+
+
+@pytest.mark.asyncio
+async def test_create_booking_maps_exclusion_violation_to_conflict(
+        session: AsyncSession,
+        user,
+        default_tables,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def fail_has_overlap(*args, **kwargs) -> bool:
+        raise AssertionError("The exclusion constraint replaces the overlap check.")
+
+    async def violate_constraint(*args, **kwargs) -> Booking:
+        raise IntegrityError("INSERT INTO bookings", {}, ExclusionViolationError())
+
+    monkeypatch.setattr(BookingRepository, "has_overlap_constraint", lambda self: True)
+    monkeypatch.setattr(BookingRepository, "has_overlap", fail_has_overlap)
+    monkeypatch.setattr(BookingRepository, "create", violate_constraint)
+    cache_service = FakeCacheService()
+    service = BookingService(
+        session=session,
+        cache_service=cache_service,
+        notification_service=FakeNotificationService(),
+    )
+
+    with pytest.raises(ConflictError):
+        await service.create(
+            user=user,
+            payload=BookingCreateRequest(
+                table_id=default_tables[0].id,
+                date=date.today() + timedelta(days=2),
+                time=time(14, 0),
+            ),
+        )
+    assert cache_service.invalidated_keys == []
+
+
+def test_booking_exclusion_constraint_is_postgresql_only() -> None:
+    postgresql_ddl = str(CreateTable(Booking.__table__).compile(dialect=postgresql.dialect()))
+    sqlite_ddl = str(CreateTable(Booking.__table__).compile(dialect=sqlite.dialect()))
+
+    exclusion_ddl = (
+        "EXCLUDE USING gist (table_id WITH =, tstzrange(start_at, end_at, '[)') WITH &&)"
+    )
+    assert exclusion_ddl in postgresql_ddl
+    assert "WHERE (canceled_at IS NULL)" in postgresql_ddl
+    assert Booking.OVERLAP_CONSTRAINT_NAME not in sqlite_ddl
+
+
+@pytest.mark.asyncio
+async def test_overlap_constraint_is_trusted_only_with_constraint_strategy(
+        session: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repository = BookingRepository(session)
+    monkeypatch.setattr(session.get_bind().dialect, "name", "postgresql")
+
+    assert repository.has_overlap_constraint()
+    monkeypatch.setattr(settings, "BOOKING_OVERLAP_STRATEGY", "advisory_lock")
+    assert not repository.has_overlap_constraint()
+
+
+@pytest.mark.asyncio
+async def test_startup_fails_fast_when_overlap_constraint_is_missing(
+        session: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def constraint_missing(self) -> bool:
+        return False
+
+    bootstrap_service = BootstrapService(session)
+    await bootstrap_service.verify_overlap_constraint()
+
+    monkeypatch.setattr(BookingRepository, "has_overlap_constraint", lambda self: True)
+    monkeypatch.setattr(BookingRepository, "overlap_constraint_exists", constraint_missing)
+    with pytest.raises(RuntimeError, match=Booking.OVERLAP_CONSTRAINT_NAME):
+        await bootstrap_service.verify_overlap_constraint()
+
+
+@pytest.mark.asyncio
+async def test_advisory_lock_strategy_locks_table_before_overlap_check(
+        session: AsyncSession,
+        user,
+        default_tables,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[tuple[str, int]] = []
+    original_has_overlap = BookingRepository.has_overlap
+
+    async def record_lock(self, table_id: int) -> None:
+        calls.append(("lock", table_id))
+
+    async def record_has_overlap(self, **kwargs) -> bool:
+        calls.append(("check", kwargs["table_id"]))
+        return await original_has_overlap(self, **kwargs)
+
+    monkeypatch.setattr(settings, "BOOKING_OVERLAP_STRATEGY", "advisory_lock")
+    monkeypatch.setattr(BookingRepository, "has_overlap_constraint", lambda self: True)
+    monkeypatch.setattr(BookingRepository, "lock_table", record_lock)
+    monkeypatch.setattr(BookingRepository, "has_overlap", record_has_overlap)
+    service = BookingService(
+        session=session,
+        cache_service=FakeCacheService(),
+        notification_service=FakeNotificationService(),
+    )
+    table = default_tables[2]
+    payload = BookingCreateRequest(
+        table_id=table.id,
+        date=date.today() + timedelta(days=2),
+        time=time(14, 0),
+    )
+    await service.create(user=user, payload=payload)
+
+    with pytest.raises(ConflictError):
+        await service.create(user=user, payload=payload)
+    assert calls == [("lock", table.id), ("check", table.id)] * 2
+
+
+@pytest.mark.asyncio
+async def test_create_many_all_or_nothing_rejects_whole_batch(
+        session: AsyncSession,
+        user,
+        default_tables,
+) -> None:
+    cache_service = FakeCacheService()
+    notification_service = FakeNotificationService()
+    service = BookingService(
+        session=session,
+        cache_service=cache_service,
+        notification_service=notification_service,
+    )
+    slot_date = date.today() + timedelta(days=2)
+    payload = BookingBulkCreateRequest(
+        items=[
+            BookingCreateRequest(table_id=default_tables[0].id, date=slot_date, time=time(13, 0)),
+            BookingCreateRequest(table_id=default_tables[0].id, date=slot_date, time=time(14, 0)),
+        ],
+    )
+
+    with pytest.raises(ConflictError, match="Item 1"):
+        await service.create_many(user=user, payload=payload)
+    assert await BookingRepository(session).list_intervals(
+        start_at=datetime.combine(slot_date, time(0, 0), tzinfo=timezone.utc),
+        end_at=datetime.combine(slot_date + timedelta(days=1), time(0, 0), tzinfo=timezone.utc),
+    ) == []
+    assert notification_service.batch_calls == []
+
+
+@pytest.mark.asyncio
+async def test_create_many_best_effort_creates_valid_items_once(
+        session: AsyncSession,
+        user,
+        default_tables,
+) -> None:
+    cache_service = FakeCacheService()
+    notification_service = FakeNotificationService()
+    prewarm_queue = FakeAvailabilityPrewarmQueue()
+    service = BookingService(
+        session=session,
+        cache_service=cache_service,
+        notification_service=notification_service,
+        prewarm_queue=prewarm_queue,
+    )
+    slot_date = date.today() + timedelta(days=2)
+    booked_table_id = default_tables[2].id
+    await service.create(
+        user=user,
+        payload=BookingCreateRequest(table_id=booked_table_id, date=slot_date, time=time(18, 0)),
+    )
+    payload = BookingBulkCreateRequest(
+        mode="best_effort",
+        items=[
+            BookingCreateRequest(table_id=default_tables[0].id, date=slot_date, time=time(13, 0)),
+            BookingCreateRequest(table_id=default_tables[1].id, date=slot_date, time=time(13, 0)),
+            BookingCreateRequest(table_id=default_tables[1].id, date=slot_date, time=time(14, 30)),
+            BookingCreateRequest(table_id=default_tables[2].id, date=slot_date, time=time(19, 0)),
+            BookingCreateRequest(table_id=999, date=slot_date, time=time(13, 0)),
+            BookingCreateRequest(table_id=default_tables[3].id, date=slot_date, time=time(11, 0)),
+        ],
+    )
+
+    result = await service.create_many(user=user, payload=payload)
+
+    assert result.created == 2
+    assert [item.error_code for item in result.items] == [
+        None,
+        None,
+        "conflict",
+        "conflict",
+        "not_found",
+        "business_rule_error",
+    ]
+    created_table_ids = [item.booking.table.id for item in result.items[:2]]
+    assert created_table_ids == [default_tables[0].id, default_tables[1].id]
+    assert len(notification_service.batch_calls) == 1
+    assert [booking_id for booking_id, _, _ in notification_service.batch_calls[0]["bookings"]] == [
+        item.booking.id for item in result.items[:2]
+    ]
+    assert prewarm_queue.calls[-1] == [slot_date, slot_date]
+
+
+@pytest.mark.asyncio
+async def test_create_many_best_effort_reports_rows_skipped_by_constraint(
+        session: AsyncSession,
+        user,
+        default_tables,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    notification_service = FakeNotificationService()
+    service = BookingService(
+        session=session,
+        cache_service=FakeCacheService(),
+        notification_service=notification_service,
+    )
+    slot_date = date.today() + timedelta(days=2)
+    create_many = BookingRepository.create_many
+    skip_conflicts_calls: list[bool] = []
+
+    async def create_many_losing_race(self, rows, skip_conflicts=False):
+        skip_conflicts_calls.append(skip_conflicts)
+        return await create_many(self, rows[1:])
+
+    monkeypatch.setattr(BookingRepository, "has_overlap_constraint", lambda self: True)
+    monkeypatch.setattr(BookingRepository, "create_many", create_many_losing_race)
+
+    result = await service.create_many(
+        user=user,
+        payload=BookingBulkCreateRequest(
+            mode="best_effort",
+            items=[
+                BookingCreateRequest(
+                    table_id=default_tables[0].id,
+                    date=slot_date,
+                    time=time(13, 0),
+                ),
+                BookingCreateRequest(
+                    table_id=default_tables[1].id,
+                    date=slot_date,
+                    time=time(13, 0),
+                ),
+            ],
+        ),
+    )
+
+    assert skip_conflicts_calls == [True]
+    assert result.created == 1
+    assert [item.error_code for item in result.items] == ["conflict", None]
+    assert result.items[1].booking.table.id == default_tables[1].id
+    assert [booking_id for booking_id, _, _ in notification_service.batch_calls[0]["bookings"]] == [
+        result.items[1].booking.id
+    ]
+
+
+def test_skip_conflicts_insert_compiles_to_on_conflict_do_nothing() -> None:
+    statement = postgresql.insert(Booking).on_conflict_do_nothing().returning(Booking.id)
+
+    assert "ON CONFLICT DO NOTHING" in str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_create_auto_retries_next_best_fit_table_on_conflict(
+        session: AsyncSession,
+        user,
+        user_two,
+        default_tables,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    service = BookingService(
+        session=session,
+        cache_service=FakeCacheService(),
+        notification_service=FakeNotificationService(),
+    )
+    slot_date = date.today() + timedelta(days=2)
+    three_seat_tables = [table for table in default_tables if table.seats == 3]
+    payload = BookingAutoCreateRequest(date=slot_date, time=time(13, 0), guests=3)
+
+    first = await service.create_auto(user=user, payload=payload)
+    assert first.table_id == three_seat_tables[0].id
+
+    original_list_available = service.table_repository.list_available
+
+    async def stale_list_available(**kwargs) -> list:
+        return [three_seat_tables[0], *await original_list_available(**kwargs)]
+
+    monkeypatch.setattr(service.table_repository, "list_available", stale_list_available)
+    second = await service.create_auto(user=user_two, payload=payload)
+
+    assert second.table_id == three_seat_tables[1].id
+    assert second.table.name == three_seat_tables[1].name
+
+
+@pytest.mark.asyncio
+async def test_create_auto_without_fitting_table_raises_conflict(
+        session: AsyncSession,
+        user,
+        default_tables,
+) -> None:
+    service = BookingService(
+        session=session,
+        cache_service=FakeCacheService(),
+        notification_service=FakeNotificationService(),
+    )
+
+    with pytest.raises(ConflictError):
+        await service.create_auto(
+            user=user,
+            payload=BookingAutoCreateRequest(
+                date=date.today() + timedelta(days=2),
+                time=time(13, 0),
+                guests=7,
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_close_tables_cancels_overlaps_and_blocks_range(
+        session: AsyncSession,
+        user,
+        user_two,
+        default_tables,
+) -> None:
+    cache_service = FakeCacheService()
+    notification_service = FakeNotificationService()
+    service = BookingService(
+        session=session,
+        cache_service=cache_service,
+        notification_service=notification_service,
+    )
+    slot_date = date.today() + timedelta(days=3)
+    closed_tables = default_tables[:2]
+    overlapping = await service.create(
+        user=user,
+        payload=BookingCreateRequest(
+            table_id=closed_tables[0].id,
+            date=slot_date,
+            time=time(17, 0),
+        ),
+    )
+    outside = await service.create(
+        user=user,
+        payload=BookingCreateRequest(
+            table_id=closed_tables[1].id,
+            date=slot_date,
+            time=time(12, 0),
+        ),
+    )
+    open_table = await service.create(
+        user=user,
+        payload=BookingCreateRequest(
+            table_id=default_tables[2].id,
+            date=slot_date,
+            time=time(18, 0),
+        ),
+    )
+    closure_start = datetime.combine(slot_date, time(18, 0), tzinfo=timezone.utc)
+
+    response = await service.close_tables(
+        admin=user_two,
+        payload=BookingClosureRequest(
+            start_at=closure_start,
+            end_at=closure_start + timedelta(hours=4),
+            table_ids=[table.id for table in closed_tables],
+        ),
+    )
+
+    assert response.blocked_table_ids == [table.id for table in closed_tables]
+    assert response.canceled_booking_ids == [overlapping.id]
+    canceled_calls = notification_service.canceled_calls
+    assert [item[:2] for item in canceled_calls[0]] == [(overlapping.id, user.email)]
+    assert {booking.id for booking in await service.get_my(user.id)} == {outside.id, open_table.id}
+    assert await service.get_my(user_two.id) == []
+    available = await TableService(session, cache_service).get_available(
+        slot_date=slot_date,
+        slot_time=time(19, 0),
+        guests=2,
+    )
+    assert not {table.id for table in closed_tables} & {item.id for item in available.tables}
+
+
+@pytest.mark.asyncio
+async def test_narrower_closure_keeps_overlapping_wider_closure(
+        session: AsyncSession,
+        user,
+        default_tables,
+) -> None:
+    service = BookingService(
+        session,
+        FakeCacheService(),
+        notification_service=FakeNotificationService(),
+    )
+    table = default_tables[0]
+    slot_date = date.today() + timedelta(days=3)
+    wide_start = datetime.combine(slot_date, time(12, 0), tzinfo=timezone.utc)
+
+    await service.close_tables(
+        admin=user,
+        payload=BookingClosureRequest(
+            start_at=wide_start,
+            end_at=wide_start + timedelta(hours=10),
+            table_ids=[table.id],
+        ),
+    )
+    await service.close_tables(
+        admin=user,
+        payload=BookingClosureRequest(
+            start_at=wide_start + timedelta(hours=2),
+            end_at=wide_start + timedelta(hours=4),
+            table_ids=[table.id],
+        ),
+    )
+
+    blocks = await service.booking_repository.list_intervals(
+        start_at=wide_start - timedelta(hours=1),
+        end_at=wide_start + timedelta(hours=11),
+        table_ids=[table.id],
+    )
+    block_ranges = [
+        (BookingSlotService.to_utc(start_at), BookingSlotService.to_utc(end_at))
+        for _, start_at, end_at in blocks
+    ]
+    assert block_ranges == [(wide_start, wide_start + timedelta(hours=10))]
+
+
+@pytest.mark.asyncio
+async def test_close_tables_retries_when_guest_booking_races_block_insert(
+        session: AsyncSession,
+        user,
+        default_tables,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    original_create_many = BookingRepository.create_many
+    calls: list[int] = []
+
+    async def race_create_many(self, rows: list[dict]) -> list[Booking]:
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise IntegrityError("INSERT INTO bookings", {}, ExclusionViolationError())
+        return await original_create_many(self, rows)
+
+    monkeypatch.setattr(BookingRepository, "create_many", race_create_many)
+    service = BookingService(
+        session,
+        FakeCacheService(),
+        notification_service=FakeNotificationService(),
+    )
+    table = default_tables[0]
+    closure_start = datetime.combine(
+        date.today() + timedelta(days=3),
+        time(18, 0),
+        tzinfo=timezone.utc,
+    )
+    payload = BookingClosureRequest(
+        start_at=closure_start,
+        end_at=closure_start + timedelta(hours=2),
+        table_ids=[table.id],
+    )
+
+    response = await service.close_tables(admin=user, payload=payload)
+    assert response.blocked_table_ids == [table.id]
+    assert calls == [1, 1]
+
+    async def always_violate(self, rows: list[dict]) -> list[Booking]:
+        raise IntegrityError("INSERT INTO bookings", {}, ExclusionViolationError())
+
+    monkeypatch.setattr(BookingRepository, "create_many", always_violate)
+    with pytest.raises(ConflictError):
+        await service.close_tables(admin=user, payload=payload)
@@ -0,0 +1,54 @@
+import json
+from datetime import date
+
+from app.services.cache import CacheInvalidationListener, LocalCache
+from app.services.occupancy import DayOccupancy, occupancy_index
+from app.services.slot import BookingSlotService
+from app.services.table import TableService
+
+
+def test_local_cache_evicts_least_recently_used_entry() -> None:
+    cache = LocalCache(name="test", max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_local_cache_expires_entries_and_drops_by_prefix() -> None:
+    cache = LocalCache(name="test", max_size=8, ttl_seconds=0)
+    cache.set("tables:available:2030-01-01:13:00:g2", [])
+    assert cache.get("tables:available:2030-01-01:13:00:g2") is None
+
+    cache.ttl_seconds = 60
+    cache.set("tables:available:2030-01-01:13:00:g2", [])
+    cache.set("tables:available:2030-01-02:13:00:g2", [])
+    cache.invalidate_prefix("tables:available:2030-01-01:")
+
+    assert cache.get("tables:available:2030-01-01:13:00:g2") is None
+    assert cache.get("tables:available:2030-01-02:13:00:g2") == []
+
+
+def test_invalidation_listener_ignores_own_messages_and_drops_occupancy_day() -> None:
+    slot_date = date(2030, 1, 1)
+    cache = LocalCache(name="test", max_size=8, ttl_seconds=60)
+    cache.set("tables:available:2030-01-01:grid:g2", [])
+    window_start, window_end = BookingSlotService.get_workday_bounds(slot_date)
+    occupancy_index.put_day(slot_date, DayOccupancy(window_start, window_end, 15), version=0)
+    listener = CacheInvalidationListener(
+        None,
+        [TableService.apply_remote_invalidation, cache.invalidate_prefix],
+    )
+
+    listener.handle_message(CacheInvalidationListener.encode_message("tables:available:2030-01-01:"))
+    assert occupancy_index.get_day(slot_date) is not None
+
+    remote_message = {"origin": "other-worker", "prefix": "tables:available:2030-01-01:"}
+    listener.handle_message(json.dumps(remote_message))
+    assert occupancy_index.get_day(slot_date) is None
+    assert cache.get("tables:available:2030-01-01:grid:g2") is None
@@ -0,0 +1,42 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.services.dispatcher import TaskDispatcher
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_publishes_in_background_and_flushes_on_stop() -> None:
+    published: list[tuple[str, dict[str, Any]]] = []
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def slow_publisher(task_name: str, kwargs: dict[str, Any]) -> None:
+        asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+        published.append((task_name, kwargs))
+
+    dispatcher = TaskDispatcher(max_size=2, publisher=slow_publisher)
+    dispatcher.start()
+    for index in range(4):
+        dispatcher.submit("tasks.sample", {"index": index})
+        await asyncio.sleep(0)
+    assert published == []
+
+    release.set()
+    await dispatcher.stop(flush_timeout=1)
+
+    assert [kwargs["index"] for _, kwargs in published] == [0, 1, 2]
+    assert not dispatcher.is_running
+
+
+def test_dispatcher_publishes_inline_when_not_started() -> None:
+    published: list[str] = []
+    dispatcher = TaskDispatcher(
+        max_size=1,
+        publisher=lambda task_name, kwargs: published.append(task_name),
+    )
+
+    dispatcher.submit("tasks.sample", {})
+
+    assert published == ["tasks.sample"]
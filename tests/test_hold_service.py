@@ -0,0 +1,174 @@
+from datetime import date, time, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ConflictError
+from app.schemas.booking import (
+    BookingBulkCreateRequest,
+    BookingCreateRequest,
+    BookingHoldCreateRequest,
+)
+from app.services.booking import BookingService
+from app.services.cache import LocalCache
+from app.services.hold import BookingHoldService
+from app.services.table import TableService
+from tests.fakes import FakeCacheService, FakeNotificationService
+
+
+@pytest.mark.asyncio
+async def test_hold_hides_table_and_converts_to_booking(
+        session: AsyncSession,
+        user,
+        user_two,
+        default_tables,
+) -> None:
+    cache_service = FakeCacheService(LocalCache(name="test", max_size=100, ttl_seconds=60))
+    table = default_tables[0]
+    slot_date = date.today() + timedelta(days=1)
+    hold_service = BookingHoldService(session, cache_service)
+    table_service = TableService(session, cache_service)
+    available = await table_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(14, 0),
+        guests=2,
+    )
+    assert table.id in {item.id for item in available.tables}
+
+    hold = await hold_service.create(
+        user=user,
+        payload=BookingHoldCreateRequest(table_id=table.id, date=slot_date, time=time(13, 0)),
+    )
+    available = await table_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(14, 0),
+        guests=2,
+    )
+    assert table.id not in {item.id for item in available.tables}
+    get_holds_calls = cache_service.get_holds_calls
+    await table_service.get_available(slot_date=slot_date, slot_time=time(14, 0), guests=2)
+    assert cache_service.get_holds_calls == get_holds_calls
+
+    with pytest.raises(ConflictError):
+        await hold_service.create(
+            user=user_two,
+            payload=BookingHoldCreateRequest(table_id=table.id, date=slot_date, time=time(14, 0)),
+        )
+    booking_service = BookingService(
+        session,
+        cache_service,
+        notification_service=FakeNotificationService(),
+    )
+    with pytest.raises(ConflictError):
+        await booking_service.create(
+            user=user_two,
+            payload=BookingCreateRequest(table_id=table.id, date=slot_date, time=time(14, 0)),
+        )
+
+    booking = await booking_service.create(
+        user=user,
+        payload=BookingCreateRequest(
+            table_id=table.id,
+            date=slot_date,
+            time=time(13, 0),
+            hold_id=hold.hold_id,
+        ),
+    )
+    assert booking.start_at == hold.start_at
+    assert await cache_service.get_holds(BookingHoldService.get_holds_key(hold.start_at)) == {}
+    available = await table_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(16, 0),
+        guests=2,
+    )
+    assert table.id in {item.id for item in available.tables}
+
+
+@pytest.mark.asyncio
+async def test_expired_hold_does_not_block_or_convert(
+        session: AsyncSession,
+        user,
+        user_two,
+        default_tables,
+) -> None:
+    cache_service = FakeCacheService()
+    table = default_tables[0]
+    slot_date = date.today() + timedelta(days=1)
+    hold_service = BookingHoldService(session, cache_service)
+    hold = await hold_service.create(
+        user=user,
+        payload=BookingHoldCreateRequest(table_id=table.id, date=slot_date, time=time(13, 0)),
+    )
+    holds_key = BookingHoldService.get_holds_key(hold.start_at)
+    cache_service.holds[holds_key][hold.hold_id]["expires_at"] = 0
+
+    booking_service = BookingService(
+        session,
+        cache_service,
+        notification_service=FakeNotificationService(),
+    )
+    with pytest.raises(ConflictError):
+        await booking_service.create(
+            user=user,
+            payload=BookingCreateRequest(
+                table_id=table.id,
+                date=slot_date,
+                time=time(13, 0),
+                hold_id=hold.hold_id,
+            ),
+        )
+    booking = await booking_service.create(
+        user=user_two,
+        payload=BookingCreateRequest(table_id=table.id, date=slot_date, time=time(13, 0)),
+    )
+    assert booking.user_id == user_two.id
+
+
+@pytest.mark.asyncio
+async def test_create_many_validates_and_releases_hold_ids(
+        session: AsyncSession,
+        user,
+        default_tables,
+) -> None:
+    cache_service = FakeCacheService()
+    slot_date = date.today() + timedelta(days=1)
+    hold = await BookingHoldService(session, cache_service).create(
+        user=user,
+        payload=BookingHoldCreateRequest(
+            table_id=default_tables[0].id,
+            date=slot_date,
+            time=time(13, 0),
+        ),
+    )
+    booking_service = BookingService(
+        session,
+        cache_service,
+        notification_service=FakeNotificationService(),
+    )
+
+    result = await booking_service.create_many(
+        user=user,
+        payload=BookingBulkCreateRequest(
+            mode="best_effort",
+            items=[
+                BookingCreateRequest(
+                    table_id=default_tables[0].id,
+                    date=slot_date,
+                    time=time(13, 0),
+                    hold_id=hold.hold_id,
+                ),
+                BookingCreateRequest(
+                    table_id=default_tables[1].id,
+                    date=slot_date,
+                    time=time(13, 0),
+                    hold_id=hold.hold_id,
+                ),
+            ],
+        ),
+    )
+
+    assert result.created == 1
+    assert result.items[0].booking.table.id == default_tables[0].id
+    assert result.items[1].error_code == "conflict"
+    assert result.items[1].detail == "The slot hold has expired or does not match the booking."
+    assert await cache_service.get_holds(BookingHoldService.get_holds_key(hold.start_at)) == {}
@@ -0,0 +1,94 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.core.exceptions import ConflictError
+from app.services.idempotency import IdempotencyService
+from tests.fakes import FakeCacheService
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_run_handler_once() -> None:
+    cache_service = FakeCacheService()
+    idempotency_service = IdempotencyService(cache_service)
+    calls: list[int] = []
+
+    async def handler() -> dict[str, Any]:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"id": len(calls)}
+
+    results = await asyncio.gather(
+        *(
+            idempotency_service.run("bookings:1", "retry-1", {"table_id": 1}, handler)
+            for _ in range(3)
+        )
+    )
+
+    assert calls == [1]
+    assert [body for body, _ in results] == [{"id": 1}] * 3
+    assert sorted(is_replayed for _, is_replayed in results) == [False, True, True]
+    assert cache_service.locks == {}
+
+
+@pytest.mark.asyncio
+async def test_reused_key_with_other_payload_raises_conflict() -> None:
+    idempotency_service = IdempotencyService(FakeCacheService())
+
+    async def handler() -> dict[str, Any]:
+        return {"id": 1}
+
+    await idempotency_service.run("bookings:1", "retry-1", {"table_id": 1}, handler)
+
+    with pytest.raises(ConflictError):
+        await idempotency_service.run("bookings:1", "retry-1", {"table_id": 2}, handler)
+
+
+@pytest.mark.asyncio
+async def test_failed_request_releases_key_for_retry() -> None:
+    cache_service = FakeCacheService()
+    idempotency_service = IdempotencyService(cache_service)
+
+    async def failing_handler() -> dict[str, Any]:
+        raise ConflictError()
+
+    async def handler() -> dict[str, Any]:
+        return {"id": 2}
+
+    with pytest.raises(ConflictError):
+        await idempotency_service.run("bookings:1", "retry-1", {}, failing_handler)
+    body, is_replayed = await idempotency_service.run("bookings:1", "retry-1", {}, handler)
+
+    assert body == {"id": 2}
+    assert not is_replayed
+
+
+@pytest.mark.asyncio
+async def test_waiting_duplicate_takes_over_after_leader_fails() -> None:
+    cache_service = FakeCacheService()
+    idempotency_service = IdempotencyService(cache_service)
+    calls: list[str] = []
+
+    async def failing_handler() -> dict[str, Any]:
+        calls.append("leader")
+        await asyncio.sleep(0.02)
+        raise ConflictError()
+
+    async def handler() -> dict[str, Any]:
+        calls.append("retry")
+        return {"id": 3}
+
+    leader, retry = await asyncio.wait_for(
+        asyncio.gather(
+            idempotency_service.run("bookings:1", "retry-1", {}, failing_handler),
+            idempotency_service.run("bookings:1", "retry-1", {}, handler),
+            return_exceptions=True,
+        ),
+        timeout=1,
+    )
+
+    assert isinstance(leader, ConflictError)
+    assert retry == ({"id": 3}, False)
+    assert calls == ["leader", "retry"]
+    assert cache_service.locks == {}
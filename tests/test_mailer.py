@@ -0,0 +1,162 @@
+import socket
+from collections.abc import Iterator
+from email.message import EmailMessage
+from typing import Any
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.tasks.booking import (
+    build_email,
+    deliver_notifications,
+    send_booking_created_notification,
+    send_bookings_canceled_notification,
+    send_notification_email,
+)
+from app.tasks.mailer import (
+    NotificationDeliveryError,
+    NotificationMailer,
+    NotificationMailerProvider,
+    SmtpConnectionPool,
+)
+
+
+class RecordingHandler:
+    def __init__(self, refused: frozenset[str] = frozenset()):
+        self.refused = refused
+        self.received: list[tuple[tuple[str, int], list[str]]] = []
+
+    async def handle_RCPT(  # noqa: N802
+            self,
+            server: Any,
+            session: Any,
+            envelope: Any,
+            address: str,
+            rcpt_options: list[str],
+    ) -> str:
+        if address in self.refused:
+            return "550 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server: Any, session: Any, envelope: Any) -> str:  # noqa: N802
+        self.received.append((session.peer, list(envelope.rcpt_tos)))
+        return "250 Message accepted for delivery"
+
+
+@pytest.fixture
+def smtp_server() -> Iterator[tuple[RecordingHandler, int]]:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    handler = RecordingHandler(refused=frozenset({"refused@example.com"}))
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, port
+    controller.stop()
+
+
+def build_mailer(port: int, pool_size: int, batch_size: int) -> NotificationMailer:
+    pool = SmtpConnectionPool(host="127.0.0.1", port=port, size=pool_size, timeout=5)
+    return NotificationMailer(pool, sender="no-reply@aspex.local", batch_size=batch_size)
+
+
+def test_mailer_sends_batches_over_pooled_connections(
+        smtp_server: tuple[RecordingHandler, int],
+) -> None:
+    handler, port = smtp_server
+    mailer = build_mailer(port, pool_size=2, batch_size=3)
+    messages: list[EmailMessage] = [
+        build_email(f"guest{index}@example.com", "Hi", "Body") for index in range(7)
+    ]
+
+    assert mailer.send(messages) == []
+    assert mailer.send([build_email("late@example.com", "Hi", "Body")]) == []
+    mailer.pool.close()
+
+    assert sorted(rcpt for _, rcpts in handler.received for rcpt in rcpts) == sorted(
+        [f"guest{index}@example.com" for index in range(7)] + ["late@example.com"]
+    )
+    assert len({peer for peer, _ in handler.received}) <= 2
+
+
+def test_deliver_notifications_renders_every_outbox_payload(
+        smtp_server: tuple[RecordingHandler, int],
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    handler, port = smtp_server
+    mailer = build_mailer(port, pool_size=1, batch_size=10)
+    monkeypatch.setattr(NotificationMailerProvider, "_mailer", mailer)
+    booking = {"booking_id": 1, "start_at": "2026-10-18T13:00:00+00:00", "table_name": "T1"}
+
+    deliver_notifications(
+        [
+            {
+                "task_name": send_booking_created_notification.name,
+                "payload": {**booking, "email": "one@example.com"},
+            },
+            {
+                "task_name": send_bookings_canceled_notification.name,
+                "payload": {
+                    "bookings": [
+                        {**booking, "booking_id": 2, "email": "two@example.com"},
+                        {**booking, "booking_id": 3, "email": "three@example.com"},
+                    ]
+                },
+            },
+        ]
+    )
+    mailer.pool.close()
+
+    assert [rcpts for _, rcpts in handler.received] == [
+        ["one@example.com"],
+        ["two@example.com"],
+        ["three@example.com"],
+    ]
+    assert len({peer for peer, _ in handler.received}) == 1
+
+
+def test_mailer_skips_refused_recipient_and_keeps_connection(
+        smtp_server: tuple[RecordingHandler, int],
+) -> None:
+    handler, port = smtp_server
+    mailer = build_mailer(port, pool_size=1, batch_size=10)
+    recipients = ["first@example.com", "refused@example.com", "last@example.com"]
+
+    assert mailer.send([build_email(recipient, "Hi", "Body") for recipient in recipients]) == []
+    mailer.pool.close()
+
+    assert [rcpts for _, rcpts in handler.received] == [["first@example.com"], ["last@example.com"]]
+    assert len({peer for peer, _ in handler.received}) == 1
+
+
+def test_undelivered_emails_are_retried_individually(monkeypatch: pytest.MonkeyPatch) -> None:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        closed_port = probe.getsockname()[1]
+    mailer = build_mailer(closed_port, pool_size=1, batch_size=10)
+    monkeypatch.setattr(NotificationMailerProvider, "_mailer", mailer)
+    retried: list[dict[str, str]] = []
+    monkeypatch.setattr(send_notification_email, "delay", lambda **kwargs: retried.append(kwargs))
+    booking = {"start_at": "2026-10-18T13:00:00+00:00", "table_name": "T1"}
+
+    deliver_notifications(
+        [
+            {
+                "task_name": send_bookings_canceled_notification.name,
+                "payload": {
+                    "bookings": [
+                        {**booking, "booking_id": 2, "email": "two@example.com"},
+                        {**booking, "booking_id": 3, "email": "three@example.com"},
+                    ]
+                },
+            },
+        ]
+    )
+
+    assert [(item["to"], item["subject"]) for item in retried] == [
+        ("two@example.com", "Booking #2 canceled"),
+        ("three@example.com", "Booking #3 canceled"),
+    ]
+    with pytest.raises(NotificationDeliveryError):
+        send_notification_email.run(**retried[0])
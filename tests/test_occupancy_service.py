@@ -0,0 +1,251 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.booking import Booking
+from app.repositories.table import TableRepository
+from app.schemas.booking import BookingCreateRequest
+from app.services.booking import BookingService
+from app.services.dispatcher import task_dispatcher
+from app.services.occupancy import (
+    DayOccupancy,
+    OccupancyIndex,
+    OccupancyService,
+    occupancy_index,
+)
+from app.services.slot import BookingSlotService
+from app.services.table import TableService
+from tests.fakes import FakeCacheService, FakeNotificationService, FakeOccupancyStore
+
+
+def test_day_occupancy_bitsets_detect_overlap() -> None:
+    window_start = datetime(2026, 2, 14, 12, 0, tzinfo=timezone.utc)
+    day = DayOccupancy(window_start, window_start + timedelta(hours=10), granule_minutes=15)
+    booked_start, booked_end = window_start + timedelta(hours=1), window_start + timedelta(hours=3)
+    slot_start, slot_end = window_start + timedelta(hours=2), window_start + timedelta(hours=4)
+    day.occupy(1, booked_start, booked_end)
+
+    assert day.get_free_table_ids([1, 2], window_start, booked_start) == [1, 2]
+    assert day.get_free_table_ids([1, 2], slot_start, slot_end) == [2]
+
+    assert day.release(1, booked_start, booked_end)
+    assert day.get_free_table_ids([1, 2], slot_start, slot_end) == [1, 2]
+
+
+def test_day_occupancy_misaligned_booking_is_not_exact() -> None:
+    window_start = datetime(2026, 2, 14, 12, 0, tzinfo=timezone.utc)
+    day = DayOccupancy(window_start, window_start + timedelta(hours=10), granule_minutes=15)
+    day.occupy(1, window_start + timedelta(minutes=5), window_start + timedelta(minutes=125))
+
+    assert day.get_free_table_ids([1], window_start, window_start + timedelta(hours=2)) is None
+
+
+@pytest.mark.asyncio
+async def test_get_available_uses_index_updated_by_booking_writes(
+        session: AsyncSession,
+        user,
+        default_tables,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    slot_date = date.today() + timedelta(days=1)
+    cache_service = FakeCacheService()
+    table_service = TableService(session, cache_service)
+    await table_service.get_available(slot_date=slot_date, slot_time=time(13, 0), guests=2)
+
+    async def fail_list_available(*args, **kwargs) -> list:
+        raise AssertionError("Availability must be answered from the occupancy index.")
+
+    monkeypatch.setattr(TableRepository, "list_available", fail_list_available)
+    booking_service = BookingService(
+        session=session,
+        cache_service=cache_service,
+        notification_service=FakeNotificationService(),
+    )
+    table = default_tables[0]
+    booking = await booking_service.create(
+        user=user,
+        payload=BookingCreateRequest(table_id=table.id, date=slot_date, time=time(13, 0)),
+    )
+
+    response = await table_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(14, 0),
+        guests=2,
+    )
+    assert table.id not in {item.id for item in response.tables}
+
+    await booking_service.cancel(user_id=user.id, booking_id=booking.id)
+    response = await table_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(14, 0),
+        guests=2,
+    )
+    assert table.id in {item.id for item in response.tables}
+
+
+@pytest.mark.asyncio
+async def test_stale_worker_index_is_not_written_to_shared_cache(
+        session: AsyncSession,
+        user,
+        default_tables,
+) -> None:
+    slot_date = date.today() + timedelta(days=1)
+    table = default_tables[0]
+    cache_service = FakeCacheService()
+    other_worker_service = TableService(
+        session,
+        cache_service,
+        occupancy_service=OccupancyService(session, index=OccupancyIndex()),
+    )
+    await other_worker_service.get_available(slot_date=slot_date, slot_time=time(14, 0), guests=2)
+
+    booking_service = BookingService(
+        session=session,
+        cache_service=cache_service,
+        notification_service=FakeNotificationService(),
+    )
+    await booking_service.table_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(13, 0),
+        guests=2,
+    )
+    await booking_service.create(
+        user=user,
+        payload=BookingCreateRequest(table_id=table.id, date=slot_date, time=time(13, 0)),
+    )
+    assert occupancy_index.get_day(
+        slot_date,
+        await booking_service.table_service.get_available_generations(slot_date),
+    ) is not None
+
+    response = await other_worker_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(14, 0),
+        guests=2,
+    )
+    assert table.id not in {item.id for item in response.tables}
+    cache_key = TableService.get_available_cache_key(slot_date, time(14, 0))
+    assert table.id not in {item["id"] for item in cache_service.storage[cache_key]}
+
+
+@pytest.mark.asyncio
+async def test_get_available_falls_back_to_query_for_misaligned_bookings(
+        session: AsyncSession,
+        user,
+        default_tables,
+) -> None:
+    slot_date = date.today() + timedelta(days=1)
+    table = default_tables[0]
+    start_at = datetime.combine(slot_date, time(13, 7)).replace(tzinfo=timezone.utc)
+    end_at = start_at + timedelta(hours=2)
+    session.add(Booking(user_id=user.id, table_id=table.id, start_at=start_at, end_at=end_at))
+    await session.commit()
+
+    table_service = TableService(session, FakeCacheService())
+    response = await table_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(15, 0),
+        guests=2,
+    )
+
+    assert table.id not in {item.id for item in response.tables}
+    assert len(response.tables) == 15
+
+
+def test_day_occupancy_encodes_bitset_in_redis_bit_order() -> None:
+    window_start = datetime(2026, 2, 14, 12, 0, tzinfo=timezone.utc)
+    day = DayOccupancy(window_start, window_start + timedelta(hours=10), granule_minutes=15)
+    day.occupy(1, window_start, window_start + timedelta(minutes=30))
+    day.occupy(1, window_start + timedelta(hours=2), window_start + timedelta(minutes=135))
+
+    assert day.encode_bitset(1) == bytes([0b11000000, 0b10000000, 0, 0, 0])
+    assert day.encode_bitset(2) == bytes(5)
+
+
+@pytest.mark.asyncio
+async def test_get_available_uses_redis_store_maintained_by_booking_writes(
+        session: AsyncSession,
+        user,
+        default_tables,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "AVAILABILITY_BACKEND", "redis")
+    slot_date = date.today() + timedelta(days=1)
+    store = FakeOccupancyStore()
+    cache_service = FakeCacheService()
+    table_service = TableService(session, cache_service, OccupancyService(session, store=store))
+    await table_service.get_available(slot_date=slot_date, slot_time=time(13, 0), guests=2)
+    assert store.states == {slot_date: "exact"}
+
+    async def fail_list_available(*args, **kwargs) -> list:
+        raise AssertionError("Availability must be answered from the Redis store.")
+
+    monkeypatch.setattr(TableRepository, "list_available", fail_list_available)
+    booking_service = BookingService(
+        session=session,
+        cache_service=cache_service,
+        notification_service=FakeNotificationService(),
+    )
+    booking_service.occupancy_service.store = store
+    table = default_tables[0]
+    await booking_service.create(
+        user=user,
+        payload=BookingCreateRequest(table_id=table.id, date=slot_date, time=time(13, 0)),
+    )
+
+    response = await table_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(14, 0),
+        guests=2,
+    )
+    assert table.id not in {item.id for item in response.tables}
+    assert len(response.tables) == 15
+
+
+@pytest.mark.asyncio
+async def test_failed_store_write_is_reconciled_from_bookings(
+        session: AsyncSession,
+        user,
+        default_tables,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "AVAILABILITY_BACKEND", "redis")
+    slot_date = date.today() + timedelta(days=1)
+    store = FakeOccupancyStore()
+    occupancy_service = OccupancyService(session, store=store)
+    assert await occupancy_service.rebuild_store([slot_date]) == 1
+    submitted: list[tuple[str, dict]] = []
+    monkeypatch.setattr(
+        task_dispatcher,
+        "submit",
+        lambda task_name, kwargs: submitted.append((task_name, kwargs)),
+    )
+
+    async def fail_write(*args, **kwargs) -> None:
+        raise RedisError("Connection lost.")
+
+    monkeypatch.setattr(store, "write", fail_write)
+    booking_service = BookingService(
+        session=session,
+        cache_service=FakeCacheService(),
+        notification_service=FakeNotificationService(),
+    )
+    booking_service.occupancy_service.store = store
+    table = default_tables[0]
+    await booking_service.create(
+        user=user,
+        payload=BookingCreateRequest(table_id=table.id, date=slot_date, time=time(13, 0)),
+    )
+    assert (OccupancyService.RECONCILE_TASK_NAME, {"dates": [slot_date.isoformat()]}) in submitted
+
+    start_at, end_at = BookingSlotService.build_slot(slot_date, time(13, 0))
+    start_offset, end_offset, _ = DayOccupancy.for_date(slot_date).get_offsets(start_at, end_at)
+    _, tables = await store.list_available(slot_date, start_offset, end_offset, guests=2)
+    assert table.id in {item.id for item in tables}
+
+    assert await occupancy_service.rebuild_store([slot_date]) == 1
+    _, tables = await store.list_available(slot_date, start_offset, end_offset, guests=2)
+    assert table.id not in {item.id for item in tables}
@@ -0,0 +1,78 @@
+from collections.abc import AsyncGenerator
+from datetime import date
+
+import pytest
+from redis.asyncio import Redis
+from redis.crc import key_slot
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.schemas.table import TableResponse
+from app.services.occupancy_store import RedisOccupancyStore
+
+OK = RedisOccupancyStore.STATUS_OK
+
+
+@pytest.fixture
+async def redis_client() -> AsyncGenerator[Redis, None]:
+    client = Redis.from_url(
+        settings.REDIS_URL,
+        encoding="utf-8",
+        decode_responses=True,
+        socket_connect_timeout=1,
+    )
+    try:
+        await client.ping()
+    except (OSError, RedisError):
+        await client.aclose()
+        pytest.skip("Redis is not available.")
+    yield client
+    await client.aclose()
+
+
+def get_day_keys(slot_date: date, table_ids: list[int]) -> list[str]:
+    return [
+        RedisOccupancyStore.get_state_key(slot_date),
+        RedisOccupancyStore.get_version_key(slot_date),
+        *(RedisOccupancyStore.get_table_key(slot_date, table_id) for table_id in table_ids),
+    ]
+
+
+def test_day_keys_share_one_cluster_slot() -> None:
+    keys = get_day_keys(date(2026, 2, 14), [1, 42])
+    assert len({key_slot(key.encode()) for key in keys}) == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_store_lists_free_tables_with_declared_keys(redis_client: Redis) -> None:
+    slot_date = date(2099, 2, 14)
+    tables = [
+        TableResponse(id=1, name="T1", seats=2),
+        TableResponse(id=2, name="T2", seats=4),
+        TableResponse(id=3, name="T3", seats=6),
+    ]
+    keys = [RedisOccupancyStore.TABLES_KEY, *get_day_keys(slot_date, [1, 2, 3])]
+    await redis_client.delete(*keys)
+    store = RedisOccupancyStore(redis_client)
+    try:
+        status, _ = await store.list_available(slot_date, 0, 4, guests=2)
+        assert status == RedisOccupancyStore.STATUS_MISSING_TABLES
+        await store.put_tables(tables)
+        status, _ = await store.list_available(slot_date, 0, 4, guests=2)
+        assert status == RedisOccupancyStore.STATUS_MISSING_DAY
+
+        bitsets = {1: bytes([0b11000000]), 2: bytes(1), 3: bytes(1)}
+        assert await store.put_day(slot_date, bitsets, is_exact=True, version=0)
+        assert await store.list_available(slot_date, 0, 4, guests=2) == (OK, tables[1:])
+        assert await store.list_available(slot_date, 2, 4, guests=2) == (OK, tables)
+
+        await store.write(slot_date, 3, 2, 4, is_occupied=True, is_aligned=True)
+        assert await store.get_version(slot_date) == 1
+        assert not await store.put_day(slot_date, {}, is_exact=True, version=0)
+        assert await store.list_available(slot_date, 2, 4, guests=4) == (OK, tables[1:2])
+
+        await store.write(slot_date, 2, 1, 3, is_occupied=True, is_aligned=False)
+        status, _ = await store.list_available(slot_date, 0, 4, guests=2)
+        assert status == RedisOccupancyStore.STATUS_INEXACT
+    finally:
+        await redis_client.delete(*keys)
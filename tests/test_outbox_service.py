@@ -0,0 +1,117 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ConflictError
+from app.models.outbox import OutboxMessage
+from app.schemas.booking import BookingCreateRequest
+from app.services.booking import BookingService
+from app.services.outbox import OutboxRelayService
+from app.services.waitlist_queue import WaitlistPromotionQueue
+from app.tasks.booking import deliver_notifications, send_booking_created_notification
+from tests.fakes import FakeCacheService
+
+
+@pytest.mark.asyncio
+async def test_booking_notification_is_written_to_outbox_and_relayed_once(
+        session: AsyncSession,
+        user,
+        default_tables,
+) -> None:
+    booking_service = BookingService(session, FakeCacheService())
+    payload = BookingCreateRequest(
+        table_id=default_tables[0].id,
+        date=date.today() + timedelta(days=1),
+        time=time(13, 0),
+    )
+    booking = await booking_service.create(user=user, payload=payload)
+    with pytest.raises(ConflictError):
+        await booking_service.create(user=user, payload=payload)
+
+    messages = list((await session.scalars(select(OutboxMessage))).all())
+    assert [(message.task_name, message.payload["booking_id"]) for message in messages] == [
+        (send_booking_created_notification.name, booking.id)
+    ]
+
+    published: list[tuple[str, dict[str, Any]]] = []
+    relay_service = OutboxRelayService(
+        session,
+        publisher=lambda name, kwargs: published.append((name, kwargs)),
+    )
+    assert await relay_service.relay(batch_size=10, max_batches=5) == 1
+    assert await relay_service.relay(batch_size=10, max_batches=5) == 0
+    assert published == [
+        (
+            deliver_notifications.name,
+            {
+                "notifications": [
+                    {
+                        "task_name": send_booking_created_notification.name,
+                        "payload": messages[0].payload,
+                    }
+                ]
+            },
+        )
+    ]
+    assert messages[0].payload["email"] == user.email
+
+
+@pytest.mark.asyncio
+async def test_cancel_writes_waitlist_promotion_to_outbox(
+        session: AsyncSession,
+        user,
+        default_tables,
+) -> None:
+    booking_service = BookingService(session, FakeCacheService())
+    booking = await booking_service.create(
+        user=user,
+        payload=BookingCreateRequest(
+            table_id=default_tables[0].id,
+            date=date.today() + timedelta(days=1),
+            time=time(13, 0),
+        ),
+    )
+    canceled = await booking_service.cancel(user_id=user.id, booking_id=booking.id)
+
+    published: list[tuple[str, dict[str, Any]]] = []
+    relay_service = OutboxRelayService(
+        session,
+        publisher=lambda name, kwargs: published.append((name, kwargs)),
+    )
+    assert await relay_service.relay(batch_size=10, max_batches=5) == 2
+    assert (
+        WaitlistPromotionQueue.TASK_NAME,
+        {
+            "table_id": canceled.table_id,
+            "start_at": canceled.start_at.isoformat(),
+            "end_at": canceled.end_at.isoformat(),
+        },
+    ) in published
+
+
+@pytest.mark.asyncio
+async def test_prune_deletes_only_published_messages_past_retention(session: AsyncSession) -> None:
+    now_at = datetime.now(tz=timezone.utc)
+    session.add_all(
+        [
+            OutboxMessage(task_name="old", payload={}, published_at=now_at - timedelta(days=8)),
+            OutboxMessage(task_name="old", payload={}, published_at=now_at - timedelta(days=9)),
+            OutboxMessage(task_name="recent", payload={}, published_at=now_at - timedelta(hours=1)),
+            OutboxMessage(task_name="pending", payload={}),
+        ]
+    )
+    await session.commit()
+
+    relay_service = OutboxRelayService(session, publisher=lambda name, kwargs: None)
+    pruned = await relay_service.prune(
+        published_before=now_at - timedelta(days=7),
+        batch_size=1,
+        max_batches=5,
+    )
+
+    assert pruned == 2
+    remaining = (await session.scalars(select(OutboxMessage.task_name))).all()
+    assert sorted(remaining) == ["pending", "recent"]
@@ -0,0 +1,79 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.booking import Booking
+from app.services.prewarm import AvailabilityPrewarmService
+from app.services.table import TableService
+from tests.fakes import FakeCacheService
+
+
+@pytest.mark.asyncio
+async def test_prewarm_fills_available_and_grid_entries(
+        session: AsyncSession,
+        default_tables: list,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    slot_date = date.today() + timedelta(days=1)
+    start_at = datetime.combine(slot_date, time(13, 0)).replace(tzinfo=timezone.utc)
+    session.add(
+        Booking(
+            user_id=1,
+            table_id=default_tables[-1].id,
+            start_at=start_at,
+            end_at=start_at + timedelta(hours=2),
+        )
+    )
+    await session.commit()
+    cache_service = FakeCacheService()
+
+    written = await AvailabilityPrewarmService(session, cache_service).prewarm([slot_date])
+
+    assert written == 17 + 1
+    index = cache_service.indexes[TableService.get_available_cache_index_key(slot_date)]
+    assert len(index) == written
+
+    table_service = TableService(session, cache_service)
+
+    async def fail_list_available(**kwargs) -> list:
+        raise AssertionError("Prewarmed entries must be served from cache.")
+
+    monkeypatch.setattr(table_service, "list_available_tables", fail_list_available)
+    response = await table_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(14, 0),
+        guests=6,
+    )
+    assert [item.id for item in response.tables] == [table.id for table in default_tables[-3:-1]]
+
+    grid = await table_service.get_availability_grid(slot_date=slot_date, guests=6)
+    assert len(grid.slots[-1].tables) == 3
+    assert len(grid.slots[2].tables) == 2
+
+
+@pytest.mark.asyncio
+async def test_prewarm_uses_current_generation(
+        session: AsyncSession,
+        default_tables: list,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "CACHE_INVALIDATION_MODE", "generation")
+    slot_date = date.today() + timedelta(days=1)
+    cache_service = FakeCacheService()
+    cache_service.generations[TableService.get_available_generation_key(slot_date)] = 3
+
+    await AvailabilityPrewarmService(session, cache_service).prewarm([slot_date])
+
+    cache_key = TableService.get_available_cache_key(slot_date, time(13, 0), "0.3")
+    assert cache_key in cache_service.storage
+    assert cache_service.indexes == {}
+
+
+def test_horizon_dates_cover_configured_days(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "AVAILABILITY_PREWARM_DAYS", 3)
+
+    dates = AvailabilityPrewarmService.get_horizon_dates(date(2030, 1, 31))
+
+    assert dates == [date(2030, 1, 31), date(2030, 2, 1), date(2030, 2, 2)]
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.booking import Booking
+from app.repositories.booking import BookingRepository
+from app.services.reminder import BookingReminderService
+from tests.fakes import FakeNotificationService
+
+
+@pytest.mark.asyncio
+async def test_reminders_are_sent_once_in_keyset_batches(
+        session: AsyncSession,
+        user,
+        user_two,
+        default_tables,
+) -> None:
+    now_at = datetime.now(tz=timezone.utc).replace(microsecond=0)
+    slot = timedelta(hours=2)
+
+    def build_row(table_index: int, start_at: datetime, **values) -> dict:
+        return {
+            "user_id": user.id,
+            "table_id": default_tables[table_index].id,
+            "start_at": start_at,
+            "end_at": start_at + slot,
+            **values,
+        }
+
+    due = await BookingRepository(session).create_many(
+        [
+            build_row(0, now_at + timedelta(minutes=30)),
+            build_row(1, now_at + timedelta(minutes=30), user_id=user_two.id),
+            build_row(2, now_at + timedelta(minutes=90)),
+        ]
+    )
+    await BookingRepository(session).create_many(
+        [
+            build_row(3, now_at + timedelta(minutes=30), canceled_at=now_at),
+            build_row(4, now_at + timedelta(minutes=30), kind=Booking.KIND_BLOCK),
+            build_row(5, now_at - timedelta(minutes=30)),
+            build_row(6, now_at + timedelta(hours=5)),
+        ]
+    )
+    await session.commit()
+
+    notification_service = FakeNotificationService()
+    reminder_service = BookingReminderService(session, notification_service)
+    assert await reminder_service.send_due(now_at=now_at, batch_size=2, max_batches=5) == 3
+    assert await reminder_service.send_due(now_at=now_at, batch_size=2, max_batches=5) == 0
+
+    assert [[item[0] for item in batch] for batch in notification_service.reminder_calls] == [
+        [due[0].id, due[1].id],
+        [due[2].id],
+    ]
+    assert notification_service.reminder_calls[0][1][1] == user_two.email
@@ -1,10 +1,15 @@
+import asyncio
+import json
 from datetime import date, datetime, time, timedelta, timezone
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.exceptions import BusinessRuleError
 from app.models.booking import Booking
+from app.schemas.table import TableCreateRequest
+from app.services.cache import LocalCache
 from app.services.table import TableService
 from tests.fakes import FakeCacheService
 
@@ -84,3 +89,221 @@ async def test_get_available_tables_with_timezone_aware_time(
     )
 
     assert response.tables
+
+
+@pytest.mark.asyncio
+async def test_get_availability_grid_marks_overlapping_start_times(
+        session: AsyncSession,
+        default_tables: list,
+) -> None:
+    table = default_tables[0]
+    slot_date = date.today() + timedelta(days=1)
+    start_at = datetime.combine(slot_date, time(14, 0)).replace(tzinfo=timezone.utc)
+    end_at = start_at + timedelta(hours=2)
+    session.add(Booking(user_id=1, table_id=table.id, start_at=start_at, end_at=end_at))
+    await session.commit()
+
+    cache_service = FakeCacheService()
+    table_service = TableService(session, cache_service)
+    response = await table_service.get_availability_grid(slot_date=slot_date, guests=2)
+
+    assert response.slots[0].time == time(12, 0)
+    assert response.slots[-1].time == time(20, 0)
+    assert len(response.slots) == 17
+    busy_times = [
+        slot.time
+        for slot in response.slots
+        if table.id not in {item.id for item in slot.tables}
+    ]
+    assert busy_times == [
+        time(12, 30),
+        time(13, 0),
+        time(13, 30),
+        time(14, 0),
+        time(14, 30),
+        time(15, 0),
+        time(15, 30),
+    ]
+    assert TableService.get_availability_grid_cache_key(slot_date) in cache_service.storage
+
+    cached_response = await table_service.get_availability_grid(slot_date=slot_date, guests=2)
+    assert cached_response == response
+
+
+@pytest.mark.asyncio
+async def test_find_next_available_skips_booked_slots(
+        session: AsyncSession,
+        default_tables: list,
+) -> None:
+    slot_date = date.today() + timedelta(days=1)
+    start_at = datetime.combine(slot_date, time(12, 0)).replace(tzinfo=timezone.utc)
+    large_tables = [table for table in default_tables if table.seats == 6]
+    end_at = start_at + timedelta(hours=2)
+    session.add_all(
+        [
+            Booking(user_id=1, table_id=table.id, start_at=start_at, end_at=end_at)
+            for table in large_tables
+        ]
+    )
+    await session.commit()
+
+    table_service = TableService(session, FakeCacheService())
+    response = await table_service.find_next_available(
+        guests=6,
+        date_from=slot_date,
+        date_to=slot_date + timedelta(days=1),
+        limit=2,
+    )
+
+    assert [item.table.id for item in response.items] == [large_tables[0].id, large_tables[1].id]
+    expected_start = datetime.combine(slot_date, time(14, 0)).replace(tzinfo=timezone.utc)
+    assert all(item.start_at == expected_start for item in response.items)
+
+
+@pytest.mark.asyncio
+async def test_find_next_available_rejects_too_long_range(
+        session: AsyncSession,
+        default_tables: list,
+) -> None:
+    table_service = TableService(session, FakeCacheService())
+
+    with pytest.raises(BusinessRuleError):
+        await table_service.find_next_available(
+            guests=2,
+            date_from=date.today(),
+            date_to=date.today() + timedelta(days=60),
+        )
+
+
+@pytest.mark.asyncio
+async def test_generation_cache_mode_invalidates_without_scan(
+        session: AsyncSession,
+        default_tables: list,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "CACHE_INVALIDATION_MODE", "generation")
+    slot_date = date.today() + timedelta(days=1)
+    cache_service = FakeCacheService()
+    table_service = TableService(session, cache_service)
+
+    await table_service.get_available(slot_date=slot_date, slot_time=time(13, 0), guests=2)
+    cache_key = TableService.get_available_cache_key(slot_date, time(13, 0), "0.0")
+    assert cache_key in cache_service.storage
+
+    start_at = datetime.combine(slot_date, time(13, 0)).replace(tzinfo=timezone.utc)
+    await table_service.invalidate_available_cache([(start_at, start_at + timedelta(hours=2))])
+    await table_service.get_available(slot_date=slot_date, slot_time=time(13, 0), guests=2)
+    cache_key = TableService.get_available_cache_key(slot_date, time(13, 0), "0.1")
+    assert cache_key in cache_service.storage
+
+    await table_service.create(TableCreateRequest(name="T8-1", seats=8))
+    response = await table_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(13, 0),
+        guests=8,
+    )
+    assert [item.name for item in response.tables] == ["T8-1"]
+    assert cache_service.generations[TableService.get_available_generation_key()] == 1
+    assert cache_service.invalidated_prefixes == []
+
+
+@pytest.mark.asyncio
+async def test_get_available_coalesces_concurrent_misses(
+        session: AsyncSession,
+        default_tables: list,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    slot_date = date.today() + timedelta(days=1)
+    cache_service = FakeCacheService()
+    table_service = TableService(session, cache_service)
+    original_list_available = table_service.list_available_tables
+    calls: list[int] = []
+
+    async def counting_list_available(**kwargs) -> list:
+        calls.append(kwargs["guests"])
+        await asyncio.sleep(0.01)
+        return await original_list_available(**kwargs)
+
+    monkeypatch.setattr(table_service, "list_available_tables", counting_list_available)
+    responses = await asyncio.gather(
+        *(
+            table_service.get_available(slot_date=slot_date, slot_time=time(13, 0), guests=guests)
+            for guests in (2, 3, 6) * 4
+        )
+    )
+
+    assert calls == [1]
+    assert [len(response.tables) for response in responses[:3]] == [16, 9, 3]
+    assert len(cache_service.storage) == 1
+    assert cache_service.locks == {}
+
+
+@pytest.mark.asyncio
+async def test_get_available_waits_for_value_filled_under_foreign_lock(
+        session: AsyncSession,
+        default_tables: list,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    slot_date = date.today() + timedelta(days=1)
+    cache_service = FakeCacheService()
+    table_service = TableService(session, cache_service)
+    cache_key = TableService.get_available_cache_key(slot_date, time(13, 0))
+    await cache_service.acquire_lock(f"{cache_key}:lock", ttl_ms=1000)
+
+    async def fail_list_available(**kwargs) -> list:
+        raise AssertionError("The lock holder fills the cache.")
+
+    async def fill_from_other_worker() -> None:
+        await asyncio.sleep(0.05)
+        await cache_service.set_json(cache_key, [{"id": 99, "name": "T9-9", "seats": 9}], ttl=60)
+
+    monkeypatch.setattr(table_service, "list_available_tables", fail_list_available)
+    response, _ = await asyncio.gather(
+        table_service.get_available(slot_date=slot_date, slot_time=time(13, 0), guests=2),
+        fill_from_other_worker(),
+    )
+
+    assert [item.id for item in response.tables] == [99]
+
+
+@pytest.mark.asyncio
+async def test_local_cache_serves_repeated_reads_until_invalidated(
+        session: AsyncSession,
+        default_tables: list,
+) -> None:
+    slot_date = date.today() + timedelta(days=1)
+    cache_service = FakeCacheService(LocalCache(name="test", max_size=16, ttl_seconds=60))
+    table_service = TableService(session, cache_service)
+
+    await table_service.get_available(slot_date=slot_date, slot_time=time(13, 0), guests=2)
+    cache_service.storage.clear()
+    response = await table_service.get_available(
+        slot_date=slot_date,
+        slot_time=time(13, 0),
+        guests=2,
+    )
+    assert len(response.tables) == 16
+    assert cache_service.storage == {}
+
+    start_at = datetime.combine(slot_date, time(13, 0)).replace(tzinfo=timezone.utc)
+    await table_service.invalidate_available_cache([(start_at, start_at + timedelta(hours=2))])
+    await table_service.get_available(slot_date=slot_date, slot_time=time(13, 0), guests=2)
+    assert TableService.get_available_cache_key(slot_date, time(13, 0)) in cache_service.storage
+    assert cache_service.published_invalidations == [f"tables:available:{slot_date.isoformat()}:"]
+
+
+@pytest.mark.asyncio
+async def test_get_available_body_matches_validated_response(
+        session: AsyncSession,
+        default_tables: list,
+) -> None:
+    slot_date = date.today() + timedelta(days=1)
+    slot_time = time(13, 0, tzinfo=timezone.utc)
+    cache_service = FakeCacheService()
+    table_service = TableService(session, cache_service)
+
+    miss_body = await table_service.get_available_body(slot_date, slot_time, guests=3)
+    hit_body = await table_service.get_available_body(slot_date, slot_time, guests=3)
+    response = await table_service.get_available(slot_date=slot_date, slot_time=slot_time, guests=3)
+
+    assert json.loads(miss_body) == json.loads(hit_body) == response.model_dump(mode="json")
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import SecurityService
+from app.models.user import User
+from app.schemas.auth import UserSnapshot
+from app.services.auth import AuthService
+from app.services.cache import LocalCache
+from app.services.user_cache import UserSnapshotCacheService
+from tests.fakes import FakeCacheService
+
+
+@pytest.mark.asyncio
+async def test_user_snapshot_is_cached_until_invalidated(
+        session: AsyncSession,
+        user,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "USER_CACHE_REDIS_ENABLED", True)
+    cache_service = FakeCacheService(LocalCache(name="api", max_size=10, ttl_seconds=60))
+    user_local_cache = LocalCache(name="users", max_size=10, ttl_seconds=60)
+    auth_service = AuthService(session, cache_service, user_local_cache)
+    token = SecurityService.create_access_token(subject=str(user.id))
+
+    snapshot = await auth_service.get_user_from_token(token)
+    assert (snapshot.id, snapshot.email, snapshot.role) == (user.id, user.email, User.ROLE_USER)
+    key = UserSnapshotCacheService.get_key(user.id)
+    assert cache_service.storage[key] == snapshot.model_dump()
+    assert cache_service.local_cache.get(key) is None
+
+    user.role = User.ROLE_ADMIN
+    await session.commit()
+    assert (await auth_service.get_user_from_token(token)).role == User.ROLE_USER
+
+    user_local_cache.clear()
+    assert (await auth_service.get_user_from_token(token)).role == User.ROLE_USER
+
+    neighbour_key = UserSnapshotCacheService.get_key(user.id * 10)
+    neighbour = UserSnapshot(id=user.id * 10, email="neighbour@example.com", role=User.ROLE_USER)
+    user_local_cache.set(neighbour_key, neighbour)
+    await auth_service.user_cache_service.invalidate(user.id)
+    assert key not in cache_service.storage
+    invalidation_prefix = UserSnapshotCacheService.get_invalidation_prefix(user.id)
+    assert cache_service.published_invalidations == [invalidation_prefix]
+    assert user_local_cache.get(neighbour_key) == neighbour
+    assert (await auth_service.get_user_from_token(token)).has_role(User.ROLE_ADMIN)
@@ -0,0 +1,75 @@
+from datetime import date, time, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ConflictError
+from app.schemas.booking import BookingCreateRequest
+from app.schemas.waitlist import WaitlistJoinRequest
+from app.services.booking import BookingService
+from app.services.waitlist import WaitlistService
+from tests.fakes import FakeCacheService, FakeNotificationService, FakeWaitlistPromotionQueue
+
+
+@pytest.mark.asyncio
+async def test_waitlist_join_requires_full_slot(
+        session: AsyncSession,
+        user,
+        default_tables,
+) -> None:
+    waitlist_service = WaitlistService(session, FakeCacheService(), FakeNotificationService())
+
+    with pytest.raises(ConflictError):
+        await waitlist_service.join(
+            user=user,
+            payload=WaitlistJoinRequest(
+                date=date.today() + timedelta(days=2),
+                time=time(13, 0),
+                guests=6,
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_cancel_promotes_first_waitlisted_party(
+        session: AsyncSession,
+        user,
+        user_two,
+        default_tables,
+) -> None:
+    cache_service = FakeCacheService()
+    notification_service = FakeNotificationService()
+    waitlist_queue = FakeWaitlistPromotionQueue()
+    booking_service = BookingService(
+        session,
+        cache_service,
+        notification_service=notification_service,
+        waitlist_queue=waitlist_queue,
+    )
+    slot_date = date.today() + timedelta(days=2)
+    large_tables = [table for table in default_tables if table.seats == 6]
+    bookings = [
+        await booking_service.create(
+            user=user,
+            payload=BookingCreateRequest(table_id=table.id, date=slot_date, time=time(13, 0)),
+        )
+        for table in large_tables
+    ]
+    waitlist_service = WaitlistService(session, cache_service, notification_service)
+    entry = await waitlist_service.join(
+        user=user_two,
+        payload=WaitlistJoinRequest(date=slot_date, time=time(14, 0), guests=5),
+    )
+
+    canceled = await booking_service.cancel(user_id=user.id, booking_id=bookings[1].id)
+    assert waitlist_queue.calls == [(canceled.table_id, canceled.start_at, canceled.end_at)]
+
+    promoted = await waitlist_service.promote(canceled.table_id, canceled.start_at, canceled.end_at)
+
+    promoted_slots = [(booking.user_id, booking.table_id) for booking in promoted]
+    assert promoted_slots == [(user_two.id, large_tables[1].id)]
+    assert entry.booking_id == promoted[0].id
+    assert notification_service.promoted_calls[0]["email"] == user_two.email
+    assert await waitlist_service.get_my(user_two.id) == []
+    promoted = await waitlist_service.promote(canceled.table_id, canceled.start_at, canceled.end_at)
+    assert promoted == []